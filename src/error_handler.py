@@ -30,8 +30,9 @@ class ErrorHandler:
     Provides retry mechanisms, circuit breakers, and graceful degradation.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], data_analyzer=None):
         self.config = config
+        self.data_analyzer = data_analyzer
         self.logger = self._setup_logger()
         self.error_counts = {}
         self.circuit_breakers = {}
@@ -200,8 +201,13 @@ class ErrorHandler:
     
     def _recover_from_model_error(self, error_info: Dict[str, Any]) -> bool:
         """Recovery strategy for ML model errors"""
-        # Fall back to rule-based trading or simpler models
-        self.logger.info("Falling back to rule-based strategy due to model error")
+        # Serve the analyzer's rule-based RSI/SMA signals instead of the model for a while
+        if self.data_analyzer is None or not hasattr(self.data_analyzer, 'force_fallback'):
+            self.logger.warning("Model error but no data analyzer to fall back on")
+            return False
+        duration = self.config.get('model_fallback_seconds', 300)
+        self.data_analyzer.force_fallback(duration)
+        self.logger.info(f"Falling back to rule-based strategy for {duration}s due to model error")
         return True
     
     def _recover_from_trading_error(self, error_info: Dict[str, Any]) -> bool:
@@ -285,7 +285,9 @@ class RecoveryManager:
     def _get_model_state(self, data_analyzer) -> Dict[str, Any]:
         """Get current ML model state"""
         try:
-            # This would extract model parameters, training status, etc.
+            # Analyzers with a model store report version and artifact details
+            if hasattr(data_analyzer, 'model_state'):
+                return data_analyzer.model_state()
             return {
                 'model_trained': hasattr(data_analyzer, 'model'),
                 'last_training_time': getattr(data_analyzer, 'last_training_time', None),
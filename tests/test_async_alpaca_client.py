@@ -0,0 +1,81 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+from trade_bot.async_alpaca_client import AlpacaHTTPError, AsyncAlpacaClient
+from trade_bot.config import Config
+
+
+class TestAsyncAlpacaClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def bars(request):
+            self.requests.append(dict(request.query))
+            if request.query.get('page_token') is None:
+                return web.json_response({
+                    'bars': {'AAPL': [{'t': '2024-01-02T14:30:00Z', 'o': 1, 'h': 1, 'l': 1, 'c': 1, 'v': 10}]},
+                    'next_page_token': 'page2'
+                })
+            return web.json_response({
+                'bars': {'AAPL': [{'t': '2024-01-02T14:31:00Z', 'o': 2, 'h': 2, 'l': 2, 'c': 2, 'v': 20}]},
+                'next_page_token': None
+            })
+
+        async def slow(request):
+            await asyncio.sleep(2)
+            return web.json_response({'status': 'ACTIVE'})
+
+        async def missing(request):
+            return web.Response(status=404, text='not found')
+
+        app = web.Application()
+        app.router.add_get('/v2/stocks/bars', bars)
+        app.router.add_get('/v2/account', slow)
+        app.router.add_get('/v2/positions', missing)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        url = f'http://127.0.0.1:{port}'
+        self.client = AsyncAlpacaClient(Config(base_url=url, data_url=url, http_timeout=0.2))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.runner.cleanup()
+
+    async def test_session_timeout_applies_without_per_call_timeout(self):
+        start = time.monotonic()
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.client.get_account()
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    async def test_per_call_timeout_overrides_session_timeout(self):
+        start = time.monotonic()
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.client._request('GET', self.client._trading_url('account'), timeout=0.05)
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    async def test_bars_follow_page_tokens(self):
+        bars = await self.client.get_bars(['AAPL'], columnar=True)
+
+        self.assertEqual(list(bars.column('AAPL', 'c')), [1.0, 2.0])
+        self.assertEqual(len(self.requests), 2)
+        # The default start is an aware UTC time a week back
+        start = datetime.fromisoformat(self.requests[0]['start'])
+        self.assertEqual(start.utcoffset(), timedelta(0))
+        self.assertLess(abs(datetime.now(timezone.utc) - timedelta(days=7) - start), timedelta(minutes=1))
+
+    async def test_http_errors_raise(self):
+        with self.assertRaises(AlpacaHTTPError) as raised:
+            await self.client.get_positions()
+        self.assertEqual(raised.exception.status, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
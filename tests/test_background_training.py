@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+
+
+class TestBackgroundTraining(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(6)
+        self.features = pd.DataFrame(rng.standard_normal((400, 2)), columns=['RSI', 'SMA_10'])
+        self.targets = (self.features['RSI'] > 0).astype(int)
+        self.analyzer = DataAnalyzer({})
+
+    def tearDown(self):
+        self.analyzer.shutdown_training()
+
+    def test_background_fit_is_swapped_in(self):
+        self.analyzer.train_model(self.features[:200], self.targets[:200])
+        serving = self.analyzer.model_bundle
+
+        future = self.analyzer.train_model_background(self.features, self.targets)
+        # Later changes to the caller's frame do not reach the snapshot
+        self.features.iloc[:, :] = 0
+        bundle = future.result()
+
+        self.assertIsNot(bundle, serving)
+        self.assertEqual(bundle.version, serving.version + 1)
+        self.assertIs(self.analyzer.model_bundle, bundle)
+        self.assertIsNot(bundle.scaler, serving.scaler)
+        self.assertTrue(serving.is_fitted)
+
+    def test_worker_receives_unfitted_estimators(self):
+        self.analyzer.train_model(self.features, self.targets)
+        serving = self.analyzer.model_bundle
+        submitted = []
+
+        class InlinePool:
+            def __init__(self, max_workers, mp_context):
+                self.mp_context = mp_context
+
+            def submit(self, fn, *args):
+                submitted.append(args)
+                future = Future()
+                future.set_result(fn(*args))
+                return future
+
+            def shutdown(self, wait=True):
+                pass
+
+        with mock.patch('trading_bot.data_analyzer.ProcessPoolExecutor', InlinePool):
+            self.analyzer.train_model_background(self.features, self.targets).result()
+
+        self.assertNotEqual(self.analyzer._training_pool.mp_context.get_start_method(), 'fork')
+        scaler, model = submitted[0][:2]
+        self.assertFalse(hasattr(scaler, 'mean_'))
+        self.assertFalse(hasattr(model, 'estimators_'))
+        self.assertEqual(model.get_params(), serving.model.get_params())
+
+    def test_stale_bundle_is_not_published(self):
+        future = self.analyzer.train_model_background(self.features, self.targets)
+        self.analyzer.train_model(self.features, self.targets)
+        newest = self.analyzer.model_bundle
+
+        future.result()
+        self.assertIs(self.analyzer.model_bundle, newest)
+
+    def test_async_training(self):
+        bundle = asyncio.run(self.analyzer.train_model_async(self.features, self.targets))
+
+        self.assertIs(self.analyzer.model_bundle, bundle)
+        self.assertEqual(bundle.feature_columns, ['RSI', 'SMA_10'])
+        predictions = self.analyzer.predict(self.features[['SMA_10', 'RSI']])
+        self.assertGreater((predictions == self.targets).mean(), 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from trade_bot import bar_store
+from trade_bot.alpaca_client import AlpacaClient
+from trade_bot.bar_store import BarStore
+from trade_bot.config import Config
+
+MINUTE = 60 * 10**9
+
+
+def make_bars(times, close=None):
+    times = np.asarray(times, dtype=np.int64)
+    close = np.arange(len(times), dtype=np.float64) if close is None else np.asarray(close, dtype=np.float64)
+    return {'t': times, 'o': close, 'h': close, 'l': close, 'c': close, 'v': np.ones(len(times))}
+
+
+class TestBarStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BarStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_and_reopen(self):
+        self.store.write('AAPL', '1Min', make_bars([0, MINUTE]), 0, 2 * MINUTE)
+        self.store.write('AAPL', '1Min', make_bars([2 * MINUTE, 3 * MINUTE], [2, 3]), 2 * MINUTE, 4 * MINUTE)
+
+        reopened = BarStore(self.tmp.name)
+        stored = reopened.read('AAPL', '1Min')
+        np.testing.assert_array_equal(stored['t'], [0, MINUTE, 2 * MINUTE, 3 * MINUTE])
+        np.testing.assert_array_equal(stored['c'], [0, 1, 2, 3])
+        self.assertEqual(reopened.coverage('AAPL', '1Min'), [(0, 4 * MINUTE)])
+
+    def test_read_range(self):
+        self.store.write('AAPL', '1Min', make_bars([0, MINUTE, 2 * MINUTE]), 0, 3 * MINUTE)
+        stored = self.store.read('AAPL', '1Min', MINUTE, 2 * MINUTE)
+        np.testing.assert_array_equal(stored['t'], [MINUTE])
+        self.assertEqual(len(self.store.read('MSFT', '1Min')['t']), 0)
+
+    def test_older_bars_are_merged(self):
+        self.store.write('AAPL', '1Min', make_bars([2 * MINUTE, 3 * MINUTE], [2, 3]), 2 * MINUTE, 4 * MINUTE)
+        self.store.write('AAPL', '1Min', make_bars([0, MINUTE]), 0, 2 * MINUTE)
+
+        stored = self.store.read('AAPL', '1Min')
+        np.testing.assert_array_equal(stored['t'], [0, MINUTE, 2 * MINUTE, 3 * MINUTE])
+        np.testing.assert_array_equal(stored['c'], [0, 1, 2, 3])
+
+    def test_tail_is_rewritten_in_place(self):
+        self.store.write('AAPL', '1Min', make_bars([0, MINUTE, 2 * MINUTE]), 0, 2 * MINUTE)
+        with mock.patch.object(self.store, '_merge', side_effect=AssertionError("full rewrite")):
+            # The forming bar comes back with a new close plus the next bar
+            self.store.write('AAPL', '1Min', make_bars([2 * MINUTE, 3 * MINUTE], [20, 30]), 2 * MINUTE, 3 * MINUTE)
+
+        stored = self.store.read('AAPL', '1Min')
+        np.testing.assert_array_equal(stored['t'], [0, MINUTE, 2 * MINUTE, 3 * MINUTE])
+        np.testing.assert_array_equal(stored['c'], [0, 1, 20, 30])
+
+    def test_interrupted_rewrite_is_replayed(self):
+        self.store.write('AAPL', '1Min', make_bars([0, MINUTE, 2 * MINUTE]), 0, 3 * MINUTE)
+        apply_tail = bar_store._apply_tail
+
+        def crash(path, position, merged):
+            # Only the timestamps reach the disk before the process dies
+            apply_tail(path, position, {name: merged[name] if name == 't' else merged[name][:0] for name in merged})
+            raise KeyboardInterrupt
+
+        with mock.patch.object(bar_store, '_apply_tail', side_effect=crash):
+            with self.assertRaises(KeyboardInterrupt):
+                self.store.write('AAPL', '1Min', make_bars([MINUTE, 1.5 * MINUTE], [10, 15]), MINUTE, 2 * MINUTE)
+
+        stored = BarStore(self.tmp.name).read('AAPL', '1Min')
+        np.testing.assert_array_equal(stored['t'], [0, MINUTE, 1.5 * MINUTE, 2 * MINUTE])
+        np.testing.assert_array_equal(stored['c'], [0, 10, 15, 2])
+        self.assertEqual(BarStore(self.tmp.name).coverage('AAPL', '1Min'), [(0, 3 * MINUTE)])
+
+    def test_missing_ranges(self):
+        self.store.write('AAPL', '1Min', make_bars([MINUTE]), MINUTE, 2 * MINUTE)
+        self.store.write('AAPL', '1Min', make_bars([4 * MINUTE]), 4 * MINUTE, 5 * MINUTE)
+
+        self.assertEqual(
+            self.store.missing('AAPL', '1Min', 0, 6 * MINUTE),
+            [(0, MINUTE), (2 * MINUTE, 4 * MINUTE), (5 * MINUTE, 6 * MINUTE)]
+        )
+        self.assertEqual(self.store.missing('AAPL', '1Min', MINUTE, 2 * MINUTE), [])
+
+
+class FakeBarsAPI:
+    """Minute bars up to ``until``, one per minute, close = minutes since ``origin``"""
+
+    def __init__(self, origin, until):
+        self.origin = origin
+        self.until = until
+        self.calls = []
+
+    def get_bars(self, symbol, timeframe, start, end, limit=None):
+        self.calls.append((start, end))
+        start = datetime.fromisoformat(start)
+        end = min(datetime.fromisoformat(end), self.until)
+        index = pd.date_range(start.replace(second=0, microsecond=0), end, freq='1min', inclusive='left')
+        index = index[(index >= start) & (index < end)]
+        close = (index - self.origin) // pd.Timedelta(minutes=1)
+        frame = pd.DataFrame(
+            {'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0},
+            index=index, dtype=np.float64
+        )
+        return SimpleNamespace(df=frame)
+
+
+class TestCachedBars(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = AlpacaClient(Config(alpaca_api_key='key', alpaca_secret_key='secret', bar_store_dir=self.tmp.name))
+        self.origin = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_only_gaps_are_fetched(self):
+        self.client.api = FakeBarsAPI(self.origin, datetime.now(timezone.utc))
+        first = self.client.get_bars(['AAPL'], '1Min', self.origin, self.origin + timedelta(minutes=10), columnar=True)
+        np.testing.assert_array_equal(first.column('AAPL', 'c'), np.arange(10))
+
+        again = self.client.get_bars(['AAPL'], '1Min', self.origin, self.origin + timedelta(minutes=10), columnar=True)
+        self.assertEqual(len(self.client.api.calls), 1)
+        np.testing.assert_array_equal(again.column('AAPL', 'c'), np.arange(10))
+
+        wider = self.client.get_bars(
+            ['AAPL'], '1Min', self.origin - timedelta(minutes=5), self.origin + timedelta(minutes=15), columnar=True
+        )
+        self.assertEqual(len(self.client.api.calls), 3)
+        np.testing.assert_array_equal(wider.column('AAPL', 'c'), np.arange(-5, 15))
+
+    def test_forming_bar_refresh_rewrites_tail(self):
+        now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        self.client.api = FakeBarsAPI(self.origin, now + timedelta(minutes=1))
+        start = now - timedelta(minutes=10)
+        self.client.get_bars(['AAPL'], '1Min', start, now + timedelta(minutes=1), columnar=True)
+
+        store = self.client.bar_store
+        with mock.patch.object(store, '_merge', side_effect=AssertionError("full rewrite")):
+            refreshed = self.client.get_bars(['AAPL'], '1Min', start, now + timedelta(minutes=1), columnar=True)
+
+        # The unsettled tail is fetched again and replaces the stored rows
+        self.assertEqual(len(self.client.api.calls), 2)
+        times = refreshed.column('AAPL', 't')
+        self.assertEqual(len(times), 11)
+        self.assertTrue((np.diff(times) == MINUTE).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trade_bot.bars import BAR_COLUMNS, ColumnarBars
+
+
+class TestColumnarBars(unittest.TestCase):
+
+    def setUp(self):
+        index = pd.to_datetime(
+            ['2024-01-02 14:31', '2024-01-02 14:30', '2024-01-02 14:30', '2024-01-02 14:31'], utc=True
+        )
+        self.frame = pd.DataFrame({
+            'open': [2.0, 1.0, 10.0, 11.0],
+            'high': [2.5, 1.5, 10.5, 11.5],
+            'low': [1.5, 0.5, 9.5, 10.5],
+            'close': [2.2, 1.2, 10.2, 11.2],
+            'volume': [200, 100, 1000, 1100],
+            'symbol': ['AAPL', 'AAPL', 'MSFT', 'MSFT'],
+        }, index=index)
+
+    def test_frame_round_trip(self):
+        bars = ColumnarBars.from_frame(self.frame)
+
+        self.assertEqual(bars.symbols, ['AAPL', 'MSFT'])
+        np.testing.assert_array_equal(bars.offsets, [0, 2, 4])
+        self.assertEqual(bars.t.dtype, np.int64)
+        for symbol in bars:
+            expected = self.frame[self.frame['symbol'] == symbol].drop(columns='symbol').sort_index()
+            pd.testing.assert_frame_equal(bars.to_frame(symbol), expected, check_dtype=False, check_index_type=False, check_freq=False)
+        self.assertEqual(len(bars.to_dataframe()), 4)
+
+    def test_per_symbol_access_is_a_view(self):
+        bars = ColumnarBars.from_frame(self.frame)
+        closes = bars.column('MSFT', 'c')
+        np.testing.assert_array_equal(closes, [10.2, 11.2])
+        self.assertTrue(np.shares_memory(closes, bars.c))
+        self.assertEqual(sorted(bars.get('AAPL')), sorted(BAR_COLUMNS))
+
+    def test_records_are_sorted_per_symbol(self):
+        records = {
+            'MSFT': [{'t': '2024-01-02T14:31:00Z', 'o': 2, 'h': 2, 'l': 2, 'c': 2, 'v': 5},
+                     {'t': '2024-01-02T14:30:00Z', 'o': 1, 'h': 1, 'l': 1, 'c': 1, 'v': 4}],
+            'AAPL': [{'t': '2024-01-02T14:30:00Z', 'o': 3, 'h': 3, 'l': 3, 'c': 3, 'v': 0.5}],
+            'TSLA': [],
+        }
+        bars = ColumnarBars.from_records(records)
+
+        self.assertEqual(bars.symbols, ['AAPL', 'MSFT'])
+        np.testing.assert_array_equal(bars.column('MSFT', 'c'), [1.0, 2.0])
+        self.assertEqual(bars.column('AAPL', 'v')[0], 0.5)
+        self.assertEqual(bars.t[0], pd.Timestamp('2024-01-02T14:30:00Z').value)
+
+    def test_from_columns_and_empty(self):
+        bars = ColumnarBars.from_frame(self.frame)
+        rebuilt = ColumnarBars.from_columns({symbol: bars.get(symbol) for symbol in bars})
+        for name in BAR_COLUMNS:
+            np.testing.assert_array_equal(getattr(rebuilt, name), getattr(bars, name))
+
+        empty = ColumnarBars.from_frame(pd.DataFrame())
+        self.assertEqual(len(empty), 0)
+        self.assertNotIn('AAPL', empty)
+        self.assertEqual(len(ColumnarBars.from_columns({'AAPL': {'t': []}})), 0)
+
+    def test_single_symbol_frame(self):
+        frame = self.frame[self.frame['symbol'] == 'AAPL'].drop(columns='symbol')
+        bars = ColumnarBars.from_frame(frame, symbol='AAPL')
+        self.assertEqual(bars.symbols, ['AAPL'])
+        np.testing.assert_array_equal(bars.column('AAPL', 'o'), [1.0, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
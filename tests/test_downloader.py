@@ -0,0 +1,107 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from trade_bot.downloader import DownloadCheckpoint, HistoricalBarDownloader
+
+
+class FakeClient:
+    """Serves two pages of one bar per chunk and records the requested ranges"""
+
+    def __init__(self):
+        self.config = SimpleNamespace(historical_data_days=30)
+        self.requests = []
+
+    async def get_bars_page(self, symbols, timeframe, start, end, page_token=None):
+        self.requests.append((symbols[0], start, end, page_token))
+        bar_time = start if page_token is None else start + timedelta(minutes=1)
+        bar = {'t': bar_time.isoformat(), 'o': 1.0, 'h': 1.0, 'l': 1.0, 'c': 1.0, 'v': 1.0}
+        return {'bars': {symbols[0]: [bar]}, 'next_page_token': None if page_token else 'next'}
+
+
+class TestHistoricalBarDownloader(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.tmp.name, 'bars.json')
+        self.client = FakeClient()
+        self.start = datetime(2024, 1, 3, 12, tzinfo=timezone.utc)
+        self.end = datetime(2024, 1, 20, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def downloader(self, **kwargs):
+        return HistoricalBarDownloader(self.client, self.checkpoint, max_concurrency=2, requests_per_minute=60000,
+                                       **kwargs)
+
+    def test_chunks_are_aligned_and_clipped(self):
+        chunks = self.downloader().plan_chunks(['AAPL', 'MSFT'], '1Min', self.start, self.end)
+
+        self.assertEqual(len(chunks), 8)
+        windows = [(s, e) for symbol, s, e in chunks if symbol == 'AAPL']
+        self.assertEqual(windows[0][0], self.start)
+        self.assertEqual(windows[-1][1], self.end)
+        for (_, end), (start, _) in zip(windows, windows[1:]):
+            self.assertEqual(end, start)
+        # Inner boundaries are multiples of the 5-day step since the epoch
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual((windows[1][0] - epoch) % timedelta(days=5), timedelta(0))
+
+    async def test_interrupted_download_resumes(self):
+        delivered = []
+        async for chunk in self.downloader().download(['AAPL', 'MSFT'], '1Min', self.start, self.end):
+            delivered.append(chunk.key)
+            if len(delivered) == 3:
+                break
+        # The chunk being consumed when the loop stopped is not recorded
+        self.assertEqual(len(DownloadCheckpoint(self.checkpoint).completed), 2)
+
+        resumed = [chunk async for chunk in self.downloader().download(['AAPL', 'MSFT'], '1Min', self.start, self.end)]
+
+        keys = delivered[:2] + [chunk.key for chunk in resumed]
+        self.assertEqual(len(keys), 8)
+        self.assertEqual(len(set(keys)), 8)
+        self.assertTrue(all(len(chunk.bars.column(chunk.symbol, 'c')) == 2 for chunk in resumed))
+
+    async def test_slow_consumer_bounds_pending_chunks(self):
+        downloads = self.downloader(max_pending=3).download(['AAPL', 'MSFT'], '1Min', self.start, self.end)
+        await downloads.__anext__()
+        # While the consumer holds a chunk no new chunk is started
+        await asyncio.sleep(0.05)
+        started = {(symbol, start) for symbol, start, _, _ in self.client.requests}
+        self.assertEqual(len(started), 3)
+
+        rest = [chunk async for chunk in downloads]
+        self.assertEqual(len(rest), 7)
+
+    def test_checkpoint_appends_and_skips_torn_lines(self):
+        checkpoint = DownloadCheckpoint(self.checkpoint)
+        checkpoint.mark('a')
+        checkpoint.mark('b')
+        checkpoint.mark('a')
+        with open(self.checkpoint, 'a') as f:
+            f.write('"c')  # crash in the middle of a write
+
+        with open(self.checkpoint) as f:
+            self.assertEqual(len(f.readlines()), 3)
+        reloaded = DownloadCheckpoint(self.checkpoint)
+        self.assertEqual(reloaded.completed, {'a', 'b'})
+        reloaded.mark('d')
+        self.assertEqual(DownloadCheckpoint(self.checkpoint).completed, {'a', 'b', 'd'})
+
+    async def test_default_range_keys_are_stable(self):
+        first = [chunk.key async for chunk in self.downloader().download(['AAPL'], '1Day')]
+        self.assertTrue(first)
+        again = [chunk async for chunk in self.downloader().download(['AAPL'], '1Day')]
+        # Everything was delivered already; a rerun fetches nothing
+        self.assertEqual(again, [])
+        last_end = max(end for _, _, end, _ in self.client.requests)
+        self.assertEqual(last_end.time(), datetime.min.time())
+
+
+if __name__ == '__main__':
+    unittest.main()
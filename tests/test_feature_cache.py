@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.feature_cache import FeatureCache
+
+
+class TestFeatureCache(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = FeatureCache()
+        key = FeatureCache.make_key('AAPL', '1Min', 0, 9, 10, 'plan')
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return np.zeros(10)
+
+        first = cache.get_or_compute(key, compute)
+        second = cache.get_or_compute(key, compute)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.stats()['hit_rate'], 0.5)
+
+    def test_eviction_by_byte_budget(self):
+        cache = FeatureCache(max_bytes=2 * 80)
+        for i in range(3):
+            cache.put(('AAPL', i), np.zeros(10))
+        cache.get(('AAPL', 1))
+        cache.put(('AAPL', 3), np.zeros(10))
+
+        # The least recently used entries go first
+        self.assertIsNone(cache.get(('AAPL', 0)))
+        self.assertIsNone(cache.get(('AAPL', 2)))
+        self.assertIsNotNone(cache.get(('AAPL', 1)))
+        self.assertEqual(cache.stats()['bytes'], 160)
+        self.assertEqual(cache.evictions, 2)
+
+    def test_eviction_by_entry_count(self):
+        cache = FeatureCache(max_entries=2)
+        for i in range(3):
+            cache.put(i, np.zeros(1))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(0))
+
+    def test_invalidate_symbol(self):
+        cache = FeatureCache()
+        cache.put(FeatureCache.make_key('AAPL', '1Min', 0, 1, 2, 'plan'), np.zeros(2))
+        cache.put(FeatureCache.make_key('MSFT', '1Min', 0, 1, 2, 'plan'), np.zeros(2))
+        cache.invalidate('AAPL')
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.stats()['bytes'], 16)
+        self.assertIsNotNone(cache.get(FeatureCache.make_key('MSFT', '1Min', 0, 1, 2, 'plan')))
+
+
+class TestCachedIndicators(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        close = 100 + rng.standard_normal(200).cumsum()
+        index = pd.date_range('2024-01-02 09:30', periods=len(close), freq='min')
+        self.data = pd.DataFrame({'close': close, 'volume': rng.integers(100, 1000, len(close))}, index=index)
+        self.analyzer = DataAnalyzer({})
+
+    def test_same_bars_hit(self):
+        first = self.analyzer.compute_features_cached('AAPL', self.data)
+        second = self.analyzer.compute_features_cached('AAPL', self.data.copy())
+        self.assertIs(first, second)
+
+    def test_key_changes_with_history(self):
+        full = self.analyzer.compute_features_cached('AAPL', self.data)
+        # Same last bar, shorter history: the rolling values differ
+        short = self.analyzer.compute_features_cached('AAPL', self.data.iloc[-60:])
+
+        self.assertIsNot(full, short)
+        self.assertEqual(len(short), 60)
+        self.assertEqual(self.analyzer.feature_cache.misses, 2)
+
+    def test_key_changes_with_new_bar(self):
+        before = self.analyzer.compute_features_cached('AAPL', self.data.iloc[:-1])
+        after = self.analyzer.compute_features_cached('AAPL', self.data)
+        self.assertEqual(len(after), len(before) + 1)
+
+
+    def test_key_changes_with_forming_bar(self):
+        before = self.analyzer.compute_features_cached('AAPL', self.data)
+        # The last bar is fetched again before it closes, with a new close
+        refetched = self.data.copy()
+        refetched.iloc[-1, refetched.columns.get_loc('close')] += 1.0
+        after = self.analyzer.compute_features_cached('AAPL', refetched)
+
+        self.assertIsNot(before, after)
+        self.assertEqual(after['close'].iat[-1], refetched['close'].iat[-1])
+        self.assertNotEqual(after['SMA_10'].iat[-1], before['SMA_10'].iat[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.feature_pruning import prune_features
+
+
+class TestFeaturePruning(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(24)
+        self.values = rng.standard_normal((600, 5))
+        # Only the first two columns carry signal
+        self.targets = (self.values[:, 0] + 0.5 * self.values[:, 1] > 0).astype(int)
+        self.columns = ['RSI', 'SMA_50', 'SMA_10', 'EMA_12', 'MACD']
+
+    def test_keeps_informative_features(self):
+        for model in (LogisticRegression(), RandomForestClassifier(n_estimators=30, random_state=0)):
+            result = prune_features(StandardScaler(), model, self.values, self.targets, self.columns, tolerance=0.02)
+
+            self.assertEqual(result.features[0], 'RSI')
+            self.assertLessEqual(len(result.features), 3)
+            self.assertEqual(sorted(result.features + result.dropped), sorted(self.columns))
+            self.assertGreaterEqual(result.accuracy, result.baseline_accuracy - 0.02)
+            self.assertEqual(result.plan()['features'], result.features)
+
+    def test_zero_tolerance_never_loses_accuracy(self):
+        result = prune_features(StandardScaler(), LogisticRegression(), self.values, self.targets, self.columns, 0.0)
+        self.assertGreaterEqual(result.accuracy, result.baseline_accuracy)
+
+    def test_analyzer_honors_reduced_plan(self):
+        with tempfile.TemporaryDirectory() as store_dir:
+            config = {'model': {'store_dir': store_dir, 'prune_features': True, 'prune_tolerance': 0.02}}
+            analyzer = DataAnalyzer(config)
+            self.assertIn('SMA_10', analyzer.indicator_plan.outputs)
+
+            analyzer.train_model(pd.DataFrame(self.values, columns=self.columns), self.targets)
+
+            kept = analyzer.feature_columns
+            self.assertLess(len(kept), len(self.columns))
+            self.assertEqual(config['model']['feature_plan']['features'], kept)
+            # Dropped features stop being computed, except those the rule-based fallback reads
+            planned = sorted(set(kept) | set(analyzer.rule_signal.columns))
+            self.assertEqual(sorted(analyzer.indicator_plan.outputs), planned)
+
+            # The plan is restored with the saved model
+            restarted = DataAnalyzer({'model': {'store_dir': store_dir}})
+            self.assertEqual(restarted.feature_columns, kept)
+            self.assertEqual(sorted(restarted.indicator_plan.outputs), planned)
+            close = 100 + np.cumsum(np.random.default_rng(2).standard_normal((2, 80)), axis=1)
+            result = restarted.analyze_latest(['AAPL', 'MSFT'], close)
+            self.assertEqual(sorted(result[0]['indicators']), planned)
+
+    def test_fallback_and_retraining_after_pruning(self):
+        close = 100 + np.cumsum(np.random.default_rng(5).standard_normal(1500))
+        data = pd.DataFrame({'close': close})
+        config = {
+            'data': {'indicators': {'sma_periods': [10, 20, 200], 'ema_periods': [12, 26], 'rsi_period': 14}},
+            'model': {'store_dir': None, 'prune_features': True, 'prune_tolerance': 0.01},
+        }
+        analyzer = DataAnalyzer(config)
+        features = analyzer.training_features(data).dropna()
+        self.assertEqual(sorted(features.columns), sorted(['SMA_10', 'SMA_20', 'SMA_200', 'EMA_12', 'EMA_26', 'RSI']))
+
+        analyzer.train_model(features, (features.column('RSI') > 50).astype(int))
+        self.assertNotIn('SMA_200', analyzer.feature_columns)
+
+        # The fallback still finds its inputs in the default extraction
+        latest = analyzer.extract_features(data).tail(300)
+        self.assertTrue(set(analyzer.rule_signal.columns) <= set(latest.columns))
+        analyzer.force_fallback(60)
+        self.assertTrue(np.any(analyzer.predict(latest) != 0))
+        self.assertEqual(analyzer.fallback_counts['forced'], 1)
+
+        # Retraining ranks every configured indicator again, not just the kept ones
+        retrained = analyzer.training_features(data).dropna()
+        self.assertEqual(retrained.columns, features.columns)
+        trend = (retrained.column('EMA_12') > retrained.column('EMA_26')).astype(int)
+        result = analyzer.prune_features(retrained, trend)
+        self.assertEqual(sorted(result.features + result.dropped), sorted(features.columns))
+
+
+if __name__ == '__main__':
+    unittest.main()
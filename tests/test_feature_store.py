@@ -0,0 +1,88 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+
+
+class TestFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(2)
+        close = 100 + rng.standard_normal(400).cumsum()
+        index = pd.date_range('2024-03-01 14:30', periods=len(close), freq='min', tz='UTC')
+        self.data = pd.DataFrame({'close': close}, index=index)
+        self.config = {'data': {'feature_store_dir': self.tmp.name,
+                                'indicators': {'sma_periods': [10], 'ema_periods': [12], 'rsi_period': 14}}}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_incremental_append_matches_full_compute(self):
+        analyzer = DataAnalyzer(self.config)
+        self.assertEqual(analyzer.store_features('SPY', self.data.iloc[:300]), 300)
+        self.assertEqual(analyzer.store_features('SPY', self.data.iloc[:300]), 0)
+        self.assertEqual(analyzer.store_features('SPY', self.data), 100)
+
+        stored = analyzer.load_features('SPY')
+        expected = analyzer.extract_features(self.data)
+        self.assertEqual(stored.columns, expected.columns)
+        self.assertTrue(stored.index.equals(self.data.index))
+        np.testing.assert_allclose(stored.values, expected.values, rtol=1e-6, equal_nan=True)
+
+        window = analyzer.load_features('SPY', start=self.data.index[350])
+        self.assertEqual(len(window), 50)
+
+    def test_append_computes_only_warmup_and_new_rows(self):
+        analyzer = DataAnalyzer(self.config)
+        analyzer.store_features('SPY', self.data.iloc[:300])
+        warmup = analyzer.indicator_plan.warmup(['SMA_10', 'EMA_12', 'RSI'])
+        self.assertEqual(warmup, analyzer.indicator_plan.warmup(['EMA_12']))
+
+        with mock.patch.object(analyzer, 'extract_features', wraps=analyzer.extract_features) as extract:
+            self.assertEqual(analyzer.store_features('SPY', self.data.iloc[:310]), 10)
+        self.assertEqual(len(extract.call_args[0][0]), warmup + 10)
+
+    def test_definition_change_invalidates(self):
+        DataAnalyzer(self.config).store_features('SPY', self.data)
+
+        self.config['data']['indicators']['sma_periods'] = [20]
+        analyzer = DataAnalyzer(self.config)
+        self.assertIsNone(analyzer.load_features('SPY'))
+
+        self.assertEqual(analyzer.store_features('SPY', self.data), 400)
+        stored = analyzer.load_features('SPY')
+        self.assertIn('SMA_20', stored.columns)
+        self.assertNotIn('SMA_10', stored.columns)
+
+
+    def test_training_keeps_stored_features(self):
+        self.config['strategies'] = {'momentum': {'enabled': True, 'sma_period': 10}}
+        analyzer = DataAnalyzer(self.config)
+        columns = ['RSI', 'SMA_10']
+        analyzer.store_features('SPY', self.data, columns=columns)
+        fingerprint = analyzer.indicator_plan.fingerprint
+        features = analyzer.extract_features(self.data, columns + ['EMA_12']).to_frame().iloc[50:]
+        analyzer.train_model(features, (features['RSI'] > 50).astype(int))
+
+        # The plan now also serves EMA_12, but RSI and SMA_10 are computed as before
+        self.assertNotEqual(analyzer.indicator_plan.fingerprint, fingerprint)
+        self.assertIsNotNone(analyzer.load_features('SPY', columns=columns))
+        self.assertEqual(analyzer.store_features('SPY', self.data, columns=columns), 0)
+
+    def test_volume_features_round_trip(self):
+        analyzer = DataAnalyzer(self.config)
+        data = self.data.assign(volume=np.arange(len(self.data), dtype=np.float64))
+        analyzer.store_features('SPY', data)
+
+        stored = analyzer.load_features('SPY')
+        self.assertIsNotNone(stored)
+        self.assertIn('VOLUME_SMA_20', stored.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+
+
+class TestFeatureExtraction(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        close = 100 + rng.standard_normal(600).cumsum()
+        index = pd.date_range('2024-01-02 09:30', periods=len(close), freq='min')
+        self.data = pd.DataFrame({'close': close, 'volume': rng.integers(100, 1000, len(close))}, index=index)
+        self.analyzer = DataAnalyzer({})
+
+    def test_input_is_not_mutated(self):
+        before = self.data.copy()
+        self.analyzer.extract_features(self.data)
+        self.analyzer.compute_technical_indicators(self.data)
+        pd.testing.assert_frame_equal(self.data, before)
+
+    def test_matrix_layout(self):
+        features = self.analyzer.extract_features(self.data)
+
+        self.assertEqual(features.dtype, np.float32)
+        self.assertTrue(features.values.flags['C_CONTIGUOUS'])
+        self.assertEqual(features.columns, ['SMA_10', 'SMA_50', 'RSI', 'VOLUME_SMA_20'])
+        self.assertIs(features.index, self.data.index)
+        expected = self.data['close'].rolling(50).mean().to_numpy(dtype=np.float32)
+        np.testing.assert_allclose(features.column('SMA_50'), expected, rtol=1e-6)
+
+        wide = self.analyzer.extract_features(self.data, columns=['close', 'RSI'], dtype=np.float64)
+        self.assertEqual(wide.dtype, np.float64)
+        np.testing.assert_array_equal(wide.column('close'), self.data['close'])
+
+    def test_predict_accepts_matrix(self):
+        features = self.analyzer.extract_features(self.data, columns=['RSI', 'SMA_10', 'close']).dropna()
+        targets = (np.diff(features.column('close'), append=np.nan) > 0).astype(int)
+        self.analyzer.train_model(features, targets)
+
+        reordered = features.select(['close', 'SMA_10', 'RSI'])
+        np.testing.assert_array_equal(self.analyzer.predict(reordered), self.analyzer.predict(features.to_frame()))
+
+
+if __name__ == '__main__':
+    unittest.main()
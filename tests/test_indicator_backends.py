@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from trading_bot import indicator_backends
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.indicator_backends import (
+    BACKENDS, INDICATORS, IndicatorBackend, available_backends, get_backend, select_backends
+)
+from trading_bot.indicator_plan import IndicatorPlan
+
+
+class TestIndicatorBackends(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.close = 100 + rng.standard_normal((3, 400)).cumsum(axis=1)
+
+    def test_backends_agree_with_numpy(self):
+        for name in available_backends():
+            if name == 'talib':
+                continue  # TA-Lib EMA/RSI use different definitions
+            for indicator in INDICATORS:
+                expected = getattr(BACKENDS['numpy'], indicator)(self.close, 14)
+                result = getattr(BACKENDS[name], indicator)(self.close, 14)
+                np.testing.assert_allclose(result, expected, rtol=1e-8, atol=1e-8,
+                                           equal_nan=True, err_msg=f'{name} {indicator}')
+
+    def test_missing_talib_falls_back(self):
+        original = indicator_backends.talib
+        indicator_backends.talib = None
+        try:
+            self.assertNotIn('talib', available_backends())
+            self.assertEqual(get_backend('talib').name, 'numpy')
+            self.assertEqual(set(select_backends('talib').values()), {'numpy'})
+            self.assertNotIn('talib', select_backends('auto', repeats=1).values())
+        finally:
+            indicator_backends.talib = original
+
+    def test_auto_selection_covers_every_indicator(self):
+        selection = select_backends('auto', repeats=1)
+        self.assertEqual(set(selection), set(INDICATORS))
+        self.assertTrue(set(selection.values()) <= set(available_backends()))
+
+    def test_backend_must_implement_every_indicator(self):
+        class Partial(IndicatorBackend):
+            def sma(self, close, period):
+                return close
+
+        with self.assertRaises(TypeError):
+            Partial()
+
+    def test_auto_benchmark_runs_once(self):
+        indicator_backends._auto_selections.clear()
+        benchmark = mock.Mock(wraps=indicator_backends.benchmark_backends)
+        with mock.patch.object(indicator_backends, 'benchmark_backends', benchmark):
+            first = select_backends('auto', repeats=1, period=7)
+            DataAnalyzer({'data': {'indicator_backend': 'auto'}})
+            second = select_backends('auto', repeats=1, period=7)
+            self.assertEqual(benchmark.call_count, 2)
+            self.assertEqual(first, second)
+
+            select_backends('auto', refresh=True, repeats=1, period=7)
+            self.assertEqual(benchmark.call_count, 3)
+            DataAnalyzer({'data': {'indicator_backend': 'auto'}})
+            self.assertEqual(benchmark.call_count, 3)
+
+    def test_plan_results_do_not_depend_on_backend(self):
+        indicators = {'sma_periods': [10, 50], 'ema_periods': [12], 'rsi_period': 14,
+                      'bollinger_period': 20, 'bollinger_std': 2}
+        expected = IndicatorPlan(indicators).execute(self.close)
+        plan = IndicatorPlan(indicators, backends=select_backends('pandas'))
+        self.assertEqual(plan._nodes['SMA_10'][1], ('close',))
+
+        results = plan.execute(self.close)
+        for name, values in expected.items():
+            np.testing.assert_allclose(results[name], values, rtol=1e-8, atol=1e-8, equal_nan=True, err_msg=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
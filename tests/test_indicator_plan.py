@@ -0,0 +1,143 @@
+import json
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.indicator_plan import IndicatorPlan, required_indicators
+
+EXAMPLE_CONFIG = Path(__file__).resolve().parent.parent / 'config' / 'example_config.json'
+
+
+class TestIndicatorPlan(unittest.TestCase):
+
+    def setUp(self):
+        with open(EXAMPLE_CONFIG) as f:
+            self.config = json.load(f)
+        # The example stores live under the working directory; keep tests off disk
+        self.config['data']['feature_store_dir'] = None
+        self.config['model']['store_dir'] = None
+        self.indicators = dict(self.config['data']['indicators'], bollinger_period=20, bollinger_std=2)
+        rng = np.random.default_rng(3)
+        self.close = 100 + rng.standard_normal((4, 500)).cumsum(axis=1)
+
+    def test_outputs_follow_configuration(self):
+        plan = IndicatorPlan(self.indicators)
+        self.assertEqual(
+            plan.outputs,
+            ['SMA_10', 'SMA_20', 'SMA_50', 'SMA_200', 'EMA_12', 'EMA_26', 'RSI',
+             'MACD', 'MACD_signal', 'MACD_hist', 'BB_middle', 'BB_upper', 'BB_lower']
+        )
+        # MACD reuses the configured EMAs and Bollinger reuses SMA_20
+        self.assertEqual(plan._nodes['MACD'][1], ('EMA_12', 'EMA_26'))
+        self.assertEqual(plan._nodes['BB_middle'][1], ('SMA_20',))
+
+    def test_matches_pandas(self):
+        results = IndicatorPlan(self.indicators).execute(self.close)
+        series = pd.Series(self.close[2])
+        macd = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+        expected = {
+            'SMA_200': series.rolling(200).mean(),
+            'EMA_26': series.ewm(span=26, adjust=False).mean(),
+            'MACD_signal': macd.ewm(span=9, adjust=False).mean(),
+            'BB_upper': series.rolling(20).mean() + 2 * series.rolling(20).std(),
+        }
+        for name, values in expected.items():
+            np.testing.assert_allclose(results[name][2], values, rtol=1e-9, atol=1e-9, err_msg=name)
+
+    def test_default_configuration_keeps_original_columns(self):
+        data = pd.DataFrame({'close': self.close[0]})
+        result = DataAnalyzer({}).compute_technical_indicators(data)
+
+        self.assertEqual(list(result.columns), ['close', 'SMA_10', 'SMA_50', 'RSI'])
+        np.testing.assert_allclose(result['SMA_50'], data['close'].rolling(50).mean(), rtol=1e-9)
+
+    def test_universe_tensor_matches_single_series(self):
+        analyzer = DataAnalyzer(self.config)
+        tensor, names = analyzer.compute_universe_indicators(self.close)
+        single = analyzer.indicator_plan.execute(self.close[1])
+
+        self.assertEqual(tensor.shape, (4, 500, len(names)))
+        for k, name in enumerate(names):
+            np.testing.assert_allclose(tensor[1, :, k], single[name], rtol=1e-12, equal_nan=True)
+
+    def test_enabled_strategies_select_subgraph(self):
+        plan = IndicatorPlan.from_config(self.config)
+        # Momentum reads RSI and SMA_20; the rule-based fallback the shortest and longest SMA
+        self.assertEqual(plan.outputs, ['RSI', 'SMA_20', 'SMA_10', 'SMA_200'])
+        self.assertEqual(plan.dependencies(), {'RSI', 'gain_csum', 'loss_csum', 'delta', 'SMA_20', 'SMA_10',
+                                               'SMA_200', 'close_csum'})
+
+        self.config['strategies']['momentum']['enabled'] = False
+        self.config['strategies']['mean_reversion']['enabled'] = True
+        plan = IndicatorPlan.from_config(self.config)
+        self.assertEqual(plan.outputs, ['BB_middle', 'BB_upper', 'BB_lower', 'RSI', 'SMA_10', 'SMA_200'])
+        self.assertNotIn('EMA_12', plan.dependencies())
+        self.assertIn('STD_20', plan.dependencies())
+
+    def test_model_features_extend_requirements(self):
+        required = required_indicators(self.config, ['MACD', 'EMA_5', 'close'])
+        self.assertEqual(required, ['RSI', 'SMA_20', 'SMA_10', 'SMA_200', 'MACD', 'EMA_5', 'close'])
+
+        plan = IndicatorPlan.from_config(self.config, ['MACD', 'EMA_5', 'close'])
+        self.assertEqual(plan.outputs, ['RSI', 'SMA_20', 'SMA_10', 'SMA_200', 'MACD', 'EMA_5'])
+        results = plan.execute(self.close[0])
+        expected = pd.Series(self.close[0]).ewm(span=5, adjust=False).mean()
+        np.testing.assert_allclose(results['EMA_5'], expected, rtol=1e-12)
+
+    def test_momentum_lookback_follows_timeframe(self):
+        self.assertEqual(required_indicators(self.config)[:2], ['RSI', 'SMA_20'])
+
+        self.config['data']['timeframe'] = '1Hour'
+        self.assertEqual(required_indicators(self.config)[:2], ['RSI', 'SMA_130'])
+        self.config['data']['timeframe'] = '15Min'
+        self.assertEqual(required_indicators(self.config)[:2], ['RSI', 'SMA_520'])
+
+        self.config['strategies']['momentum']['sma_period'] = 30
+        self.assertEqual(required_indicators(self.config)[:2], ['RSI', 'SMA_30'])
+
+    def test_warmup_matches_full_history(self):
+        plan = IndicatorPlan(self.indicators)
+        self.assertEqual(plan.warmup(['SMA_200']), 200)
+        self.assertEqual(plan.warmup(['RSI']), 15)
+        self.assertGreater(plan.warmup(['MACD_signal']), plan.warmup(['MACD']))
+
+        close = 100 + np.random.default_rng(8).standard_normal(2000).cumsum()
+        full = plan.execute(close)
+        warmup = plan.warmup()
+        tail = plan.execute(close[-(warmup + 50):])
+        for name in plan.outputs:
+            np.testing.assert_allclose(tail[name][-50:], full[name][-50:], rtol=1e-9, err_msg=name)
+
+    def test_definitions_ignore_selected_outputs(self):
+        plan = IndicatorPlan({'sma_periods': [10], 'rsi_period': 14, 'macd_fast': 12, 'macd_slow': 26})
+        narrow = plan.select(['RSI'])
+
+        self.assertNotEqual(plan.fingerprint, narrow.fingerprint)
+        self.assertEqual(plan.definitions(['RSI', 'close']), narrow.definitions(['RSI', 'close']))
+        self.assertEqual(plan.definitions(['close']), {'close': {}})
+        changed = IndicatorPlan({'sma_periods': [10], 'rsi_period': 7, 'macd_fast': 12, 'macd_slow': 26})
+        self.assertNotEqual(plan.definitions(['RSI']), changed.definitions(['RSI']))
+        self.assertEqual(plan.definitions(['MACD_hist'])['MACD_hist']['signal'], 9)
+
+    def test_lazy_evaluation_only_computes_requested_nodes(self):
+        lazy = IndicatorPlan(self.indicators).bind(self.close)
+        lazy['BB_upper']
+        self.assertIn('SMA_20', lazy)
+        self.assertNotIn('RSI', lazy)
+        self.assertNotIn('EMA_12', lazy)
+
+    def test_training_adds_model_features_to_plan(self):
+        analyzer = DataAnalyzer(self.config)
+        data = analyzer.compute_technical_indicators(pd.DataFrame({'close': self.close[0]}))
+        data['MACD'] = IndicatorPlan(self.indicators).execute(self.close[0])['MACD']
+        data = data.dropna()
+        analyzer.train_model(data[['RSI', 'MACD']], (data['close'].diff() > 0).astype(int))
+
+        self.assertIn('MACD', analyzer.indicator_plan.outputs)
+
+
+if __name__ == '__main__':
+    unittest.main()
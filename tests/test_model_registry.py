@@ -0,0 +1,108 @@
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.model_bundle import fit_bundle
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(23)
+        self.history = pd.DataFrame(rng.standard_normal((600, 2)), columns=['RSI', 'SMA_10'])
+        self.targets = (self.history['RSI'] > 0).astype(int)
+        self.analyzer = DataAnalyzer({})
+        self.analyzer.train_model(self.history, self.targets)
+        self.registry = self.analyzer.model_registry
+
+        # Always-long challenger and one that learned the opposite signal
+        self.registry.register('long', fit_bundle(
+            StandardScaler(), LogisticRegression(), self.history[['RSI']].to_numpy(),
+            np.ones(600, dtype=int) * (np.arange(600) % 50 > 0), ['RSI'], 0
+        ))
+        self.registry.register('inverse', fit_bundle(
+            StandardScaler(), LogisticRegression(), self.history.to_numpy(), 1 - self.targets, ['RSI', 'SMA_10'], 0
+        ))
+        self.symbols = ['AAPL', 'MSFT', 'NVDA']
+
+    def tearDown(self):
+        self.registry.shutdown()
+
+    def test_shadow_agreement_and_virtual_pnl(self):
+        latest = pd.DataFrame({'RSI': [2.0, -2.0, 1.5], 'SMA_10': [0.0, 0.0, 0.0]}, index=self.symbols)
+        self.analyzer.predict_universe(latest, prices=np.array([100.0, 50.0, 10.0]))
+        # Prices rise 10% for every symbol before the next batch
+        scored = self.analyzer.predict_universe(latest, prices=np.array([110.0, 55.0, 11.0]))
+        self.registry.wait()
+
+        np.testing.assert_array_equal(scored['signal'], [1, 0, 1])
+        report = self.registry.report()
+        self.assertEqual(report.loc['champion', 'agreement'], 1.0)
+        self.assertEqual(report.loc['inverse', 'agreement'], 0.0)
+        self.assertAlmostEqual(report.loc['long', 'agreement'], 2 / 3)
+        self.assertEqual(report.loc['inverse', 'batches'], 2)
+        # Long positions held over the move earn 10% each
+        self.assertAlmostEqual(report.loc['champion', 'virtual_pnl'], 0.2)
+        self.assertAlmostEqual(report.loc['long', 'virtual_pnl'], 0.3)
+        self.assertAlmostEqual(report.loc['inverse', 'virtual_pnl'], 0.1)
+
+    def test_analyze_latest_is_shadowed(self):
+        self.analyzer.train_model(
+            pd.DataFrame({'RSI': self.history['RSI'] * 20 + 50, 'SMA_10': self.history['SMA_10']}), self.targets
+        )
+        close = 100 + np.cumsum(np.random.default_rng(1).standard_normal((3, 60)), axis=1)
+        self.analyzer.analyze_latest(self.symbols, close)
+        self.registry.wait()
+
+        report = self.registry.report()
+        self.assertEqual(report.loc['long', 'rows'], 3)
+        self.assertEqual(report.loc['long', 'errors'], 0)
+
+    def test_promotion_swaps_without_retraining(self):
+        previous = self.analyzer.model_bundle
+        challenger = self.registry.challengers['inverse']
+
+        promoted = self.registry.promote('inverse')
+
+        self.assertIs(self.analyzer.model_bundle, promoted)
+        self.assertIs(promoted.model, challenger.model)
+        self.assertGreater(promoted.version, previous.version)
+        self.assertNotIn('inverse', self.registry.challengers)
+        self.assertIs(self.registry.challengers[f'champion_v{previous.version}'], previous)
+        with self.assertRaises(KeyError):
+            self.registry.promote('inverse')
+
+    def test_backlog_is_dropped(self):
+        self.registry.max_pending = 0
+        latest = pd.DataFrame({'RSI': [1.0], 'SMA_10': [0.0]}, index=['AAPL'])
+        self.analyzer.predict_universe(latest)
+        self.assertEqual(self.registry.dropped, 1)
+
+    def test_promotion_while_batch_is_queued(self):
+        release = threading.Event()
+        self.registry.shadow(self.symbols, lambda name: np.zeros(3), np.zeros(3))
+        self.registry._worker.submit(release.wait)
+
+        def failing(name):
+            raise KeyError(name)
+
+        # Queued behind the blocked worker; every challenger fails to score
+        future = self.registry.shadow(self.symbols, failing, np.zeros(3))
+        self.registry.promote('inverse')
+        self.registry.remove('long')
+        release.set()
+
+        self.assertIsNone(future.result(timeout=5))
+        report = self.registry.report()
+        # The batch counts against the models as they were when it was queued
+        self.assertEqual(report.loc['champion', 'errors'], 1)
+        self.assertNotIn('long', report.index)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.model_bundle import build_model
+from trading_bot.model_search import Candidate, CandidateResult, ModelSearch, candidates_from_space
+from trading_bot.walk_forward import walk_forward_folds
+
+
+class TestModelSearch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(22)
+        self.values = rng.standard_normal((400, 3)).astype(np.float32)
+        self.targets = (self.values[:, 0] - self.values[:, 1] > 0).astype(int)
+        self.space = {
+            'random_forest': {'n_estimators': [5, 20], 'max_depth': [1, None]},
+            'logistic_regression': {'C': [1e-4, 1.0]},
+        }
+
+    def test_candidates_from_space(self):
+        candidates = candidates_from_space(self.space)
+        self.assertEqual(len(candidates), 6)
+        self.assertIn(Candidate('logistic_regression', (('C', 1.0),)), candidates)
+        self.assertEqual(candidates[0].build().get_params()['max_depth'], 1)
+        self.assertEqual(len(candidates_from_space(self.space, n_candidates=3)), 3)
+        with self.assertRaises(ValueError):
+            build_model('no_such_family')
+
+    def test_successive_halving_cuts_losers(self):
+        folds = walk_forward_folds(len(self.values), n_folds=3, test_size=80)
+        search = ModelSearch(self.values, self.targets, folds, eta=3, max_workers=2, latency_repeats=5)
+        table = search.successive_halving(candidates_from_space(self.space))
+
+        self.assertEqual(len(table), 6)
+        # Only the best third goes on to every fold
+        self.assertEqual((table['folds'] == 3).sum(), 2)
+        self.assertTrue((table['folds'] >= 1).all())
+        # Latency is timed for the finalists only, after the trials
+        self.assertTrue(table.loc[table['folds'] == 3, 'latency_ms'].notna().all())
+        self.assertTrue(table.loc[table['folds'] < 3, 'latency_ms'].isna().all())
+
+        best = search.best()
+        self.assertEqual(best.name, table.loc[0, 'candidate'])
+        self.assertNotEqual(best, Candidate('logistic_regression', (('C', 1e-4),)))
+        self.assertGreater(table.loc[0, 'score'], 0.8)
+        self.assertIsNone(search.best(max_latency_ms=0.0))
+
+    def test_hyperband_reuses_trials(self):
+        folds = walk_forward_folds(len(self.values), n_folds=3, test_size=80)
+        search = ModelSearch(self.values, self.targets, folds, eta=3, max_workers=1, latency_repeats=2)
+        table = search.hyperband(candidates_from_space(self.space))
+
+        self.assertTrue((table['folds'] <= 3).all())
+        self.assertIsNotNone(search.best())
+
+    def test_string_labels_under_spawn(self):
+        folds = walk_forward_folds(len(self.values), n_folds=2, test_size=80)
+        space = {'logistic_regression': {'C': [1.0]}}
+        labels = np.where(self.targets == 1, 'BUY', 'SELL').astype(object)
+        search = ModelSearch(self.values, labels, folds, max_workers=1, latency_repeats=2, start_method='spawn')
+        numeric = ModelSearch(self.values, self.targets, folds, max_workers=1, latency_repeats=2)
+
+        table = search.successive_halving(candidates_from_space(space))
+        expected = numeric.successive_halving(candidates_from_space(space))
+        self.assertAlmostEqual(table.loc[0, 'score'], expected.loc[0, 'score'])
+
+    def test_hyperband_scores_every_candidate(self):
+        space = dict(self.space, extra_trees={'n_estimators': [5, 10, 20], 'max_depth': [2, None]})
+        candidates = candidates_from_space(space)
+        folds = walk_forward_folds(len(self.values), n_folds=3, test_size=80)
+        search = ModelSearch(self.values, self.targets, folds, eta=3, max_workers=1, latency_repeats=2)
+        table = search.hyperband(candidates)
+
+        self.assertEqual(len(candidates), 12)
+        self.assertEqual(len(table), 12)
+        self.assertTrue((table['folds'] >= 1).all())
+
+    def test_rungs_rank_on_the_same_folds(self):
+        folds = walk_forward_folds(len(self.values), n_folds=3, test_size=80)
+        search = ModelSearch(self.values, self.targets, folds, eta=3)
+        a, b, c = candidates_from_space(self.space)[:3]
+        # a was scored on every fold by an earlier bracket
+        search.results = {
+            a: CandidateResult(a, {0: 0.5, 1: 1.0, 2: 1.0}),
+            b: CandidateResult(b, {0: 0.6}),
+            c: CandidateResult(c, {0: 0.1}),
+        }
+        runs = []
+        search._bracket(lambda alive, n_folds, rung: runs.append((list(alive), n_folds)), [a, b, c], 1)
+
+        self.assertEqual(runs[1], ([b], 3))
+
+    def test_analyzer_search_publishes_best(self):
+        analyzer = DataAnalyzer({'model': {'family': 'logistic_regression', 'params': {'C': 0.5}}})
+        self.assertEqual(analyzer.model.C, 0.5)
+        features = pd.DataFrame(self.values, columns=['RSI', 'SMA_10', 'EMA_20'])
+
+        best, table = analyzer.search_models(
+            features, self.targets, space=self.space, n_folds=3,
+            method='successive_halving', max_workers=1, train_best=True
+        )
+
+        self.assertEqual(type(analyzer.model), type(best.build()))
+        self.assertEqual(analyzer.feature_columns, ['RSI', 'SMA_10', 'EMA_20'])
+        self.assertEqual(len(table), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.recovery_manager import RecoveryManager
+from trading_bot.data_analyzer import DataAnalyzer
+
+
+class TestModelStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = {'model': {'store_dir': self.tmp.name, 'keep_versions': 2}}
+        rng = np.random.default_rng(9)
+        self.features = pd.DataFrame(rng.standard_normal((500, 3)), columns=['RSI', 'SMA_10', 'close'])
+        self.targets = (self.features['RSI'] > 0).astype(int)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_restart_serves_saved_model(self):
+        analyzer = DataAnalyzer(self.config)
+        analyzer.train_model(self.features[:400], self.targets[:400])
+        accuracy = analyzer.evaluate_model(self.features[400:], self.targets[400:])
+        self.assertEqual(analyzer.save_model(), 2)  # train_model autosaved version 1
+
+        start = time.perf_counter()
+        restarted = DataAnalyzer(self.config)
+        self.assertLess(time.perf_counter() - start, 5)
+
+        self.assertTrue(restarted.model_bundle.is_fitted)
+        self.assertEqual(restarted.feature_columns, ['RSI', 'SMA_10', 'close'])
+        np.testing.assert_array_equal(restarted.predict(self.features), analyzer.predict(self.features))
+
+        meta = restarted.model_store.metadata()
+        self.assertEqual(meta['version'], 2)
+        self.assertEqual(meta['model_type'], 'RandomForestClassifier')
+        self.assertAlmostEqual(meta['accuracy'], accuracy)
+
+        # Newer fits still replace the loaded model, and old versions are pruned
+        restarted.train_model(self.features, self.targets)
+        self.assertGreater(restarted.model_bundle.version, analyzer.model_bundle.version)
+        self.assertEqual(restarted.model_store.versions(), [2, 3])
+
+    def test_recovery_snapshot_reports_model(self):
+        analyzer = DataAnalyzer(self.config)
+        analyzer.train_model(self.features, self.targets)
+
+        state = RecoveryManager({}, None)._get_model_state(analyzer)
+        self.assertTrue(state['model_trained'])
+        self.assertEqual(state['saved_version'], 1)
+        self.assertEqual(state['feature_columns'], ['RSI', 'SMA_10', 'close'])
+        self.assertIsNotNone(state['last_training_time'])
+
+    def test_new_version_does_not_inherit_accuracy(self):
+        analyzer = DataAnalyzer(self.config)
+        analyzer.train_model(self.features[:400], self.targets[:400])
+        analyzer.evaluate_model(self.features[400:], self.targets[400:])
+        analyzer.train_model(self.features, self.targets)
+
+        self.assertIsNone(analyzer.last_accuracy)
+        self.assertIsNone(analyzer.model_store.metadata()['accuracy'])
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        analyzer = DataAnalyzer(dict(self.config, model={'store_dir': self.tmp.name}))
+        analyzer.train_model(self.features, self.targets)
+        barrier = threading.Barrier(4)
+        saved = []
+
+        def save():
+            barrier.wait()
+            saved.append(analyzer.model_store.save(analyzer.model_bundle))
+
+        threads = [threading.Thread(target=save) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(saved), [2, 3, 4, 5])
+        self.assertEqual(analyzer.model_store.versions(), [1, 2, 3, 4, 5])
+        self.assertEqual(analyzer.model_store.latest_version(), 5)
+
+    def test_untrained_without_saved_model(self):
+        analyzer = DataAnalyzer(self.config)
+        self.assertFalse(analyzer.model_bundle.is_fitted)
+        self.assertIsNone(analyzer.save_model())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+
+
+class TestOnlineLearning(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.features = pd.DataFrame(rng.standard_normal((3000, 3)) * [1, 5, 20] + [0, 10, 100],
+                                     columns=['RSI', 'SMA_10', 'close'])
+        self.targets = (self.features['RSI'] + 0.1 * rng.standard_normal(3000) > 0).astype(int)
+        self.config = {'model': {'online_learning': True, 'online_max_batch': 500, 'classes': [0, 1]}}
+
+    def test_incremental_updates_learn(self):
+        analyzer = DataAnalyzer(self.config)
+        for start in range(0, 2000, 100):
+            batch = slice(start, start + 100)
+            analyzer.partial_train(self.features[batch], self.targets[batch])
+
+        # Running scaler statistics equal a fit on everything seen so far
+        np.testing.assert_allclose(analyzer.scaler.mean_, self.features[:2000].mean(), rtol=1e-5)
+        self.assertGreater(analyzer.evaluate_model(self.features[2000:], self.targets[2000:]), 0.9)
+
+    def test_batch_size_is_bounded(self):
+        analyzer = DataAnalyzer(self.config)
+        analyzer.partial_train(self.features, self.targets)
+        self.assertEqual(analyzer.scaler.n_samples_seen_, 500)
+
+    def test_requires_online_model(self):
+        with self.assertRaises(TypeError):
+            DataAnalyzer({}).partial_train(self.features, self.targets)
+
+        analyzer = DataAnalyzer(self.config)
+        analyzer.partial_train(self.features, self.targets)
+        with self.assertRaises(ValueError):
+            analyzer.partial_train(self.features[['RSI', 'close']], self.targets)
+
+
+if __name__ == '__main__':
+    unittest.main()
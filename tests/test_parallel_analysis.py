@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot import parallel_analysis
+from trading_bot.parallel_analysis import AnalysisExecutor
+
+
+class TestParallelAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.symbols = [f'SYM{i}' for i in range(7)]
+        self.close = 100 + rng.standard_normal((7, 300)).cumsum(axis=1)
+        self.volume = rng.uniform(1e3, 1e4, (7, 300))
+
+        self.analyzer = DataAnalyzer({})
+        data = pd.DataFrame({'close': self.close[0]})
+        features = self.analyzer.extract_features(data, columns=['SMA_10', 'RSI', 'close']).dropna()
+        targets = (np.diff(features.column('close'), append=np.nan) > 0).astype(int)
+        self.analyzer.train_model(features, targets)
+
+    def test_matches_in_process_analysis(self):
+        expected = self.analyzer.analyze_latest(self.symbols, self.close, self.volume)
+        with AnalysisExecutor(self.analyzer, max_workers=3) as executor:
+            results = executor.analyze(self.symbols, self.close, self.volume)
+            # Buffers are reused across calls
+            again = executor.analyze(self.symbols, self.close[:, :-1], self.volume[:, :-1])
+
+        self.assertEqual([r['symbol'] for r in results], self.symbols)
+        self.assertEqual(results, expected)
+        self.assertTrue(all(r['signal'] in (0, 1) for r in results))
+        self.assertEqual(again, self.analyzer.analyze_latest(self.symbols, self.close[:, :-1], self.volume[:, :-1]))
+
+    def test_new_model_reaches_live_workers(self):
+        with AnalysisExecutor(self.analyzer, max_workers=2) as executor:
+            executor.analyze(self.symbols, self.close)
+            pool = executor._pool
+            self.assertNotEqual(pool._mp_context.get_start_method(), 'fork')
+
+            # Retrain on inverted targets so every signal flips
+            data = pd.DataFrame({'close': self.close[0]})
+            features = self.analyzer.extract_features(data, columns=['SMA_10', 'RSI', 'close']).dropna()
+            targets = (np.diff(features.column('close'), append=np.nan) <= 0).astype(int)
+            self.analyzer.train_model(features, targets)
+            results = executor.analyze(self.symbols, self.close)
+
+            self.assertIs(executor._pool, pool)
+        self.assertEqual(results, self.analyzer.analyze_latest(self.symbols, self.close))
+
+    def test_worker_analyzer_reuses_parent_state(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = {'data': {'indicator_backend': 'auto', 'feature_store_dir': tmp},
+                      'model': {'store_dir': tmp}}
+            executor = AnalysisExecutor(self.analyzer)
+            state = {name: getattr(self.analyzer, name) for name in executor.WORKER_STATE}
+            with mock.patch('trading_bot.data_analyzer.select_backends') as select, \
+                    mock.patch('trading_bot.data_analyzer.ModelStore') as store:
+                parallel_analysis._init_worker(config, state)
+            select.assert_not_called()
+            store.assert_not_called()
+
+        worker = parallel_analysis._worker_analyzer
+        self.assertIsNone(worker.feature_store)
+        self.assertIs(worker.model_bundle, self.analyzer.model_bundle)
+        self.assertEqual(worker.indicator_backends, self.analyzer.indicator_backends)
+        self.assertEqual(worker.analyze_latest(self.symbols, self.close),
+                         self.analyzer.analyze_latest(self.symbols, self.close))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from src.error_handler import ErrorHandler, ErrorSeverity, ErrorType
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.inference_guard import LatencyStats, RuleBasedSignal
+
+EXAMPLE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'example_config.json')
+
+
+class SlowModel:
+    """Stands in for a model stuck in predict until released"""
+
+    def __init__(self, model):
+        self.model = model
+        self.classes_ = model.classes_
+        self.release = threading.Event()
+
+    def predict(self, values):
+        self.release.wait(5)
+        return self.model.predict(values)
+
+
+class TestPredictFallback(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(25)
+        history = pd.DataFrame({
+            'RSI': rng.uniform(0, 100, 400),
+            'SMA_10': rng.standard_normal(400),
+            'SMA_50': rng.standard_normal(400),
+        })
+        targets = (history['SMA_10'] > history['SMA_50']).astype(int)
+        self.analyzer = DataAnalyzer({'model': {'predict_budget_ms': 200}})
+        self.analyzer.train_model(history, targets)
+        # Long, flat on overbought RSI, and a short that maps to flat for a 0/1 model
+        self.latest = pd.DataFrame({'RSI': [50.0, 80.0, 50.0], 'SMA_10': [2.0, 2.0, 1.0], 'SMA_50': [1.0, 1.0, 2.0]})
+
+    def test_rule_based_signal(self):
+        rule = RuleBasedSignal('SMA_10', 'SMA_50')
+        columns = {'RSI': np.array([50.0, 80.0, 50.0, np.nan]), 'SMA_10': np.array([2.0, 2.0, 1.0, 2.0]),
+                   'SMA_50': np.array([1.0, 1.0, 2.0, 1.0])}
+        np.testing.assert_array_equal(rule.signals(columns.__getitem__, 4), [1, 0, -1, 0])
+        np.testing.assert_array_equal(rule.signals(columns.__getitem__, 4, classes=[0, 1]), [1, 0, 0, 0])
+        np.testing.assert_array_equal(rule.signals({}.__getitem__, 2), [0, 0])
+
+        configured = RuleBasedSignal.from_config({'data': {'indicators': {'sma_periods': [50, 5, 20]}}})
+        self.assertEqual((configured.fast, configured.slow), ('SMA_5', 'SMA_50'))
+
+    def test_fallback_columns_are_computed_with_example_config(self):
+        with open(EXAMPLE_CONFIG) as f:
+            config = json.load(f)
+        config['data']['feature_store_dir'] = None
+        config['model']['store_dir'] = None
+        analyzer = DataAnalyzer(config)
+        rule = analyzer.rule_signal
+        self.assertEqual(rule.columns, ['RSI', 'SMA_10', 'SMA_200'])
+        self.assertTrue(set(rule.columns) <= set(analyzer.indicator_plan.outputs))
+
+        close = np.concatenate([np.linspace(100, 150, 250), np.linspace(150, 140, 10)])
+        data = analyzer.compute_technical_indicators(pd.DataFrame({'close': close}))
+        analyzer.force_fallback(60)
+        signals = analyzer.predict(data)
+        # Fast SMA above the slow one and RSI not overbought: long on the last bar
+        self.assertEqual(signals[-1], 1)
+        self.assertEqual(analyzer.fallback_counts['forced'], 1)
+
+    def test_fallback_counts_are_exact_under_threads(self):
+        self.analyzer.force_fallback(60)
+        threads = [threading.Thread(target=lambda: [self.analyzer.predict(self.latest) for _ in range(50)])
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.analyzer.inference_stats()['fallbacks']['forced'], 200)
+
+    def test_latency_is_measured(self):
+        for _ in range(5):
+            self.analyzer.predict(self.latest)
+        stats = self.analyzer.inference_stats()
+        self.assertEqual(stats['count'], 5)
+        self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+        self.assertEqual(sum(stats['fallbacks'].values()), 0)
+
+        empty = LatencyStats()
+        self.assertIsNone(empty.p99_ms)
+
+    def test_slow_model_falls_back(self):
+        slow = SlowModel(self.analyzer.model)
+        self.analyzer.model_bundle = replace(self.analyzer.model_bundle, model=slow, compiled=None)
+        self.analyzer.config['model'].update(predict_budget_ms=10, predict_workers=2)
+
+        np.testing.assert_array_equal(self.analyzer.predict(self.latest), [1, 0, 0])
+        np.testing.assert_array_equal(self.analyzer.predict(self.latest.to_numpy()), [1, 0, 0])
+        self.assertEqual(self.analyzer.fallback_counts['timeout'], 2)
+        # Both workers stuck: served immediately without queueing behind them
+        late = list(self.analyzer._late_calls)
+        self.assertEqual(len(late), 2)
+        np.testing.assert_array_equal(self.analyzer.predict(self.latest), [1, 0, 0])
+        self.assertEqual(self.analyzer.fallback_counts['timeout'], 3)
+
+        slow.release.set()
+        for call in late:
+            call.result()
+        self.assertFalse(self.analyzer._late_calls)
+        self.analyzer.config['model']['predict_budget_ms'] = 1000
+        np.testing.assert_array_equal(self.analyzer.predict(self.latest), self.analyzer.model.model.predict(
+            self.analyzer.scaler.transform(self.latest.to_numpy())))
+
+    def test_concurrent_fast_predictions_do_not_fall_back(self):
+        expected = self.analyzer.predict(self.latest)
+        results = []
+
+        def predict():
+            for _ in range(50):
+                results.append(self.analyzer.predict(self.latest))
+
+        threads = [threading.Thread(target=predict) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 200)
+        for result in results:
+            np.testing.assert_array_equal(result, expected)
+        self.assertEqual(sum(self.analyzer.fallback_counts.values()), 0)
+
+    def test_model_error_falls_back(self):
+        result = self.analyzer.predict(self.latest.drop(columns='SMA_10'))
+        np.testing.assert_array_equal(result, [0, 0, 0])
+        self.assertEqual(self.analyzer.fallback_counts['error'], 1)
+
+    def test_error_handler_forces_fallback(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            try:
+                os.mkdir('logs')
+                handler = ErrorHandler({'model_fallback_seconds': 60}, data_analyzer=self.analyzer)
+                recovered = handler.handle_error(ValueError('bad model'), ErrorType.MODEL_ERROR, ErrorSeverity.LOW)
+                self.assertFalse(ErrorHandler({})._recover_from_model_error({}))
+            finally:
+                os.chdir(cwd)
+
+        self.assertTrue(recovered)
+        np.testing.assert_array_equal(self.analyzer.predict(self.latest), [1, 0, 0])
+        self.assertEqual(self.analyzer.fallback_counts['forced'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from trade_bot.ring_buffer import BarRingBuffer
+
+
+def fill(buffer, symbol, closes):
+    for close in closes:
+        buffer.append(symbol, int(close), close, close, close, float(close), 1.0)
+
+
+class TestBarRingBuffer(unittest.TestCase):
+
+    def test_window_while_filling(self):
+        buffer = BarRingBuffer(['AAPL', 'MSFT'], capacity=4)
+        fill(buffer, 'AAPL', [1, 2])
+
+        np.testing.assert_array_equal(buffer.window('AAPL'), [1, 2])
+        np.testing.assert_array_equal(buffer.window('AAPL', n=10), [1, 2])
+        self.assertEqual(len(buffer.window('MSFT')), 0)
+        self.assertEqual(buffer.count('AAPL'), 2)
+        np.testing.assert_array_equal(buffer.counts(), [2, 0])
+
+    def test_wraparound_keeps_last_capacity_bars(self):
+        buffer = BarRingBuffer(['AAPL'], capacity=4)
+        for total in range(1, 12):
+            fill(buffer, 'AAPL', [total])
+            expected = np.arange(max(1, total - 3), total + 1)
+            np.testing.assert_array_equal(buffer.window('AAPL'), expected)
+            np.testing.assert_array_equal(buffer.window('AAPL', 't', n=2), expected[-2:])
+        self.assertEqual(buffer.count('AAPL'), 4)
+
+    def test_window_is_a_view(self):
+        buffer = BarRingBuffer(['AAPL'], capacity=3)
+        fill(buffer, 'AAPL', [1, 2, 3, 4])
+        window = buffer.window('AAPL')
+        self.assertIsNotNone(window.base)
+        self.assertTrue(np.shares_memory(window, buffer._columns['c']))
+
+    def test_latest(self):
+        buffer = BarRingBuffer(['AAPL', 'MSFT'], capacity=3)
+        fill(buffer, 'AAPL', [1, 2, 3, 4])
+        latest = buffer.latest()
+        self.assertEqual(latest[0], 4)
+        self.assertTrue(np.isnan(latest[1]))
+
+    def test_matrix_with_out(self):
+        buffer = BarRingBuffer(['AAPL', 'MSFT'], capacity=4)
+        fill(buffer, 'AAPL', [1, 2, 3, 4, 5, 6])
+        fill(buffer, 'MSFT', [10, 20, 30])
+
+        out = np.empty((2, 3))
+        result = buffer.matrix('c', n=3, out=out)
+
+        self.assertIs(result, out)
+        np.testing.assert_array_equal(out[0], [4, 5, 6])
+        np.testing.assert_array_equal(out[1], [10, 20, 30])
+        np.testing.assert_array_equal(buffer.matrix('c'), [[3, 4, 5, 6], [0, 10, 20, 30]])
+
+    def test_on_bar(self):
+        buffer = BarRingBuffer(['AAPL'], capacity=2)
+        buffer.on_bar({'S': 'AAPL', 't': '2024-01-02T14:30:00Z', 'o': 1.0, 'h': 2.0, 'l': 0.5, 'c': 1.5, 'v': 10.0})
+        buffer.on_bar({'S': 'TSLA', 't': '2024-01-02T14:30:00Z', 'o': 1.0, 'h': 1.0, 'l': 1.0, 'c': 1.0, 'v': 1.0})
+
+        self.assertEqual(buffer.window('AAPL', 't')[0], np.datetime64('2024-01-02T14:30:00', 'ns').astype(np.int64))
+        self.assertEqual(buffer.latest('h')[0], 2.0)
+        self.assertNotIn('TSLA', buffer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from trade_bot.config import Config
+from trade_bot.replay_server import ReplayServer
+from trade_bot.stream import BAR, QUOTE, TRADE, MarketDataStream
+
+
+def recorded_events():
+    events = []
+    for i in range(20):
+        for symbol in ('AAPL', 'MSFT'):
+            events.append({'T': TRADE, 'S': symbol, 'p': 100.0 + i, 's': 1, 't': i})
+            events.append({'T': QUOTE, 'S': symbol, 'bp': 99.0 + i, 'ap': 101.0 + i, 't': i})
+            events.append({'T': BAR, 'S': symbol, 'o': 1.0, 'h': 1.0, 'l': 1.0, 'c': float(i), 'v': 1.0, 't': i})
+    return events
+
+
+class FlakyServer(ReplayServer):
+    """Rejects the first client, drops the second after a bad frame and its events, then serves normally"""
+
+    connections = 0
+
+    async def _handle(self, websocket, path: str = None):
+        self.connections += 1
+        if self.connections == 1:
+            await websocket.send(json.dumps([{'T': 'error', 'code': 406, 'msg': 'connection limit exceeded'}]))
+            return
+        await super()._handle(websocket, path)
+
+    async def _replay(self, websocket, events):
+        await websocket.send('not json')
+        await super()._replay(websocket, events)
+        if self.connections == 2:
+            await websocket.close(code=1011)
+
+
+class TestReplayToStream(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.events = recorded_events()
+        self.server = ReplayServer(self.events, port=0, batch_size=7)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def collect(self, stream, q, expected):
+        task = asyncio.create_task(stream.run())
+        received = []
+        try:
+            while len(received) < expected:
+                received.append(await asyncio.wait_for(q.get(), timeout=5))
+        finally:
+            await stream.stop()
+            await asyncio.wait_for(task, timeout=5)
+        return received
+
+    async def test_subscribed_events_are_delivered_in_order(self):
+        stream = MarketDataStream(Config(), ['AAPL'], url=self.server.url, event_types=(TRADE, BAR))
+        handled = []
+        stream.subscribe(handled.append, event_types=(BAR,))
+        q = stream.queue()
+
+        received = await self.collect(stream, q, 40)
+
+        expected = [e for e in self.events if e['S'] == 'AAPL' and e['T'] in (TRADE, BAR)]
+        self.assertEqual(received, expected)
+        self.assertEqual(handled, [e for e in expected if e['T'] == BAR])
+        self.assertTrue(q.empty())
+        self.assertEqual(stream.stats['messages'], 40)
+        self.assertEqual(stream.stats['reconnects'], 0)
+
+    async def test_stop_ends_run(self):
+        stream = MarketDataStream(Config(), ['MSFT'], url=self.server.url, event_types=(QUOTE,))
+        q = stream.queue()
+        await self.collect(stream, q, 1)
+        self.assertIsNone(stream._websocket)
+        # The loop has returned; nothing is delivered after stop
+        before = stream.stats['messages']
+        await asyncio.sleep(0.05)
+        self.assertEqual(stream.stats['messages'], before)
+
+    async def test_full_queue_drops_instead_of_blocking(self):
+        stream = MarketDataStream(Config(), ['AAPL', 'MSFT'], url=self.server.url)
+        small = stream.queue(maxsize=5)
+        everything = stream.queue()
+
+        await self.collect(stream, everything, len(self.events))
+
+        self.assertEqual(small.qsize(), 5)
+        self.assertEqual(stream.stats['dropped'], len(self.events) - 5)
+
+    async def test_recording_replays_the_same_events(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'recording.jsonl')
+            stream = MarketDataStream(Config(), ['AAPL', 'MSFT'], url=self.server.url, record_path=path)
+            await self.collect(stream, stream.queue(), len(self.events))
+
+            replayed = ReplayServer.from_file(path, port=0)
+            self.assertEqual([e for e in replayed.events if e.get('T') in (TRADE, QUOTE, BAR)], self.events)
+
+
+class TestReconnect(unittest.IsolatedAsyncioTestCase):
+
+    async def test_rejected_and_dropped_connections_are_retried(self):
+        events = recorded_events()
+        server = FlakyServer(events, port=0, batch_size=7)
+        await server.start()
+        try:
+            stream = MarketDataStream(Config(), ['AAPL'], url=server.url, event_types=(BAR,), reconnect_delay=0.01)
+            q = stream.queue()
+            task = asyncio.create_task(stream.run())
+            received = []
+            try:
+                while len(received) < 40:
+                    received.append(await asyncio.wait_for(q.get(), timeout=5))
+            finally:
+                await stream.stop()
+                await asyncio.wait_for(task, timeout=5)
+        finally:
+            await server.stop()
+
+        # The dropped connection delivered everything once, the next one replays it again
+        bars = [e for e in events if e['S'] == 'AAPL' and e['T'] == BAR]
+        self.assertEqual(received, bars + bars)
+        self.assertEqual(server.connections, 3)
+        self.assertEqual(stream.stats['reconnects'], 2)
+        self.assertEqual(stream.stats['invalid'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
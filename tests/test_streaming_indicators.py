@@ -0,0 +1,78 @@
+import json
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.streaming_indicators import StreamingIndicators
+
+EXAMPLE_CONFIG = Path(__file__).resolve().parent.parent / 'config' / 'example_config.json'
+
+
+class TestStreamingIndicators(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.close = pd.Series(100 + rng.standard_normal(600).cumsum())
+        # A flat stretch exercises the zero-gain / zero-loss RSI branches
+        self.close.iloc[200:230] = self.close.iloc[200]
+
+    def _stream(self, engine):
+        rows = [engine.update(float(price)) for price in self.close]
+        return pd.DataFrame(rows)
+
+    def test_matches_batch_indicators(self):
+        analyzer = DataAnalyzer({})
+        batch = analyzer.compute_technical_indicators(pd.DataFrame({'close': self.close}))
+        streamed = self._stream(StreamingIndicators())
+
+        for column in ('SMA_10', 'SMA_50', 'RSI'):
+            np.testing.assert_allclose(streamed[column], batch[column], rtol=1e-9, atol=1e-9)
+
+    def test_matches_pandas_ema_macd_bollinger(self):
+        streamed = self._stream(StreamingIndicators())
+        ema12 = self.close.ewm(span=12, adjust=False).mean()
+        ema26 = self.close.ewm(span=26, adjust=False).mean()
+        macd = ema12 - ema26
+        signal = macd.ewm(span=9, adjust=False).mean()
+        middle = self.close.rolling(20).mean()
+        std = self.close.rolling(20).std()
+
+        np.testing.assert_allclose(streamed['EMA_12'], ema12, rtol=1e-9)
+        np.testing.assert_allclose(streamed['MACD'], macd, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(streamed['MACD_signal'], signal, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(streamed['BB_upper'], middle + 2 * std, rtol=1e-9)
+        np.testing.assert_allclose(streamed['BB_lower'], middle - 2 * std, rtol=1e-9)
+
+    def test_analyzer_keeps_state_per_symbol(self):
+        analyzer = DataAnalyzer({})
+        for price in self.close[:60]:
+            analyzer.update_indicators('AAPL', float(price))
+        values = analyzer.update_indicators('MSFT', 10.0)
+
+        self.assertTrue(np.isnan(values['SMA_10']))
+        expected = (float(self.close[51:60].sum()) + 1.0) / 10
+        self.assertAlmostEqual(analyzer.update_indicators('AAPL', 1.0)['SMA_10'], expected)
+
+    def test_streaming_follows_indicator_plan(self):
+        with open(EXAMPLE_CONFIG) as f:
+            config = json.load(f)
+        config['data'].update(feature_store_dir=None)
+        config['data']['indicators']['bollinger_period'] = 20
+        config['model'].update(store_dir=None, feature_plan={'features': ['EMA_12', 'BB_upper', 'STD_30']})
+        analyzer = DataAnalyzer(config)
+        plan = analyzer.indicator_plan
+        streamed = pd.DataFrame([analyzer.update_indicators('AAPL', float(price)) for price in self.close])
+        batch = plan.execute(self.close.to_numpy())
+
+        self.assertEqual(set(streamed.columns) - {'BB_middle', 'BB_lower'}, set(plan.outputs))
+        for unused in ('SMA_50', 'EMA_26', 'MACD'):
+            self.assertNotIn(unused, streamed.columns)
+        for column in plan.outputs:
+            np.testing.assert_allclose(streamed[column], batch[column], rtol=1e-9, atol=1e-9, err_msg=column)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.tree_inference import CompiledForest
+
+
+class TestCompiledForest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(12)
+        self.X = rng.standard_normal((1500, 5))
+        y = np.digitize(self.X[:, 0] + 0.7 * rng.standard_normal(1500), [-0.5, 0.5]) - 1
+        self.forest = RandomForestClassifier(n_estimators=25, random_state=42).fit(self.X[:1000], y[:1000])
+        self.compiled = CompiledForest.from_sklearn(self.forest)
+
+    def test_matches_sklearn(self):
+        X = self.X[1000:]
+        np.testing.assert_array_equal(self.compiled.predict(X), self.forest.predict(X))
+        np.testing.assert_array_equal(self.compiled.predict_proba(X), self.forest.predict_proba(X))
+        np.testing.assert_array_equal(self.compiled.predict(X[:1]), self.forest.predict(X[:1]))
+        self.assertEqual(list(self.compiled.classes), [-1, 0, 1])
+
+    def test_missing_values_match_sklearn(self):
+        rng = np.random.default_rng(19)
+        X = self.X[1000:].copy()
+        X[rng.random(X.shape) < 0.3] = np.nan
+        # Trained without NaN: sklearn sends NaN towards the larger child
+        np.testing.assert_array_equal(self.compiled.predict_proba(X), self.forest.predict_proba(X))
+
+        y = (self.X[:1000, 0] > 0).astype(int)
+        X_train = self.X[:1000].copy()
+        X_train[rng.random(X_train.shape) < 0.2] = np.nan
+        forest = RandomForestClassifier(n_estimators=25, random_state=42).fit(X_train, y)
+        compiled = CompiledForest.from_sklearn(forest)
+        np.testing.assert_array_equal(compiled.predict_proba(X), forest.predict_proba(X))
+        np.testing.assert_array_equal(compiled.apply(X) - compiled.roots, forest.apply(X))
+
+    def test_leaves_match_sklearn_apply(self):
+        X = self.X[1000:1100]
+        offsets = self.compiled.roots
+        np.testing.assert_array_equal(self.compiled.apply(X) - offsets, self.forest.apply(X))
+
+    def test_save_and_memory_mapped_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.compiled.save(tmp)
+            loaded = CompiledForest.load(tmp)
+            self.assertIsInstance(loaded.threshold, np.memmap)
+            np.testing.assert_array_equal(loaded.predict(self.X), self.forest.predict(self.X))
+
+    def test_analyzer_predicts_through_compiled_forest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            analyzer = DataAnalyzer({'model': {'store_dir': tmp}})
+            features = pd.DataFrame(self.X.astype(np.float32), columns=list('abcde'))
+            targets = (self.X[:, 0] > 0).astype(int)
+            analyzer.train_model(features[:1000], targets[:1000])
+
+            bundle = analyzer.model_bundle
+            self.assertIsNotNone(bundle.compiled)
+            expected = bundle.model.predict(bundle.scaler.transform(features[1000:].to_numpy()))
+            np.testing.assert_array_equal(analyzer.predict(features[1000:]), expected)
+
+            restarted = DataAnalyzer({'model': {'store_dir': tmp}})
+            self.assertIsInstance(restarted.model_bundle.compiled.value, np.memmap)
+            np.testing.assert_array_equal(restarted.predict(features[1000:]), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
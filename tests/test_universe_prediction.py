@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.data_analyzer import DataAnalyzer
+
+
+class TestUniversePrediction(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        history = pd.DataFrame(rng.standard_normal((800, 3)), columns=['RSI', 'SMA_10', 'close'])
+        targets = np.digitize(history['RSI'], [-0.5, 0.5]) - 1
+        self.analyzer = DataAnalyzer({})
+        self.analyzer.train_model(history, targets)
+
+        self.symbols = ['AAPL', 'MSFT', 'NVDA', 'TSLA']
+        self.latest = pd.DataFrame(rng.standard_normal((4, 3)), columns=['close', 'RSI', 'SMA_10'],
+                                   index=self.symbols)
+
+    def test_matches_per_symbol_predictions(self):
+        result = self.analyzer.predict_universe(self.latest)
+
+        self.assertEqual(list(result.index), self.symbols)
+        self.assertEqual(list(result.columns), ['signal', 'confidence', 'prob_-1', 'prob_0', 'prob_1'])
+        for symbol in self.symbols:
+            row = self.latest.loc[[symbol]]
+            self.assertEqual(result.at[symbol, 'signal'], self.analyzer.predict(row)[0])
+        np.testing.assert_allclose(result[['prob_-1', 'prob_0', 'prob_1']].sum(axis=1), 1.0)
+        np.testing.assert_array_equal(result['confidence'], result[['prob_-1', 'prob_0', 'prob_1']].max(axis=1))
+
+    def test_missing_features_are_flagged(self):
+        self.latest.loc['NVDA', 'RSI'] = np.nan
+        result = self.analyzer.predict_universe(self.latest)
+
+        self.assertTrue(np.isnan(result.at['NVDA', 'confidence']))
+        self.assertFalse(result.drop('NVDA')['confidence'].isna().any())
+
+    def test_feature_matrix_input(self):
+        matrix = self.analyzer.extract_features(self.latest, columns=['RSI', 'SMA_10', 'close'])
+        result = self.analyzer.predict_universe(matrix, symbols=self.symbols)
+        pd.testing.assert_frame_equal(result, self.analyzer.predict_universe(self.latest))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from trading_bot.data_analyzer import DataAnalyzer
+from trading_bot.walk_forward import PrefixMoments, WalkForwardValidator, walk_forward_folds
+
+
+class TestWalkForward(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        self.values = (rng.standard_normal((300, 3)) * [1.0, 50.0, 0.01] + [0.0, 400.0, 1.0]).astype(np.float32)
+        self.targets = (self.values[:, 0] + 0.3 * rng.standard_normal(300) > 0).astype(int)
+
+    def test_folds_never_test_on_the_past(self):
+        expanding = walk_forward_folds(300, n_folds=4, test_size=50)
+        self.assertEqual([f.test_start for f in expanding], [100, 150, 200, 250])
+        self.assertTrue(all(f.train_start == 0 and f.train_stop == f.test_start for f in expanding))
+        self.assertEqual(expanding[-1].test_stop, 300)
+
+        rolling = walk_forward_folds(300, n_folds=4, test_size=50, mode='rolling', train_size=80, gap=5)
+        self.assertTrue(all(f.train_stop - f.train_start == 80 for f in rolling))
+        self.assertTrue(all(f.test_start - f.train_stop == 5 for f in rolling))
+
+        with self.assertRaises(ValueError):
+            walk_forward_folds(10, n_folds=4, test_size=5)
+
+    def test_prefix_scaler_matches_refit(self):
+        moments = PrefixMoments(self.values)
+        for start, stop in [(0, 300), (40, 120), (150, 151)]:
+            fitted = StandardScaler().fit(self.values[start:stop].astype(np.float64))
+            derived = moments.scaler(start, stop)
+            np.testing.assert_allclose(derived.mean_, fitted.mean_, rtol=1e-9, atol=1e-9)
+            np.testing.assert_allclose(derived.scale_, fitted.scale_, rtol=1e-6)
+            np.testing.assert_allclose(
+                derived.transform(self.values[start:stop]), fitted.transform(self.values[start:stop]), atol=1e-5
+            )
+
+    def test_results_match_sequential_fits(self):
+        folds = walk_forward_folds(len(self.values), n_folds=3, test_size=60)
+        for scaler in (StandardScaler(), MinMaxScaler()):
+            validator = WalkForwardValidator(scaler, LogisticRegression(), max_workers=2)
+            streamed = list(validator.run(self.values, self.targets, folds))
+            self.assertEqual(sorted(r['index'] for r in streamed), [0, 1, 2])
+
+            results = validator.evaluate(self.values, self.targets, folds)
+            for fold in folds:
+                fitted = type(scaler)().fit(self.values[fold.train_start:fold.train_stop])
+                model = LogisticRegression().fit(
+                    fitted.transform(self.values[fold.train_start:fold.train_stop]),
+                    self.targets[fold.train_start:fold.train_stop]
+                )
+                expected = model.score(
+                    fitted.transform(self.values[fold.test_start:fold.test_stop]),
+                    self.targets[fold.test_start:fold.test_stop]
+                )
+                self.assertAlmostEqual(results.loc[fold.index, 'accuracy'], expected, delta=1 / 60)
+                self.assertEqual(results.loc[fold.index, 'n_test'], 60)
+
+    def test_string_labels_under_spawn(self):
+        folds = walk_forward_folds(len(self.values), n_folds=2, test_size=60)
+        labels = np.where(self.targets == 1, 'BUY', 'SELL').astype(object)
+        validator = WalkForwardValidator(StandardScaler(), LogisticRegression(), max_workers=2, start_method='spawn')
+
+        results = validator.evaluate(self.values, labels, folds)
+        numeric = WalkForwardValidator(StandardScaler(), LogisticRegression(), max_workers=2).evaluate(
+            self.values, self.targets, folds
+        )
+        np.testing.assert_allclose(results['accuracy'], numeric['accuracy'])
+
+    def test_analyzer_walk_forward_leaves_model_untouched(self):
+        analyzer = DataAnalyzer({})
+        features = pd.DataFrame(self.values, columns=['RSI', 'SMA_10', 'EMA_20'])
+        bundle = analyzer.model_bundle
+
+        results = list(analyzer.walk_forward(features, self.targets, n_folds=2, max_workers=1))
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(0.5 < r['accuracy'] <= 1.0 for r in results))
+        self.assertIs(analyzer.model_bundle, bundle)
+
+
+if __name__ == '__main__':
+    unittest.main()
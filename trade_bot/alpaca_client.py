@@ -1,15 +1,18 @@
 """Alpaca API client wrapper"""
 
+import asyncio
 import alpaca_trade_api as tradeapi
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Union
+from datetime import datetime, timedelta, timezone
 
+from .bar_store import BarStore, timeframe_ns
+from .bars import ColumnarBars
 from .config import Config
 
 class AlpacaClient:
     """Wrapper for Alpaca Trade API"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, bar_store: Optional[BarStore] = None):
         self.config = config
         self.api = tradeapi.REST(
             config.alpaca_api_key,
@@ -17,11 +20,15 @@ class AlpacaClient:
             config.base_url,
             api_version='v2'
         )
+        if bar_store is None and config.bar_store_dir:
+            bar_store = BarStore(config.bar_store_dir)
+        self.bar_store = bar_store
     
     async def verify_connection(self) -> bool:
         """Verify API connection"""
         try:
-            account = self.api.get_account()
+            # The REST call blocks; keep it off the event loop
+            account = await asyncio.to_thread(self.api.get_account)
             return account.status == 'ACTIVE'
         except Exception:
             return False
@@ -90,11 +97,24 @@ class AlpacaClient:
         timeframe: str = '1Min',
         start: Optional[datetime] = None,
         end: Optional[datetime] = None,
-        limit: int = 1000
-    ) -> Dict:
-        """Get historical price data"""
+        limit: int = 1000,
+        columnar: bool = False
+    ) -> Union[Dict, ColumnarBars]:
+        """Get historical price data
+        
+        With ``columnar=True`` the bars are returned as a ``ColumnarBars``
+        container (contiguous per-symbol NumPy columns) instead of the nested
+        ``column -> {timestamp -> value}`` dict.
+        
+        When a bar store is configured, bars are served from disk and only
+        the ranges that were never fetched are requested from the API.
+        """
         if start is None:
-            start = datetime.now() - timedelta(days=7)
+            start = datetime.now(timezone.utc) - timedelta(days=7)
+        
+        if self.bar_store is not None:
+            bars = self._get_bars_cached(symbols, timeframe, start, end, limit)
+            return bars if columnar else bars.to_dataframe().to_dict()
         
         bars = self.api.get_bars(
             symbols,
@@ -104,9 +124,58 @@ class AlpacaClient:
             limit=limit
         )
         
+        if columnar:
+            single = symbols if isinstance(symbols, str) else (symbols[0] if len(symbols) == 1 else None)
+            return ColumnarBars.from_frame(bars.df, symbol=single)
         return bars.df.to_dict()
     
+    def _get_bars_cached(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start: datetime,
+        end: Optional[datetime],
+        limit: int
+    ) -> ColumnarBars:
+        """Fill missing ranges in the bar store, then read the request from it"""
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        start_ns = _to_ns(start)
+        end_ns = _to_ns(end or datetime.now(timezone.utc))
+        # The bar still forming is not final; never mark it as covered
+        settled_ns = _to_ns(datetime.now(timezone.utc)) - timeframe_ns(timeframe)
+        
+        columns = {}
+        for symbol in symbols:
+            for gap_start, gap_end in self.bar_store.missing(symbol, timeframe, start_ns, end_ns):
+                fetched = self.api.get_bars(
+                    symbol,
+                    timeframe,
+                    start=_from_ns(gap_start).isoformat(),
+                    end=_from_ns(gap_end).isoformat(),
+                    limit=None
+                )
+                bars = ColumnarBars.from_frame(fetched.df, symbol=symbol)
+                cols = bars.get(symbol) if symbol in bars else {'t': []}
+                self.bar_store.write(symbol, timeframe, cols, gap_start, min(gap_end, settled_ns))
+            
+            cached = self.bar_store.read(symbol, timeframe, start_ns, end_ns)
+            columns[symbol] = {name: values[:limit] for name, values in cached.items()}
+        
+        return ColumnarBars.from_columns(columns)
+    
     def get_latest_trades(self, symbols: List[str]) -> Dict:
         """Get latest trade data for symbols"""
         trades = self.api.get_latest_trades(symbols)
-        return {symbol: trade._raw for symbol, trade in trades.items()}
\ No newline at end of file
+        return {symbol: trade._raw for symbol, trade in trades.items()}
+
+
+def _to_ns(value: datetime) -> int:
+    """Epoch nanoseconds for a datetime (naive values are treated as UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp()) * 10**9 + value.microsecond * 1000
+
+
+def _from_ns(value: int) -> datetime:
+    return datetime.fromtimestamp(value / 10**9, tz=timezone.utc)
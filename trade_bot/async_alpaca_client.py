@@ -0,0 +1,256 @@
+"""Asyncio-native Alpaca API client over a pooled aiohttp session"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+
+from .bars import ColumnarBars
+from .config import Config
+
+
+class AlpacaHTTPError(Exception):
+    """Non-2xx response from the Alpaca REST API"""
+
+    def __init__(self, status: int, message: str, url: str = ''):
+        super().__init__(f"HTTP {status} from {url}: {message}")
+        self.status = status
+        self.message = message
+        self.url = url
+
+
+class AsyncAlpacaClient:
+    """
+    Async counterpart of AlpacaClient.
+
+    Exposes the same methods as AlpacaClient as coroutines. All requests share
+    one aiohttp session whose connector keeps up to ``config.http_pool_size``
+    connections alive, so the bot loops can issue requests concurrently
+    without blocking the event loop or paying a TLS handshake per call.
+    """
+
+    MAX_PAGE_SIZE = 10000
+
+    def __init__(self, config: Config, session: Optional[aiohttp.ClientSession] = None):
+        self.config = config
+        self._session = session
+        self._owns_session = session is None
+
+    async def __aenter__(self) -> 'AsyncAlpacaClient':
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the shared session on first use (must run inside the event loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.http_pool_size,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.config.http_timeout),
+                headers={
+                    'APCA-API-KEY-ID': self.config.alpaca_api_key or '',
+                    'APCA-API-SECRET-KEY': self.config.alpaca_secret_key or ''
+                }
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """Close the connection pool"""
+        if self._session is not None and self._owns_session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Send one request over the shared pool and decode the JSON body"""
+        session = await self._get_session()
+        options: Dict[str, Any] = {}
+        # An explicit timeout=None would disable the session's default timeout
+        if timeout is not None:
+            options['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+
+        async with session.request(method, url, params=params, json=json, **options) as resp:
+            if resp.status >= 400:
+                raise AlpacaHTTPError(resp.status, await resp.text(), url)
+            return await resp.json()
+
+    def _trading_url(self, path: str) -> str:
+        return f"{self.config.base_url.rstrip('/')}/v2/{path}"
+
+    def _data_url(self, path: str) -> str:
+        return f"{self.config.data_url.rstrip('/')}/v2/{path}"
+
+    async def verify_connection(self) -> bool:
+        """Verify API connection"""
+        try:
+            account = await self._request('GET', self._trading_url('account'))
+            return account.get('status') == 'ACTIVE'
+        except Exception:
+            return False
+
+    async def get_account(self) -> Dict:
+        """Get account information"""
+        account = await self._request('GET', self._trading_url('account'))
+        return {
+            'id': account['id'],
+            'equity': float(account['equity']),
+            'cash': float(account['cash']),
+            'buying_power': float(account['buying_power']),
+            'day_trade_buying_power': float(account['daytrading_buying_power']),
+            'status': account['status']
+        }
+
+    async def get_positions(self) -> List[Dict]:
+        """Get current positions"""
+        positions = await self._request('GET', self._trading_url('positions'))
+        return [
+            {
+                'symbol': pos['symbol'],
+                'qty': int(float(pos['qty'])),
+                'market_value': float(pos['market_value']),
+                'cost_basis': float(pos['cost_basis']),
+                'unrealized_pl': float(pos['unrealized_pl']),
+                'unrealized_plpc': float(pos['unrealized_plpc']),
+                'side': pos['side']
+            }
+            for pos in positions
+        ]
+
+    async def submit_order(
+        self,
+        symbol: str,
+        qty: int,
+        side: str,
+        type: str = 'market',
+        time_in_force: str = 'day',
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None
+    ) -> Dict:
+        """Submit a trade order"""
+        payload = {
+            'symbol': symbol,
+            'qty': str(qty),
+            'side': side,
+            'type': type,
+            'time_in_force': time_in_force
+        }
+        if limit_price is not None:
+            payload['limit_price'] = str(limit_price)
+        if stop_price is not None:
+            payload['stop_price'] = str(stop_price)
+
+        order = await self._request('POST', self._trading_url('orders'), json=payload)
+        return {
+            'id': order['id'],
+            'symbol': order['symbol'],
+            'qty': int(float(order['qty'])),
+            'side': order['side'],
+            'type': order['type'],
+            'status': order['status'],
+            'submitted_at': order['submitted_at']
+        }
+
+    async def get_bars_page(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        limit: int = MAX_PAGE_SIZE,
+        page_token: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Fetch a single page of bars as raw JSON (``bars`` and ``next_page_token``)"""
+        params = {
+            'symbols': ','.join(symbols),
+            'timeframe': timeframe,
+            'start': _isoformat(start),
+            'end': _isoformat(end) if end else None,
+            'limit': min(limit, self.MAX_PAGE_SIZE),
+            'page_token': page_token
+        }
+        return await self._request('GET', self._data_url('stocks/bars'), params=params, timeout=timeout)
+
+    async def _get_symbol_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: datetime,
+        end: Optional[datetime],
+        limit: int
+    ) -> List[Dict]:
+        """Follow page tokens for one symbol until ``limit`` bars are collected"""
+        rows: List[Dict] = []
+        page_token = None
+        while len(rows) < limit:
+            page = await self.get_bars_page(
+                [symbol], timeframe, start, end,
+                limit=limit - len(rows), page_token=page_token
+            )
+            rows.extend((page.get('bars') or {}).get(symbol, []))
+            page_token = page.get('next_page_token')
+            if not page_token:
+                break
+        return rows[:limit]
+
+    async def get_bars(
+        self,
+        symbols: List[str],
+        timeframe: str = '1Min',
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 1000,
+        columnar: bool = False
+    ) -> Union[Dict, ColumnarBars]:
+        """Get historical price data
+
+        Symbols are fetched concurrently, one paginated request chain per
+        symbol, so ``limit`` applies to each symbol. See AlpacaClient.get_bars
+        for the return formats.
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        if start is None:
+            start = datetime.now(timezone.utc) - timedelta(days=7)
+
+        results = await asyncio.gather(*[
+            self._get_symbol_bars(symbol, timeframe, start, end, limit)
+            for symbol in symbols
+        ])
+        bars = ColumnarBars.from_records(dict(zip(symbols, results)))
+
+        if columnar:
+            return bars
+        return bars.to_dataframe().to_dict()
+
+    async def get_latest_trades(self, symbols: List[str]) -> Dict:
+        """Get latest trade data for symbols"""
+        data = await self._request(
+            'GET', self._data_url('stocks/trades/latest'),
+            params={'symbols': ','.join(symbols)}
+        )
+        return data.get('trades', {})
+
+
+def _isoformat(value: datetime) -> str:
+    """RFC 3339 timestamp as accepted by the data API (naive datetimes are UTC)"""
+    if value.tzinfo is None:
+        return value.isoformat() + 'Z'
+    return value.isoformat()
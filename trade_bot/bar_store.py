@@ -0,0 +1,257 @@
+"""Persistent, memory-mapped bar store with coverage tracking"""
+
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from trading_bot.column_store import ColumnStore
+
+from .bars import BAR_COLUMNS
+
+_DTYPES = {'t': np.int64, 'o': np.float64, 'h': np.float64, 'l': np.float64, 'c': np.float64, 'v': np.float64}
+
+_TIMEFRAME_UNITS_NS = {
+    'Min': 60 * 10**9,
+    'T': 60 * 10**9,
+    'Hour': 3600 * 10**9,
+    'H': 3600 * 10**9,
+    'Day': 86400 * 10**9,
+    'D': 86400 * 10**9,
+    'Week': 7 * 86400 * 10**9,
+}
+
+Interval = Tuple[int, int]
+
+# Rows of an in-progress tail rewrite, see BarStore
+_JOURNAL = 'tail.npz'
+
+
+class BarStore(ColumnStore):
+    """
+    On-disk bar history keyed by symbol and timeframe.
+
+    Each (timeframe, symbol) pair is a directory holding one raw binary file
+    per column (``t.bin``, ``o.bin``, ...) plus ``meta.json``. The meta file
+    records the row count and the time intervals already fetched from the
+    API ("coverage"), so gaps can be computed without touching the network.
+    Columns are read back with ``np.memmap`` and never fully loaded.
+
+    Appending newer bars is a plain file append. Bars that land inside the
+    stored range (such as a re-fetched, still forming last bar) rewrite the
+    rows from the first affected one onwards in place; only bars older than
+    everything stored trigger a merge and rewrite of that symbol.
+
+    Rewrites are journaled: the merged rows go to ``tail.npz`` first, then
+    into the column files, and the journal is removed once the meta file
+    has the new count. A journal left behind by a crash is replayed the
+    next time the symbol is accessed, so data and meta always agree.
+    """
+
+    EMPTY_META = {'count': 0, 'coverage': []}
+
+    def __init__(self, root: str = 'data/bars'):
+        super().__init__(root)
+        self.logger = logging.getLogger(__name__)
+
+    def _load_meta(self, path: Path) -> Dict:
+        meta = super()._load_meta(path)
+        if (path / _JOURNAL).exists():
+            meta = self._replay(path, meta)
+        return meta
+
+    def coverage(self, symbol: str, timeframe: str) -> List[Interval]:
+        """Fetched [start_ns, end_ns) intervals for a symbol"""
+        meta = self._load_meta(self._dir(symbol, timeframe))
+        return [tuple(interval) for interval in meta['coverage']]
+
+    def missing(self, symbol: str, timeframe: str, start_ns: int, end_ns: int) -> List[Interval]:
+        """Sub-intervals of [start_ns, end_ns) that have never been fetched"""
+        gaps = []
+        cursor = start_ns
+        for cov_start, cov_end in self.coverage(symbol, timeframe):
+            if cov_end <= cursor:
+                continue
+            if cov_start >= end_ns:
+                break
+            if cov_start > cursor:
+                gaps.append((cursor, cov_start))
+            cursor = max(cursor, cov_end)
+            if cursor >= end_ns:
+                break
+        if cursor < end_ns:
+            gaps.append((cursor, end_ns))
+        return gaps
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Memory-mapped column views for bars with ``start_ns <= t < end_ns``.
+
+        Returns:
+            Dict[str, np.ndarray]: Column name -> read-only array (empty if nothing stored)
+        """
+        path = self._dir(symbol, timeframe)
+        count = self._load_meta(path)['count']
+        if count == 0:
+            return {name: np.empty(0, dtype=_DTYPES[name]) for name in BAR_COLUMNS}
+
+        columns = {
+            name: np.memmap(path / f'{name}.bin', dtype=_DTYPES[name], mode='r', shape=(count,))
+            for name in BAR_COLUMNS
+        }
+        lo = 0 if start_ns is None else int(np.searchsorted(columns['t'], start_ns, side='left'))
+        hi = count if end_ns is None else int(np.searchsorted(columns['t'], end_ns, side='left'))
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+    def write(
+        self,
+        symbol: str,
+        timeframe: str,
+        columns: Dict[str, np.ndarray],
+        start_ns: int,
+        end_ns: int
+    ):
+        """
+        Store bars fetched for [start_ns, end_ns) and mark that range covered.
+
+        Args:
+            symbol: Ticker symbol
+            timeframe: Alpaca timeframe string
+            columns: Column name -> array (see BAR_COLUMNS), sorted by ``t``
+            start_ns: Start of the requested range (inclusive)
+            end_ns: End of the requested range (exclusive)
+        """
+        path = self._dir(symbol, timeframe)
+        path.mkdir(parents=True, exist_ok=True)
+        meta = self._load_meta(path)
+        count = meta['count']
+        new_t = np.asarray(columns['t'], dtype=np.int64)
+
+        if len(new_t):
+            stored_t = self.read(symbol, timeframe)['t']
+            if not count or new_t[0] > stored_t[-1]:
+                self._append(path, count, columns)
+                count += len(new_t)
+            elif new_t[0] >= stored_t[0]:
+                position = int(np.searchsorted(stored_t, new_t[0], side='left'))
+                count = self._rewrite_tail(path, symbol, timeframe, position, columns)
+            else:
+                count = self._merge(path, symbol, timeframe, columns)
+
+        meta['count'] = count
+        meta['coverage'] = _merge_intervals(meta['coverage'] + [[int(start_ns), int(end_ns)]])
+        self._save_meta(path, meta)
+        # The meta file now matches the rewritten rows
+        (path / _JOURNAL).unlink(missing_ok=True)
+
+    def _append(self, path: Path, count: int, columns: Dict[str, np.ndarray]):
+        """Fast path: all new bars are newer than the stored ones"""
+        for name in BAR_COLUMNS:
+            dtype = np.dtype(_DTYPES[name])
+            file_path = path / f'{name}.bin'
+            with open(file_path, 'ab') as f:
+                # Drop bytes past the committed count left by an interrupted write
+                f.truncate(count * dtype.itemsize)
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+
+    def _rewrite_tail(
+        self,
+        path: Path,
+        symbol: str,
+        timeframe: str,
+        position: int,
+        columns: Dict[str, np.ndarray]
+    ) -> int:
+        """
+        Merge bars that start inside the stored range into the rows from
+        ``position`` on and overwrite just those rows in place.
+
+        Rows before ``position`` are not touched, so refreshing the last bar
+        costs a few bytes per column instead of a rewrite of the history.
+        The merged rows are journaled before any column file is modified.
+        """
+        existing = {name: column[position:] for name, column in self.read(symbol, timeframe).items()}
+        merged = _combine(columns, existing)
+        # Release the memory maps before the files are shortened
+        del existing
+        tmp_file = path / (_JOURNAL + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, position=np.int64(position), **merged)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path / _JOURNAL)
+        return _apply_tail(path, position, merged)
+
+    def _merge(self, path: Path, symbol: str, timeframe: str, columns: Dict[str, np.ndarray]) -> int:
+        """Slow path: merge bars older than the stored ones and rewrite the files"""
+        return self._rewrite_tail(path, symbol, timeframe, 0, columns)
+
+    def _replay(self, path: Path, meta: Dict) -> Dict:
+        """Finish a rewrite interrupted before its meta file was saved"""
+        with np.load(path / _JOURNAL) as journal:
+            position = int(journal['position'])
+            merged = {name: journal[name] for name in BAR_COLUMNS}
+        self.logger.warning(f"Replaying interrupted bar rewrite in {path}")
+        # Rewriting the same rows again is harmless, so a crash during the
+        # replay is recovered the same way
+        meta['count'] = _apply_tail(path, position, merged)
+        self._save_meta(path, meta)
+        (path / _JOURNAL).unlink()
+        return meta
+
+
+def _apply_tail(path: Path, position: int, merged: Dict[str, np.ndarray]) -> int:
+    """Overwrite the rows from ``position`` on with ``merged`` and cut the files there"""
+    for name in BAR_COLUMNS:
+        itemsize = np.dtype(_DTYPES[name]).itemsize
+        with open(path / f'{name}.bin', 'r+b' if (path / f'{name}.bin').exists() else 'w+b') as f:
+            f.seek(position * itemsize)
+            f.write(np.ascontiguousarray(merged[name], dtype=_DTYPES[name]).tobytes())
+            f.truncate(f.tell())
+            f.flush()
+            os.fsync(f.fileno())
+    return position + len(merged['t'])
+
+
+def _combine(new: Dict[str, np.ndarray], existing: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Sorted union of two column sets; on equal timestamps the new bar wins"""
+    merged_t = np.concatenate([np.asarray(new['t'], dtype=np.int64), existing['t']])
+    # Stable sort with the new bars first, then keep the first of each timestamp
+    order = np.argsort(merged_t, kind='stable')
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = merged_t[order][1:] != merged_t[order][:-1]
+    order = order[keep]
+    return {
+        name: np.concatenate([np.asarray(new[name], dtype=_DTYPES[name]), np.asarray(existing[name])])[order]
+        for name in BAR_COLUMNS
+    }
+
+
+def timeframe_ns(timeframe: str) -> int:
+    """Length of one bar for an Alpaca timeframe string such as '5Min'"""
+    match = re.fullmatch(r'(\d*)([A-Za-z]+)', timeframe)
+    if not match or match.group(2) not in _TIMEFRAME_UNITS_NS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(match.group(1) or 1) * _TIMEFRAME_UNITS_NS[match.group(2)]
+
+
+def _merge_intervals(intervals: List[List[int]]) -> List[List[int]]:
+    """Union of half-open intervals, sorted and with touching ones joined"""
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
@@ -0,0 +1,196 @@
+"""Columnar bar containers for multi-symbol price data"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Mapping
+
+import numpy as np
+import pandas as pd
+
+BAR_COLUMNS = ('t', 'o', 'h', 'l', 'c', 'v')
+
+# Mapping from Alpaca DataFrame column names to columnar field names
+_FRAME_COLUMNS = {
+    'open': 'o',
+    'high': 'h',
+    'low': 'l',
+    'close': 'c',
+    'volume': 'v',
+}
+
+
+@dataclass
+class ColumnarBars:
+    """
+    Bars for a set of symbols stored as contiguous NumPy columns.
+
+    Rows are grouped by symbol and sorted by time inside each group. The bars
+    of ``symbols[i]`` live in ``[offsets[i], offsets[i + 1])`` of every column,
+    so per-symbol access is a slice (a view) rather than a copy.
+
+    Columns:
+        t: bar open time as int64 nanoseconds since the epoch (UTC)
+        o, h, l, c: float64 prices
+        v: float64 volume (float so fractional crypto volume survives)
+    """
+    symbols: List[str]
+    offsets: np.ndarray
+    t: np.ndarray
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+
+    def __post_init__(self):
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.symbols)
+
+    def slice(self, symbol: str) -> slice:
+        """Row range of a symbol inside the columns"""
+        i = self._index[symbol]
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def get(self, symbol: str) -> Dict[str, np.ndarray]:
+        """Zero-copy column views for one symbol"""
+        rows = self.slice(symbol)
+        return {name: getattr(self, name)[rows] for name in BAR_COLUMNS}
+
+    def column(self, symbol: str, name: str) -> np.ndarray:
+        """Zero-copy view of a single column for one symbol"""
+        return getattr(self, name)[self.slice(symbol)]
+
+    def to_frame(self, symbol: str) -> pd.DataFrame:
+        """Build an OHLCV DataFrame for one symbol indexed by timestamp"""
+        cols = self.get(symbol)
+        index = pd.to_datetime(cols['t'], utc=True)
+        return pd.DataFrame(
+            {
+                'open': cols['o'],
+                'high': cols['h'],
+                'low': cols['l'],
+                'close': cols['c'],
+                'volume': cols['v'],
+            },
+            index=index,
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """All symbols as one OHLCV DataFrame with a ``symbol`` column"""
+        frames = [self.to_frame(symbol).assign(symbol=symbol) for symbol in self.symbols]
+        return pd.concat(frames) if frames else pd.DataFrame()
+
+    @classmethod
+    def empty(cls) -> 'ColumnarBars':
+        """Container with no symbols and no rows"""
+        return cls._from_arrays([], np.zeros(1, dtype=np.int64), {})
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, symbol: str = None) -> 'ColumnarBars':
+        """
+        Convert an Alpaca bars DataFrame to columnar form.
+
+        Args:
+            df: DataFrame indexed by timestamp with OHLCV columns and, for
+                multi-symbol requests, a ``symbol`` column
+            symbol: Symbol to use when the frame has no ``symbol`` column
+
+        Returns:
+            ColumnarBars: Bars grouped by symbol in a single set of columns
+        """
+        if df is None or df.empty:
+            return cls.empty()
+
+        times = _to_epoch_ns(df.index)
+        if 'symbol' in df.columns:
+            labels = df['symbol'].to_numpy().astype(str)
+        else:
+            labels = np.full(len(df), symbol or '', dtype=object).astype(str)
+
+        # Sort by (symbol, time) once; every column is gathered with this order
+        order = np.lexsort((times, labels))
+        labels = labels[order]
+        symbols, starts = np.unique(labels, return_index=True)
+        offsets = np.append(starts, len(labels)).astype(np.int64)
+
+        columns = {'t': times[order]}
+        for frame_name, name in _FRAME_COLUMNS.items():
+            columns[name] = np.ascontiguousarray(
+                df[frame_name].to_numpy(dtype=np.float64)[order]
+            )
+        return cls._from_arrays([str(s) for s in symbols], offsets, columns)
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Mapping[str, np.ndarray]]) -> 'ColumnarBars':
+        """Build from a ``{symbol: {column: array}}`` mapping of time-sorted columns"""
+        symbols = sorted(symbol for symbol, cols in columns.items() if len(cols['t']))
+        if not symbols:
+            return cls.empty()
+        offsets = np.zeros(len(symbols) + 1, dtype=np.int64)
+        np.cumsum([len(columns[symbol]['t']) for symbol in symbols], out=offsets[1:])
+        merged = {
+            name: np.concatenate([np.asarray(columns[symbol][name]) for symbol in symbols])
+            for name in BAR_COLUMNS
+        }
+        return cls._from_arrays(symbols, offsets, merged)
+
+    @classmethod
+    def from_records(cls, records: Mapping[str, List[Dict]]) -> 'ColumnarBars':
+        """
+        Convert raw Alpaca bar JSON to columnar form.
+
+        Args:
+            records: ``{symbol: [{'t': ..., 'o': ..., 'h': ..., 'l': ..., 'c': ..., 'v': ...}]}``
+                as returned by the market data REST API
+
+        Returns:
+            ColumnarBars: Bars grouped by symbol in a single set of columns
+        """
+        symbols = sorted(symbol for symbol, rows in records.items() if rows)
+        rows = [row for symbol in symbols for row in records[symbol]]
+        if not rows:
+            return cls.empty()
+
+        offsets = np.zeros(len(symbols) + 1, dtype=np.int64)
+        np.cumsum([len(records[symbol]) for symbol in symbols], out=offsets[1:])
+        columns = {'t': _to_epoch_ns(pd.to_datetime([row['t'] for row in rows], utc=True))}
+        for name in BAR_COLUMNS[1:]:
+            columns[name] = np.fromiter((row[name] for row in rows), dtype=np.float64, count=len(rows))
+
+        # Pages normally arrive in time order; sort defensively within each symbol
+        for i in range(len(symbols)):
+            span = slice(int(offsets[i]), int(offsets[i + 1]))
+            order = np.argsort(columns['t'][span], kind='stable')
+            for name in BAR_COLUMNS:
+                columns[name][span] = columns[name][span][order]
+        return cls._from_arrays(symbols, offsets, columns)
+
+    @classmethod
+    def _from_arrays(cls, symbols, offsets, columns) -> 'ColumnarBars':
+        n = int(offsets[-1])
+        t = columns.get('t')
+        return cls(
+            symbols=list(symbols),
+            offsets=np.asarray(offsets, dtype=np.int64),
+            t=np.ascontiguousarray(t, dtype=np.int64) if t is not None else np.zeros(n, dtype=np.int64),
+            **{
+                name: np.ascontiguousarray(columns[name], dtype=np.float64)
+                if columns.get(name) is not None else np.zeros(n, dtype=np.float64)
+                for name in BAR_COLUMNS[1:]
+            }
+        )
+
+
+def _to_epoch_ns(index) -> np.ndarray:
+    """Convert a (possibly tz-aware) datetime index to int64 epoch nanoseconds"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.to_numpy().astype('datetime64[ns]').view(np.int64)
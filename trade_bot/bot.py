@@ -5,13 +5,18 @@ import logging
 from typing import Dict, List
 from datetime import datetime
 
+import numpy as np
+
 from .config import Config
-from .alpaca_client import AlpacaClient
+from .async_alpaca_client import AsyncAlpacaClient
 from .account_manager import AccountManager
 from .data_analyzer import DataAnalyzer
 from .trading_engine import TradingEngine
 from .risk_manager import RiskManager
+from .ring_buffer import BarRingBuffer
+from .stream import BAR, MarketDataStream
 from .logger import setup_logger
+from trading_bot.parallel_analysis import AnalysisExecutor
 
 class AITradingBot:
     """Main AI Trading Bot class"""
@@ -20,15 +25,29 @@ class AITradingBot:
         self.config = config
         self.logger = setup_logger(config.log_level, config.log_file)
         
-        # Initialize components
-        self.alpaca_client = AlpacaClient(config)
+        # Initialize components (async client so no loop blocks on HTTP)
+        self.alpaca_client = AsyncAlpacaClient(config)
         self.account_manager = AccountManager(self.alpaca_client)
         self.data_analyzer = DataAnalyzer(self.alpaca_client)
         self.trading_engine = TradingEngine(self.alpaca_client, config)
         self.risk_manager = RiskManager(config)
         
+        # Push-based market data; consumers attach via market_stream.subscribe()
+        self.market_stream = None
+        self.bar_buffer = None
+        if config.stream_symbols:
+            self.market_stream = MarketDataStream(config, config.stream_symbols)
+            self.bar_buffer = BarRingBuffer(config.stream_symbols, config.bar_buffer_capacity)
+            self.market_stream.subscribe(self.bar_buffer.on_bar, event_types=(BAR,))
+        
+        # Universe analysis sharded across processes over the bar buffer
+        self.analysis_executor = None
+        if self.bar_buffer is not None and config.analysis_workers:
+            self.analysis_executor = AnalysisExecutor(self.data_analyzer, config.analysis_workers)
+        
         self.is_running = False
         self._tasks: List[asyncio.Task] = []
+        self._waiting_symbols = frozenset()
     
     async def initialize(self) -> bool:
         """Initialize the trading bot"""
@@ -78,6 +97,9 @@ class AITradingBot:
         self.logger.info("Stopping AI Trading Bot...")
         self.is_running = False
         
+        if self.market_stream is not None:
+            await self.market_stream.stop()
+        
         # Cancel all tasks
         for task in self._tasks:
             task.cancel()
@@ -85,10 +107,21 @@ class AITradingBot:
         # Wait for tasks to complete
         await asyncio.gather(*self._tasks, return_exceptions=True)
         
+        if self.analysis_executor is not None:
+            self.analysis_executor.shutdown()
+        
+        # Release pooled HTTP connections
+        await self.alpaca_client.close()
+        
         self.logger.info("AI Trading Bot stopped")
     
     async def _data_collection_loop(self):
         """Continuous data collection loop"""
+        if self.market_stream is not None:
+            # Streaming mode: events arrive as they happen, no polling needed
+            await self.market_stream.run()
+            return
+        
         while self.is_running:
             try:
                 await self.data_analyzer.collect_market_data()
@@ -101,13 +134,40 @@ class AITradingBot:
         """Market analysis loop"""
         while self.is_running:
             try:
-                signals = await self.data_analyzer.analyze_market()
+                if self.analysis_executor is not None:
+                    signals = await self._analyze_buffered_bars()
+                else:
+                    signals = await self.data_analyzer.analyze_market()
                 await self.trading_engine.process_signals(signals)
                 await asyncio.sleep(self.config.analysis_interval)
             except Exception as e:
                 self.logger.error(f"Analysis error: {e}")
                 await asyncio.sleep(30)
     
+    async def _analyze_buffered_bars(self) -> List[Dict]:
+        """Analyse the symbols of the bar buffer that have enough bars in the process pool"""
+        counts = self.bar_buffer.counts()
+        enough = counts >= max(self.config.min_analysis_bars, 1)
+        ready = np.flatnonzero(enough)
+        waiting = frozenset(symbol for symbol, ok in zip(self.bar_buffer.symbols, enough) if not ok)
+        if waiting != self._waiting_symbols:
+            # Logged when the set changes, not on every pass
+            if waiting:
+                self.logger.info(
+                    f"Waiting for {self.config.min_analysis_bars} bars before analysing "
+                    f"{len(waiting)} symbols: {', '.join(sorted(waiting))}"
+                )
+            self._waiting_symbols = waiting
+        if len(ready) == 0:
+            return []
+        # Only bars every analysed symbol already has, so no row includes stale slots
+        n = int(counts[ready].min())
+        return await self.analysis_executor.analyze_async(
+            [self.bar_buffer.symbols[i] for i in ready],
+            self.bar_buffer.matrix('c', n)[ready],
+            self.bar_buffer.matrix('v', n)[ready]
+        )
+    
     async def _trading_loop(self):
         """Trading execution loop"""
         while self.is_running:
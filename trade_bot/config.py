@@ -1,8 +1,8 @@
 """Configuration management for the trading bot"""
 
 import os
-from typing import Optional
-from dataclasses import dataclass
+from typing import List, Optional
+from dataclasses import dataclass, field
 
 @dataclass
 class Config:
@@ -11,6 +11,7 @@ class Config:
     alpaca_api_key: Optional[str] = None
     alpaca_secret_key: Optional[str] = None
     base_url: str = 'https://paper-api.alpaca.markets'  # Paper trading by default
+    data_url: str = 'https://data.alpaca.markets'
     
     # Trading parameters
     paper_trading: bool = True
@@ -22,6 +23,19 @@ class Config:
     # Data and analysis
     data_refresh_interval: int = 60  # seconds
     analysis_interval: int = 300  # 5 minutes
+    historical_data_days: int = 252  # history loaded by the bar downloader
+    bar_store_dir: Optional[str] = 'data/bars'  # on-disk bar cache, None to disable
+    analysis_workers: int = 0  # processes for universe analysis, 0 to analyse in-process
+    
+    # Real-time streaming (replaces polling when symbols are configured)
+    stream_url: str = 'wss://stream.data.alpaca.markets/v2/iex'
+    stream_symbols: List[str] = field(default_factory=list)
+    bar_buffer_capacity: int = 1000  # recent bars kept in memory per symbol
+    min_analysis_bars: int = 50  # bars a streamed symbol needs before it is analysed
+    
+    # HTTP transport (async client)
+    http_pool_size: int = 20  # keep-alive connections shared by all requests
+    http_timeout: float = 10.0  # seconds per request
     
     # Logging
     log_level: str = 'INFO'
@@ -34,5 +48,7 @@ class Config:
             alpaca_api_key=os.getenv('ALPACA_API_KEY'),
             alpaca_secret_key=os.getenv('ALPACA_SECRET_KEY'),
             base_url=os.getenv('ALPACA_BASE_URL', 'https://paper-api.alpaca.markets'),
+            data_url=os.getenv('ALPACA_DATA_URL', 'https://data.alpaca.markets'),
+            stream_url=os.getenv('ALPACA_STREAM_URL', 'wss://stream.data.alpaca.markets/v2/iex'),
             paper_trading=os.getenv('PAPER_TRADING', 'true').lower() == 'true'
         )
\ No newline at end of file
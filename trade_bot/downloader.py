@@ -0,0 +1,268 @@
+"""Chunked, resumable historical bar downloader"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from .async_alpaca_client import AsyncAlpacaClient
+from .bars import ColumnarBars
+
+# Calendar days per chunk, sized so a chunk is roughly one 10k-bar page
+CHUNK_DAYS = {
+    '1Min': 5,
+    '5Min': 30,
+    '15Min': 90,
+    '30Min': 180,
+    '1Hour': 365,
+    '1Day': 3650,
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class BarChunk:
+    """Bars of one symbol over one date chunk"""
+    symbol: str
+    timeframe: str
+    start: datetime
+    end: datetime
+    bars: ColumnarBars
+
+    @property
+    def key(self) -> str:
+        return _chunk_key(self.symbol, self.timeframe, self.start, self.end)
+
+
+class RateLimiter:
+    """Token bucket shared by all concurrent requests of a download"""
+
+    def __init__(self, rate: float, per: float = 60.0, burst: int = 1):
+        self._rate = rate / per  # tokens per second
+        self._capacity = max(1, burst)
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class DownloadCheckpoint:
+    """
+    Set of completed chunk keys persisted as a JSON-lines journal.
+
+    Every finished chunk appends one line, so recording progress costs the
+    same on the last chunk of a multi-year download as on the first. A line
+    torn by a crash mid-write is skipped on load; its chunk is fetched again.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.completed: Set[str] = set()
+        self.logger = logging.getLogger(__name__)
+        self._torn = False
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    # The next append must not continue a torn last line
+                    self._torn = not line.endswith('\n')
+                    try:
+                        self.completed.add(json.loads(line))
+                    except ValueError:
+                        self.logger.warning(f"Skipping unreadable checkpoint line in {self.path}")
+        except OSError as e:
+            self.logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            self.completed = set()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.completed
+
+    def mark(self, key: str):
+        """Record a finished chunk by appending it to the journal"""
+        if key in self.completed:
+            return
+        self.completed.add(key)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(('\n' if self._torn else '') + json.dumps(key) + '\n')
+        self._torn = False
+
+    def clear(self):
+        """Forget all progress"""
+        self.completed.clear()
+        self._torn = False
+        if self.path.exists():
+            self.path.unlink()
+
+
+class HistoricalBarDownloader:
+    """
+    Downloads long bar histories in date chunks.
+
+    The requested range is split per symbol into calendar-aligned chunks
+    (see CHUNK_DAYS). Chunks are fetched concurrently, every page request
+    goes through a shared rate limiter, and chunks are yielded as soon as
+    they complete. At most ``max_concurrency`` chunks are fetched and
+    ``max_pending`` chunks are held (fetching or waiting for the consumer)
+    at a time, so a slow consumer stalls the download instead of letting
+    finished chunks pile up in memory. A chunk is recorded in the
+    checkpoint only after the consumer has taken it, so re-running an
+    interrupted download skips everything that was already delivered.
+    """
+
+    def __init__(
+        self,
+        client: AsyncAlpacaClient,
+        checkpoint_path: str = 'data/checkpoints/bars.jsonl',
+        max_concurrency: int = 4,
+        requests_per_minute: int = 180,
+        max_pending: Optional[int] = None
+    ):
+        self.client = client
+        self.checkpoint = DownloadCheckpoint(checkpoint_path)
+        self.max_concurrency = max_concurrency
+        self.max_pending = max(max_pending or 2 * max_concurrency, max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_minute, burst=max_concurrency)
+        self.logger = logging.getLogger(__name__)
+
+    def plan_chunks(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start: datetime,
+        end: datetime
+    ) -> List[Tuple[str, datetime, datetime]]:
+        """Split the range into calendar-aligned chunks for every symbol"""
+        start, end = _as_utc(start), _as_utc(end)
+        step = _chunk_step(timeframe)
+
+        # Align boundaries to multiples of the step since the epoch so that
+        # a later run with a different start/end reuses the same chunk keys
+        boundary = _align(start, step)
+        windows = []
+        while boundary < end:
+            windows.append((max(boundary, start), min(boundary + step, end)))
+            boundary += step
+        return [(symbol, w_start, w_end) for symbol in symbols for w_start, w_end in windows]
+
+    async def _fetch_chunk(self, symbol: str, timeframe: str, start: datetime, end: datetime) -> BarChunk:
+        """Fetch every page of one chunk"""
+        rows: List[Dict] = []
+        page_token = None
+        while True:
+            await self.rate_limiter.acquire()
+            page = await self.client.get_bars_page(
+                [symbol], timeframe, start, end, page_token=page_token
+            )
+            rows.extend((page.get('bars') or {}).get(symbol, []))
+            page_token = page.get('next_page_token')
+            if not page_token:
+                break
+        return BarChunk(symbol, timeframe, start, end, ColumnarBars.from_records({symbol: rows}))
+
+    async def download(
+        self,
+        symbols: List[str],
+        timeframe: str = '1Min',
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> AsyncIterator[BarChunk]:
+        """
+        Yield BarChunk objects as they finish downloading.
+
+        Args:
+            symbols: Symbols to download
+            timeframe: Alpaca timeframe string, e.g. '1Min' or '1Day'
+            start: Range start (defaults to the chunk boundary before
+                ``config.historical_data_days`` ago)
+            end: Range end (defaults to the start of the current UTC day)
+
+        Yields:
+            BarChunk: One symbol's bars for one chunk, in completion order
+        """
+        # Defaults are pinned to day and chunk boundaries so that reruns build
+        # the same first and last chunk keys instead of ones ending at "now"
+        if end is None:
+            end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        end = _as_utc(end)
+        if start is None:
+            start = _align(end - timedelta(days=self.client.config.historical_data_days), _chunk_step(timeframe))
+
+        pending = [
+            chunk for chunk in self.plan_chunks(symbols, timeframe, start, end)
+            if _chunk_key(chunk[0], timeframe, chunk[1], chunk[2]) not in self.checkpoint
+        ]
+        self.logger.info(f"Downloading {len(pending)} chunks for {len(symbols)} symbols ({timeframe})")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(symbol, chunk_start, chunk_end):
+            async with semaphore:
+                return await self._fetch_chunk(symbol, timeframe, chunk_start, chunk_end)
+
+        queued = iter(pending)
+        in_flight: Set[asyncio.Future] = set()
+
+        def refill():
+            # Start chunks only while the window has room, so at most
+            # max_pending fetched-but-unconsumed chunks exist at a time
+            for chunk in queued:
+                in_flight.add(asyncio.ensure_future(run(*chunk)))
+                if len(in_flight) >= self.max_pending:
+                    break
+
+        try:
+            refill()
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.discard(task)
+                    chunk = task.result()
+                    yield chunk
+                    self.checkpoint.mark(chunk.key)
+                refill()
+        finally:
+            # Consumer stopped early or a chunk failed: drop the remaining work
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _chunk_step(timeframe: str) -> timedelta:
+    return timedelta(days=CHUNK_DAYS.get(timeframe, 30))
+
+
+def _align(value: datetime, step: timedelta) -> datetime:
+    """Chunk boundary at or before ``value``"""
+    return _EPOCH + ((value - _EPOCH) // step) * step
+
+
+def _chunk_key(symbol: str, timeframe: str, start: datetime, end: datetime) -> str:
+    return f"{symbol}|{timeframe}|{start.isoformat()}|{end.isoformat()}"
@@ -0,0 +1,162 @@
+"""Local WebSocket server that replays recorded market data"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import websockets
+
+from .stream import BAR, QUOTE, TRADE
+
+_CHANNELS = {'trades': TRADE, 'quotes': QUOTE, 'bars': BAR}
+
+
+class ReplayServer:
+    """
+    Stand-in for the Alpaca market data stream.
+
+    Speaks the same handshake as the real server (connected -> auth ->
+    subscribe) and then replays recorded events, filtered to the client's
+    subscription, in frames of ``batch_size`` events. ``rate`` caps the
+    replay speed in events per second; ``None`` sends as fast as the client
+    reads, which is what load tests want.
+
+    Recordings are JSON lines as written by MarketDataStream(record_path=...):
+    each line is one frame, i.e. a JSON array of events.
+    """
+
+    def __init__(
+        self,
+        events: List[Dict[str, Any]],
+        host: str = '127.0.0.1',
+        port: int = 8765,
+        rate: Optional[float] = None,
+        batch_size: int = 100,
+        repeat: int = 1
+    ):
+        self.events = events
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.batch_size = batch_size
+        self.repeat = repeat
+        self.logger = logging.getLogger(__name__)
+        self._server = None
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'ReplayServer':
+        """Load a recording written by MarketDataStream"""
+        events = []
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    events.extend(json.loads(line))
+        return cls(events, **kwargs)
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        """Start listening"""
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        # Port 0 asks the OS for a free port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info(f"Replay server listening on {self.url} with {len(self.events)} events")
+
+    async def stop(self):
+        """Close the listener and all client connections"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> 'ReplayServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _handle(self, websocket, path: str = None):
+        """Run the handshake, then replay until done or the client leaves"""
+        try:
+            await websocket.send(json.dumps([{'T': 'success', 'msg': 'connected'}]))
+            auth = json.loads(await websocket.recv())
+            if auth.get('action') != 'auth':
+                await websocket.send(json.dumps([{'T': 'error', 'code': 401, 'msg': 'not authenticated'}]))
+                return
+            await websocket.send(json.dumps([{'T': 'success', 'msg': 'authenticated'}]))
+
+            request = json.loads(await websocket.recv())
+            subscribed = {
+                kind: set(request.get(channel, []))
+                for channel, kind in _CHANNELS.items()
+            }
+            await websocket.send(json.dumps([{
+                'T': 'subscription',
+                **{channel: sorted(subscribed[kind]) for channel, kind in _CHANNELS.items()}
+            }]))
+
+            events = [
+                event for event in self.events
+                if event.get('S') in subscribed.get(event.get('T'), ())
+                or '*' in subscribed.get(event.get('T'), ())
+            ]
+            await self._replay(websocket, events)
+            # Stay connected like the real feed; the client decides when to leave
+            await websocket.wait_closed()
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _replay(self, websocket, events: List[Dict[str, Any]]):
+        """Send events in frames, paced to ``rate`` when set"""
+        started = time.monotonic()
+        sent = 0
+        for _ in range(self.repeat):
+            for i in range(0, len(events), self.batch_size):
+                frame = events[i:i + self.batch_size]
+                await websocket.send(json.dumps(frame))
+                sent += len(frame)
+                if self.rate:
+                    delay = sent / self.rate - (time.monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+        elapsed = time.monotonic() - started
+        self.logger.info(f"Replayed {sent} events in {elapsed:.2f}s ({sent / max(elapsed, 1e-9):.0f}/s)")
+
+
+async def _serve_forever(args):
+    server = ReplayServer.from_file(
+        args.recording,
+        host=args.host,
+        port=args.port,
+        rate=args.rate,
+        batch_size=args.batch_size,
+        repeat=args.repeat
+    )
+    async with server:
+        await asyncio.Future()
+
+
+def main():
+    """Command line entry point: replay a recording for offline load tests"""
+    parser = argparse.ArgumentParser(description="Replay recorded market data over WebSocket")
+    parser.add_argument('recording', help='JSON-lines recording written by MarketDataStream')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rate', type=float, default=None, help='events per second (default: unthrottled)')
+    parser.add_argument('--batch-size', type=int, default=100, help='events per WebSocket frame')
+    parser.add_argument('--repeat', type=int, default=1, help='times to replay the recording per client')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_serve_forever(args))
+
+
+if __name__ == '__main__':
+    main()
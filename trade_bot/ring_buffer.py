@@ -0,0 +1,112 @@
+"""Preallocated ring buffers holding the most recent bars of a universe"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .bars import BAR_COLUMNS
+
+_DTYPES = {'t': np.int64, 'o': np.float64, 'h': np.float64, 'l': np.float64, 'c': np.float64, 'v': np.float64}
+
+
+class BarRingBuffer:
+    """
+    Last ``capacity`` bars for every symbol of a universe.
+
+    Each column is one preallocated 2-D array of shape
+    ``(n_symbols, 2 * capacity)``. Every bar is written twice, at ``pos`` and
+    ``pos + capacity``, so the most recent ``n`` bars of a symbol are always
+    one contiguous slice. Appends are O(1) and never allocate, and
+    ``window`` returns views instead of copies.
+
+    A window view is only stable until the next append for that symbol;
+    copy it if it has to outlive the next bar.
+    """
+
+    def __init__(self, symbols: List[str], capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.symbols = list(symbols)
+        self.capacity = capacity
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._columns = {
+            name: np.zeros((len(self.symbols), 2 * capacity), dtype=_DTYPES[name])
+            for name in BAR_COLUMNS
+        }
+        self._head = np.zeros(len(self.symbols), dtype=np.int64)  # next write position
+        self._count = np.zeros(len(self.symbols), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def count(self, symbol: str) -> int:
+        """Number of bars currently held for a symbol"""
+        return int(self._count[self._index[symbol]])
+
+    def counts(self) -> np.ndarray:
+        """Number of bars currently held for every symbol, in symbol order"""
+        return self._count.copy()
+
+    def append(self, symbol: str, t: int, o: float, h: float, l: float, c: float, v: float):
+        """Store one bar, overwriting the oldest once the buffer is full"""
+        i = self._index[symbol]
+        pos = self._head[i]
+        for name, value in zip(BAR_COLUMNS, (t, o, h, l, c, v)):
+            column = self._columns[name]
+            column[i, pos] = value
+            column[i, pos + self.capacity] = value
+        self._head[i] = (pos + 1) % self.capacity
+        if self._count[i] < self.capacity:
+            self._count[i] += 1
+
+    def on_bar(self, event: Dict[str, Any]):
+        """MarketDataStream handler for minute bar events; unknown symbols are ignored"""
+        symbol = event.get('S')
+        if symbol not in self._index:
+            return
+        t = np.datetime64(event['t'].rstrip('Z'), 'ns').astype(np.int64)
+        self.append(symbol, t, event['o'], event['h'], event['l'], event['c'], event['v'])
+
+    def window(self, symbol: str, column: str = 'c', n: Optional[int] = None) -> np.ndarray:
+        """
+        Zero-copy view of the last ``n`` values of a column, oldest first.
+
+        Args:
+            symbol: Symbol to read
+            column: One of 't', 'o', 'h', 'l', 'c', 'v'
+            n: Number of bars (defaults to all bars held)
+
+        Returns:
+            np.ndarray: View into the buffer (fewer than ``n`` rows while filling up)
+        """
+        i = self._index[symbol]
+        available = int(self._count[i])
+        n = available if n is None else min(n, available)
+        end = int(self._head[i]) + self.capacity
+        return self._columns[column][i, end - n:end]
+
+    def latest(self, column: str = 'c') -> np.ndarray:
+        """Most recent value of a column for every symbol (NaN/0 before the first bar)"""
+        last = (self._head - 1) % self.capacity + self.capacity
+        values = self._columns[column][np.arange(len(self.symbols)), last]
+        if values.dtype.kind == 'f':
+            values[self._count == 0] = np.nan
+        return values
+
+    def matrix(self, column: str = 'c', n: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Last ``n`` values of a column for all symbols as a ``(n_symbols, n)`` array.
+
+        Symbols write at different positions, so unlike ``window`` this
+        gathers into a new array (or into ``out`` to avoid the allocation).
+        Rows with fewer than ``n`` bars are left-padded with stale slots;
+        check ``count`` when the universe is still warming up.
+        """
+        n = self.capacity if n is None else min(n, self.capacity)
+        start = self._head + self.capacity - n
+        rows = np.arange(len(self.symbols))[:, None] * (2 * self.capacity)
+        flat_index = rows + start[:, None] + np.arange(n)
+        return np.take(self._columns[column].ravel(), flat_index, out=out)
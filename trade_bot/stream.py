@@ -0,0 +1,176 @@
+"""Real-time market data over the Alpaca WebSocket stream"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import websockets
+
+from .config import Config
+
+# Alpaca message type codes
+TRADE = 't'
+QUOTE = 'q'
+BAR = 'b'
+EVENT_TYPES = (TRADE, QUOTE, BAR)
+
+Handler = Callable[[Dict[str, Any]], None]
+
+
+class StreamError(Exception):
+    """Authentication or subscription rejected by the stream server"""
+
+
+class MarketDataStream:
+    """
+    Subscribes to trades, quotes and minute bars and fans them out in-process.
+
+    Consumers either register a synchronous callback with ``subscribe`` (it
+    runs on the event loop and must be cheap) or take an ``asyncio.Queue``
+    from ``queue``. Queues never block the reader: when one is full the
+    event is dropped for that consumer and counted in ``stats['dropped']``.
+
+    ``run`` reconnects with exponential backoff until ``stop`` is called, so
+    a dropped connection only loses the events sent while it was down. A
+    rejected handshake or an error reply from the server (such as the
+    connection limit) is retried the same way; an unreadable frame is
+    logged, counted in ``stats['invalid']`` and skipped.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        symbols: List[str],
+        url: Optional[str] = None,
+        event_types: Iterable[str] = EVENT_TYPES,
+        record_path: Optional[str] = None,
+        reconnect_delay: float = 1.0
+    ):
+        self.config = config
+        self.symbols = list(symbols)
+        self.url = url or config.stream_url
+        self.event_types = tuple(event_types)
+        self.record_path = record_path
+        self.reconnect_delay = reconnect_delay
+        self.logger = logging.getLogger(__name__)
+
+        self._handlers: Dict[str, List[Handler]] = {kind: [] for kind in EVENT_TYPES}
+        self._queues: Dict[str, List[asyncio.Queue]] = {kind: [] for kind in EVENT_TYPES}
+        self._running = False
+        self._websocket = None
+        self.stats = {'messages': 0, 'dropped': 0, 'reconnects': 0, 'invalid': 0}
+
+    def subscribe(self, handler: Handler, event_types: Iterable[str] = EVENT_TYPES):
+        """Call ``handler(event)`` for every event of the given types"""
+        for kind in event_types:
+            self._handlers[kind].append(handler)
+
+    def queue(self, event_types: Iterable[str] = EVENT_TYPES, maxsize: int = 10000) -> asyncio.Queue:
+        """Create a bounded queue that receives events of the given types"""
+        q: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        for kind in event_types:
+            self._queues[kind].append(q)
+        return q
+
+    async def run(self):
+        """Connect, subscribe and dispatch events until stopped"""
+        self._running = True
+        backoff = self.reconnect_delay
+        record_file = open(self.record_path, 'a') if self.record_path else None
+        try:
+            while self._running:
+                try:
+                    async with websockets.connect(self.url) as websocket:
+                        self._websocket = websocket
+                        await self._handshake(websocket)
+                        backoff = self.reconnect_delay
+                        self.logger.info(f"Market data stream connected: {len(self.symbols)} symbols")
+
+                        async for raw in websocket:
+                            try:
+                                events = json.loads(raw)
+                                if not isinstance(events, list):
+                                    raise ValueError(f"expected a list of events, got {type(events).__name__}")
+                            except ValueError as e:
+                                self.stats['invalid'] += 1
+                                self.logger.warning(f"Skipping unreadable stream frame: {e}")
+                                continue
+                            if record_file is not None:
+                                record_file.write(raw if isinstance(raw, str) else raw.decode())
+                                record_file.write('\n')
+                            self._dispatch(events)
+                except StreamError as e:
+                    self.logger.error(f"Market data stream rejected the connection: {e}")
+                except websockets.InvalidHandshake as e:
+                    self.logger.warning(f"Market data stream handshake failed: {e}")
+                except (websockets.ConnectionClosed, OSError, asyncio.TimeoutError) as e:
+                    self.logger.warning(f"Market data stream disconnected: {e}")
+                finally:
+                    self._websocket = None
+
+                if not self._running:
+                    break
+                self.stats['reconnects'] += 1
+                self.logger.info(f"Reconnecting market data stream in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+        finally:
+            if record_file is not None:
+                record_file.close()
+
+    async def stop(self):
+        """Stop streaming and close the connection"""
+        self._running = False
+        if self._websocket is not None:
+            await self._websocket.close()
+
+    async def _handshake(self, websocket):
+        """Authenticate and subscribe following the Alpaca stream protocol"""
+        await self._expect(websocket, 'connected')
+        await websocket.send(json.dumps({
+            'action': 'auth',
+            'key': self.config.alpaca_api_key or '',
+            'secret': self.config.alpaca_secret_key or ''
+        }))
+        await self._expect(websocket, 'authenticated')
+
+        subscription = {'action': 'subscribe'}
+        for kind, channel in ((TRADE, 'trades'), (QUOTE, 'quotes'), (BAR, 'bars')):
+            if kind in self.event_types:
+                subscription[channel] = self.symbols
+        await websocket.send(json.dumps(subscription))
+
+    async def _expect(self, websocket, message: str):
+        """Wait for a control message, failing on an error reply"""
+        try:
+            reply = json.loads(await websocket.recv())
+        except ValueError as e:
+            raise StreamError(f"Unreadable reply while waiting for '{message}': {e}")
+        for item in reply:
+            if item.get('T') == 'error':
+                raise StreamError(f"{item.get('code')}: {item.get('msg')}")
+            if item.get('T') == 'success' and item.get('msg') == message:
+                return
+        raise StreamError(f"Expected '{message}' from stream server")
+
+    def _dispatch(self, events: List[Dict[str, Any]]):
+        """Fan a frame of events out to handlers and queues"""
+        for event in events:
+            kind = event.get('T')
+            if kind not in self._handlers:
+                if kind == 'error':
+                    self.logger.error(f"Stream error {event.get('code')}: {event.get('msg')}")
+                continue
+
+            self.stats['messages'] += 1
+            for handler in self._handlers[kind]:
+                try:
+                    handler(event)
+                except Exception as e:
+                    self.logger.error(f"Stream handler failed: {e}")
+            for q in self._queues[kind]:
+                try:
+                    q.put_nowait(event)
+                except asyncio.QueueFull:
+                    self.stats['dropped'] += 1
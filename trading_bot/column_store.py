@@ -0,0 +1,57 @@
+import copy
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnStore:
+    """
+    Base of the on-disk column stores (bars and features).
+
+    Every (timeframe, symbol) pair is a directory with one raw binary file
+    per column and a ``meta.json`` that is replaced atomically, so readers
+    never see a half-written meta file. Subclasses define the layout of the
+    meta file through ``EMPTY_META``, the meta of a series never written.
+    """
+
+    EMPTY_META: Dict = {'count': 0}
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / timeframe / safe_name(symbol)
+
+    def _load_meta(self, path: Path) -> Dict:
+        meta_file = path / 'meta.json'
+        if not meta_file.exists():
+            return copy.deepcopy(self.EMPTY_META)
+        with open(meta_file, 'r') as f:
+            return json.load(f)
+
+    def _save_meta(self, path: Path, meta: Dict):
+        tmp_file = path / 'meta.json.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_file, path / 'meta.json')
+
+
+def safe_name(name: str) -> str:
+    """File system safe form of a symbol or column name"""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+
+
+def to_epoch_ns(index) -> np.ndarray:
+    """Bar timestamps as int64 nanoseconds since the epoch (UTC)"""
+    if isinstance(index, pd.DatetimeIndex):
+        # Naive timestamps are taken as UTC
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        return index.values.astype('datetime64[ns]').view(np.int64)
+    return np.asarray(index, dtype=np.int64)
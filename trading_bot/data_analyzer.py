@@ -1,80 +1,1041 @@
+import asyncio
+import copy
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.base import clone
 from sklearn.preprocessing import StandardScaler
 
+from .column_store import to_epoch_ns
+from .feature_cache import FeatureCache
+from .feature_pruning import PruningResult, prune_features
+from .feature_store import FeatureStore
+from .features import FeatureMatrix, build_feature_matrix
+from .indicator_backends import select_backends
+from .indicator_plan import IndicatorPlan, compute_feature_tensor
+from .inference_guard import LatencyStats, PredictionTimeout, RuleBasedSignal
+from .model_bundle import ModelBundle, build_model, compile_model, fit_bundle
+from .model_registry import ModelRegistry
+from .model_search import Candidate, ModelSearch, candidates_from_space
+from .model_store import ModelStore
+from .parallel_analysis import default_start_method
+from .streaming_indicators import StreamingIndicators
+from .walk_forward import WalkForwardValidator, walk_forward_folds
+
 class DataAnalyzer:
     """
     Analyzes market data using technical indicators and machine learning models.
+
+    Args:
+        config: Bot configuration dict
+        indicator_backends: Indicator -> backend selection to use instead of
+            resolving data.indicator_backend (which may run the benchmark)
+        persistent: Open the feature and model stores and load the saved
+            model; analysis workers, which receive the model, pass False
     """
 
-    def __init__(self, config):
+    def __init__(self, config, indicator_backends: Optional[Dict[str, str]] = None, persistent: bool = True):
         self.config = config
-        self.scaler = StandardScaler()
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+        # Scaler, model and feature columns are published together, see model_bundle
+        self.model_bundle = ModelBundle(StandardScaler(), self._build_model())
+        self._versions = itertools.count(1)
+        self._publish_lock = threading.Lock()
+        self._training_pool: Optional[ProcessPoolExecutor] = None
+        self.logger = logging.getLogger(__name__)
+        # Latency-budgeted prediction, see predict
+        self.predict_latency = LatencyStats()
+        self.fallback_counts = {'timeout': 0, 'error': 0, 'forced': 0}
+        self.rule_signal = RuleBasedSignal.from_config(config)
+        self._predict_workers: Optional[ThreadPoolExecutor] = None
+        # Calls that overran the budget and still hold a worker thread
+        self._late_calls: Set[Future] = set()
+        self._predict_lock = threading.Lock()
+        self._fallback_until = 0.0
+        self.last_accuracy: Optional[float] = None
+        self.saved_version: Optional[int] = None
+        self.feature_dtype = np.dtype(self._feature_dtype_config())
+        self.indicator_backends = dict(indicator_backends or select_backends(self._indicator_backend_config()))
+        self.indicator_plan = IndicatorPlan.from_config(config, backends=self.indicator_backends)
+        self._streaming_indicators: Dict[str, StreamingIndicators] = {}
+        self.feature_cache = FeatureCache(**self._feature_cache_config())
+        store_dir = self._feature_store_dir() if persistent else None
+        self.feature_store = FeatureStore(store_dir) if store_dir else None
+        self.model_registry = ModelRegistry(
+            self,
+            max_pending=self._model_config().get('shadow_max_pending', 4),
+            log_every=self._model_config().get('shadow_log_every', 100)
+        )
+
+        # Resume from the last saved model instead of starting untrained
+        model_dir = self._model_config().get('store_dir') if persistent else None
+        self.model_store = ModelStore(model_dir) if model_dir else None
+        if self.model_store is not None and self._model_config().get('load_on_startup', True):
+            self.load_model()
+
+    @property
+    def scaler(self):
+        return self.model_bundle.scaler
+
+    @property
+    def model(self):
+        return self.model_bundle.model
+
+    @property
+    def feature_columns(self) -> List[str]:
+        return self.model_bundle.feature_columns
+
+    @property
+    def last_training_time(self) -> Optional[datetime]:
+        trained_at = self.model_bundle.trained_at
+        return datetime.fromtimestamp(trained_at) if trained_at else None
 
     def compute_technical_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """
-        Compute technical indicators such as Moving Average, RSI, etc.
+        Compute the technical indicators configured under data.indicators
+        (moving averages, RSI, MACD, ...) that the enabled strategies or the
+        trained model actually read.
+
+        The input frame is left untouched; see extract_features for a
+        compact matrix instead of a DataFrame.
 
         Args:
             data: DataFrame containing historical price data
 
         Returns:
-            DataFrame: Enhanced data with technical indicators
+            DataFrame: Copy of the data with technical indicators added
+        """
+        # Configured indicators, computed by the compiled plan in one pass
+        results = self.indicator_plan.execute(data['close'].to_numpy(dtype=np.float64))
+        return data.assign(**results)
+
+    def extract_features(
+        self,
+        data: pd.DataFrame,
+        columns: Optional[Sequence[str]] = None,
+        dtype=None
+    ) -> FeatureMatrix:
+        """
+        Compute features into a contiguous matrix without touching ``data``.
+
+        Indicators are evaluated lazily by the indicator plan and cast one
+        column at a time into a preallocated array, so only the requested
+        features are computed and no float64 copy of the result is kept.
+
+        Args:
+            data: DataFrame with a 'close' column (and optionally 'volume')
+            columns: Feature names to extract; indicator names or columns of
+                ``data``. Defaults to the model's features and the inputs of
+                the rule-based fallback once trained, otherwise to the
+                indicator plan outputs (see training_features for the full
+                candidate set).
+            dtype: Output dtype (defaults to data.feature_dtype, float32)
+
+        Returns:
+            FeatureMatrix: (bars x features) matrix indexed like ``data``
+        """
+        if columns is None:
+            columns = self._default_feature_columns('volume' in data)
+        volume = data['volume'].to_numpy(dtype=np.float64) if 'volume' in data else None
+        indicators = self.indicator_plan.bind(data['close'].to_numpy(dtype=np.float64), volume)
+
+        def lookup(name):
+            if name in data.columns:
+                return data[name].to_numpy()
+            return indicators[name]
+
+        return build_feature_matrix(columns, lookup, len(data), dtype or self.feature_dtype, data.index)
+
+    def training_features(self, data: pd.DataFrame, dtype=None) -> FeatureMatrix:
+        """
+        Every configured indicator as a feature matrix, for training.
+
+        extract_features defaults to the features of the current model, so
+        after prune_features it no longer yields the dropped indicators.
+        Training on this matrix instead lets a later pruning run rank the
+        full data.indicators set again and bring back an indicator that has
+        become informative.
+
+        Args:
+            data: DataFrame with a 'close' column (and optionally 'volume')
+            dtype: Output dtype (defaults to data.feature_dtype, float32)
+
+        Returns:
+            FeatureMatrix: (bars x features) matrix indexed like ``data``
+        """
+        return self.extract_features(data, self._candidate_feature_columns('volume' in data), dtype)
+
+    def compute_features_cached(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        timeframe: str = '1Min'
+    ) -> pd.DataFrame:
+        """
+        compute_technical_indicators behind the feature cache.
+
+        Results are keyed by symbol, timeframe, the first and last bar
+        timestamps, the number of bars, the indicator plan fingerprint and a
+        hash of the last bar's values, so calling this again before a new bar
+        arrives returns the cached frame without recomputing anything, while
+        a re-fetched forming bar with a new close or volume is recomputed.
+
+        Args:
+            symbol: Symbol the data belongs to
+            data: DataFrame indexed by bar timestamp with a 'close' column
+            timeframe: Bar timeframe of the data
+
+        Returns:
+            DataFrame: Data with technical indicators (shared with the cache, do not modify)
+        """
+        first_bar, last_bar = (data.index[0], data.index[-1]) if len(data) else (None, None)
+        last_row = int(pd.util.hash_pandas_object(data.iloc[-1:], index=False).iat[0]) if len(data) else None
+        key = FeatureCache.make_key(
+            symbol, timeframe, first_bar, last_bar, len(data), self.indicator_plan.fingerprint, last_row
+        )
+        return self.feature_cache.get_or_compute(key, lambda: self.compute_technical_indicators(data))
+
+    def feature_definition(self, columns: Sequence[str]) -> str:
+        """
+        Hash identifying how a set of feature columns is computed.
+
+        Covers the dtype and, per column, its indicator parameters and
+        warm-up (see IndicatorPlan.definitions), but not which other outputs
+        the plan selects, so retraining or pruning the model does not
+        invalidate stored columns whose computation is unchanged.
+        """
+        payload = json.dumps(
+            {'dtype': self.feature_dtype.str, 'columns': list(self.indicator_plan.definitions(columns).items())},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def store_features(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        timeframe: str = '1Min',
+        columns: Optional[Sequence[str]] = None
+    ) -> int:
+        """
+        Append the features of bars newer than the feature store holds.
+
+        Indicators are computed over the new bars plus the warm-up history
+        the longest requested indicator needs (see IndicatorPlan.warmup), so
+        the stored rows match a computation over all of ``data`` (recursive
+        ones such as EMA and MACD to floating point tolerance) at a cost that
+        does not grow with the history. Nothing is computed when the store is
+        already up to date.
+
+        Args:
+            symbol: Symbol the data belongs to
+            data: DataFrame indexed by bar timestamp with a 'close' column
+            timeframe: Bar timeframe of the data
+            columns: Feature names (see extract_features)
+
+        Returns:
+            int: Number of rows written
+        """
+        if self.feature_store is None or len(data) == 0:
+            return 0
+        columns = list(columns or self._default_feature_columns('volume' in data))
+        definition = self.feature_definition(columns)
+        last_t = self.feature_store.last_timestamp(symbol, timeframe, definition)
+        if last_t is not None:
+            first_new = int(np.searchsorted(to_epoch_ns(data.index), last_t, side='right'))
+            if first_new >= len(data):
+                return 0
+            data = data.iloc[max(0, first_new - self.indicator_plan.warmup(columns)):]
+        features = self.extract_features(data, columns)
+        return self.feature_store.append(symbol, timeframe, features, definition)
+
+    def load_features(
+        self,
+        symbol: str,
+        timeframe: str = '1Min',
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> Optional[FeatureMatrix]:
+        """
+        Read stored features for training or backtests.
+
+        Args:
+            symbol: Symbol to read
+            timeframe: Bar timeframe
+            columns: Feature names (defaults as in store_features, with the
+                volume features when the store holds them)
+            start: First bar to include
+            end: Bar to stop before
+
+        Returns:
+            Optional[FeatureMatrix]: Stored features, or None when none were
+                stored under the current definitions
+        """
+        if self.feature_store is None:
+            return None
+        if not columns:
+            stored = set(self.feature_store.columns(symbol, timeframe))
+            columns = self._default_feature_columns(set(self.indicator_plan.volume_outputs) <= stored)
+        columns = list(columns)
+        start_ns = pd.Timestamp(start).value if start is not None else None
+        end_ns = pd.Timestamp(end).value if end is not None else None
+        return self.feature_store.read(symbol, timeframe, self.feature_definition(columns), start_ns, end_ns)
+
+    def compute_bar_indicators(self, bars, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        Compute the same indicators as compute_technical_indicators directly
+        from columnar bars (see trade_bot.bars.ColumnarBars).
+
+        The close column is read as a view into the bar payload, so no
+        DataFrame is built and the price data is not copied.
+
+        Args:
+            bars: Columnar bar container returned by get_bars(columnar=True)
+            symbol: Symbol whose bars should be analysed
+
+        Returns:
+            Dict[str, np.ndarray]: Indicator name -> float64 array aligned with the bars
+        """
+        return self.indicator_plan.execute(bars.column(symbol, 'c'))
+
+    def compute_universe_indicators(
+        self,
+        close: np.ndarray,
+        volume: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Compute the configured indicators for many symbols in one vectorized pass.
+
+        Args:
+            close: (symbols x bars) matrix of close prices
+            volume: Optional (symbols x bars) matrix of volumes
+
+        Returns:
+            Tuple[np.ndarray, List[str]]: (symbols x bars x features) tensor and feature names
+        """
+        return compute_feature_tensor(close, volume, plan=self.indicator_plan)
+
+    def _feature_cache_config(self) -> Dict:
+        """FeatureCache limits from data.feature_cache (max_entries, max_bytes)"""
+        if isinstance(self.config, dict):
+            return dict(self.config.get('data', {}).get('feature_cache', {}))
+        return {}
+
+    def analyze_latest(
+        self,
+        symbols: Sequence[str],
+        close: np.ndarray,
+        volume: Optional[np.ndarray] = None
+    ) -> List[Dict]:
+        """
+        Indicators and model signal for the latest bar of many symbols.
+
+        Indicators are computed for the whole (symbols x bars) matrix in one
+        vectorized pass; the model, once trained, scores the last row of
+        every symbol in a single predict call.
+
+        Args:
+            symbols: Symbols, one per row of ``close``
+            close: (symbols x bars) close matrix
+            volume: Optional (symbols x bars) volume matrix
+
+        Returns:
+            List[Dict]: Per symbol, in input order: 'symbol', 'indicators'
+                (name -> latest value), 'signal' and 'confidence' (the
+                signal's probability); both None until the model is trained
+                or while a feature is still undefined
+        """
+        close = np.atleast_2d(close)
+        indicators = self.indicator_plan.bind(close, None if volume is None else np.atleast_2d(volume))
+        names = self.indicator_plan.outputs + (self.indicator_plan.volume_outputs if volume is not None else [])
+        latest = {name: indicators[name][:, -1] for name in names}
+
+        signals = [None] * len(symbols)
+        confidence = [None] * len(symbols)
+        bundle = self.model_bundle
+        if bundle.feature_columns and bundle.is_fitted:
+            features = build_feature_matrix(
+                bundle.feature_columns, lambda name: indicators[name][:, -1], len(symbols), self.feature_dtype
+            )
+            scored = self._score_universe(bundle, symbols, features.values)
+            scored_confidence = scored['confidence'].to_numpy()
+            for row in np.flatnonzero(~np.isnan(scored_confidence)):
+                signals[row] = scored['signal'].iat[row].item()
+                confidence[row] = float(scored_confidence[row])
+            if self.model_registry.challengers:
+                # Challengers recompute indicators from a copy on the shadow worker
+                shadow_view = self.indicator_plan.bind(close.copy(), None if volume is None else np.atleast_2d(volume).copy())
+                self.model_registry.shadow(
+                    symbols, lambda name: shadow_view[name][:, -1], self._champion_signals(scored), close[:, -1]
+                )
+
+        return [
+            {
+                'symbol': symbol,
+                'indicators': {name: float(values[row]) for name, values in latest.items()},
+                'signal': signals[row],
+                'confidence': confidence[row]
+            }
+            for row, symbol in enumerate(symbols)
+        ]
+
+    def predict_universe(
+        self,
+        features: Union[pd.DataFrame, FeatureMatrix],
+        symbols: Optional[Sequence[str]] = None,
+        prices: Optional[np.ndarray] = None
+    ) -> pd.DataFrame:
+        """
+        Score the latest feature row of every symbol in one batch.
+
+        All rows are scaled with one transform and scored with one
+        predict_proba call, so per-call overhead is paid once per analysis
+        cycle instead of once per symbol.
+
+        Args:
+            features: One row per symbol (DataFrame or FeatureMatrix); the
+                index holds the symbols unless ``symbols`` is given
+            symbols: Symbol of each row
+            prices: Latest price of each row, for the virtual P&L of shadowed
+                challengers (see model_registry)
+
+        Returns:
+            DataFrame: Indexed by symbol with 'signal', 'confidence' and one
+                'prob_<class>' column per model class. Rows with missing
+                features get a NaN confidence and probabilities, and signal 0.
+        """
+        bundle = self.model_bundle
+        if not bundle.is_fitted:
+            raise ValueError("Model is not trained")
+        if symbols is None:
+            symbols = list(features.index)
+        scored = self._score_universe(bundle, symbols, self._feature_values(features, bundle.feature_columns))
+        if self.model_registry.challengers:
+            snapshot = features.to_frame().copy() if isinstance(features, FeatureMatrix) else features.copy()
+            self.model_registry.shadow(
+                symbols, lambda name: snapshot[name].to_numpy(), self._champion_signals(scored), prices
+            )
+        return scored
+
+    @staticmethod
+    def _champion_signals(scored: pd.DataFrame) -> np.ndarray:
+        """Scored signals as floats, NaN for rows the model could not score"""
+        return np.where(scored['confidence'].isna(), np.nan, scored['signal'].to_numpy(dtype=np.float64))
+
+    def _score_universe(self, bundle: ModelBundle, symbols: Sequence[str], values: np.ndarray) -> pd.DataFrame:
+        """Signals and class probabilities for one feature row per symbol"""
+        classes = bundle.model.classes_
+        proba = np.full((len(symbols), len(classes)), np.nan)
+        valid = ~np.isnan(values).any(axis=1)
+        if valid.any():
+            proba[valid] = bundle.predict_proba(values[valid])
+
+        best = np.argmax(np.nan_to_num(proba, nan=-1.0), axis=1)
+        result = pd.DataFrame(
+            {f'prob_{label}': proba[:, k] for k, label in enumerate(classes)},
+            index=pd.Index(symbols, name='symbol')
+        )
+        signal = np.where(valid, classes[best], 0)
+        result.insert(0, 'confidence', proba[np.arange(len(symbols)), best])
+        result.insert(0, 'signal', signal)
+        return result
+
+    def _model_config(self) -> Dict:
+        """The model section of the configuration"""
+        if isinstance(self.config, dict):
+            return dict(self.config.get('model', {}))
+        return {}
+
+    def _build_model(self):
+        """
+        model.family with model.params (RandomForest by default); an SGD
+        logistic regression in online learning mode
+        """
+        model_config = self._model_config()
+        family = model_config.get('family', 'random_forest')
+        params = model_config.get('params')
+        if model_config.get('online_learning'):
+            return build_model('sgd', params if family == 'sgd' else None)
+        return build_model(family, params)
+
+    def _default_feature_columns(self, volume: bool) -> List[str]:
+        """
+        The model's features once trained, otherwise the indicator plan
+        outputs (with the volume outputs when volume data is available).
+        The inputs of the rule-based fallback are always included, also
+        when the model was pruned down to other features.
+        """
+        if self.feature_columns:
+            return list(dict.fromkeys(list(self.feature_columns) + list(self.rule_signal.columns)))
+        volume_outputs = self.indicator_plan.volume_outputs if volume else []
+        return self.indicator_plan.outputs + volume_outputs
+
+    def _candidate_feature_columns(self, volume: bool) -> List[str]:
+        """Every configured indicator (with the volume outputs when volume data is available)"""
+        plan = IndicatorPlan.from_config(self.config, backends=self.indicator_backends, restrict=False)
+        return plan.outputs + (plan.volume_outputs if volume else [])
+
+    def _training_start_method(self) -> str:
+        """model.training_start_method, 'forkserver' where available, otherwise 'spawn'"""
+        return self._model_config().get('training_start_method', default_start_method())
+
+    def _feature_store_dir(self) -> Optional[str]:
+        """data.feature_store_dir, the feature store location (disabled when unset)"""
+        if isinstance(self.config, dict):
+            return self.config.get('data', {}).get('feature_store_dir')
+        return None
+
+    def _feature_dtype_config(self) -> str:
+        """data.feature_dtype, the dtype of extracted feature matrices"""
+        if isinstance(self.config, dict):
+            return self.config.get('data', {}).get('feature_dtype', 'float32')
+        return 'float32'
+
+    def _indicator_backend_config(self) -> str:
+        """data.indicator_backend: 'auto' to benchmark at startup, or a backend name"""
+        if isinstance(self.config, dict):
+            return self.config.get('data', {}).get('indicator_backend', 'numpy')
+        return 'numpy'
+
+    def _compiled_inference(self) -> bool:
+        """model.compiled_inference, predict through a CompiledForest (default on)"""
+        return bool(self._model_config().get('compiled_inference', True))
+
+    def _training_workers(self) -> int:
+        """model.training_workers, processes used for background training"""
+        return int(self._model_config().get('training_workers', 1))
+
+    def _refresh_indicator_plan(self):
+        """Rebuild the indicator plan after the model's feature list changed"""
+        plan = IndicatorPlan.from_config(self.config, self.feature_columns, backends=self.indicator_backends)
+        if plan.fingerprint != self.indicator_plan.fingerprint:
+            self.indicator_plan = plan
+            self.reset_indicators()
+    
+    def update_indicators(self, symbol: str, close: float) -> Dict[str, float]:
+        """
+        Incrementally update a symbol's indicators with one new close.
+
+        Keeps running state per symbol so each new bar costs O(1) instead of
+        recomputing the whole history. The engine computes the outputs of the
+        indicator plan, the same selection as the batch path.
+
+        Args:
+            symbol: Symbol the bar belongs to
+            close: Close price of the new bar
+
+        Returns:
+            Dict[str, float]: Indicator name -> latest value
         """
-        # Example: adding moving averages
-        data['SMA_10'] = data['close'].rolling(window=10).mean()
-        data['SMA_50'] = data['close'].rolling(window=50).mean()
-        
-        # Example: calculating RSI
-        delta = data['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        data['RSI'] = 100 - (100 / (1 + rs))
+        engine = self._streaming_indicators.get(symbol)
+        if engine is None:
+            engine = StreamingIndicators.from_plan(self.indicator_plan)
+            self._streaming_indicators[symbol] = engine
+        return engine.update(close)
 
-        return data
+    def reset_indicators(self, symbol: str = None):
+        """Drop streaming indicator state for one symbol, or for all symbols"""
+        if symbol is None:
+            self._streaming_indicators.clear()
+        else:
+            self._streaming_indicators.pop(symbol, None)
     
-    def train_model(self, features: pd.DataFrame, targets: pd.Series):
+    def train_model(self, features: Union[pd.DataFrame, FeatureMatrix], targets: pd.Series):
         """
         Train a machine learning model on the provided features and targets.
 
+        A new scaler and model are fitted and swapped in together once the
+        fit completes; predictions keep using the previous pair until then.
+
         Args:
-            features: DataFrame with feature columns
+            features: DataFrame or FeatureMatrix with feature columns
             targets: Series with target variable (trade signals)
         """
-        # Scale the features
-        features_scaled = self.scaler.fit_transform(features)
+        if self._model_config().get('prune_features'):
+            self.prune_features(features, targets)
+            return
+        columns, values = self._training_snapshot(features)
+        bundle = self.model_bundle
+        fitted = fit_bundle(bundle.scaler, bundle.model, values, np.asarray(targets), columns,
+                            next(self._versions), self._compiled_inference())
+        if self.publish_bundle(fitted):
+            self._autosave(fitted)
+
+    def prune_features(
+        self,
+        features: Union[pd.DataFrame, FeatureMatrix],
+        targets,
+        tolerance: Optional[float] = None
+    ) -> PruningResult:
+        """
+        Train on the fewest features that keep validation accuracy.
+
+        Features are ranked by the model's importances and cut down as far
+        as validation accuracy stays within ``tolerance`` of the model on
+        all features (see feature_pruning). The model is then fitted on the
+        kept features over all rows and published, and the result is stored
+        as model.feature_plan, so the indicator plan stops computing the
+        dropped indicators and the plan is saved with the model. Indicators
+        the rule-based fallback reads stay in the plan even when the model
+        no longer uses them (see indicator_plan.required_indicators).
+
+        Only the columns of ``features`` are ranked; pass training_features
+        so every configured indicator is a candidate again, not just those
+        the previous pruning run kept.
+
+        Args:
+            features: DataFrame or FeatureMatrix with candidate feature columns
+            targets: Target variable (trade signals)
+            tolerance: Accuracy the pruned model may lose (default model.prune_tolerance, 0.005)
+
+        Returns:
+            PruningResult: Kept and dropped features with their accuracies
+        """
+        columns, values = self._training_snapshot(features)
+        targets = np.asarray(targets)
+        if tolerance is None:
+            tolerance = self._model_config().get('prune_tolerance', 0.005)
+        bundle = self.model_bundle
+        result = prune_features(bundle.scaler, bundle.model, values, targets, columns, tolerance)
 
-        # Train the model
-        self.model.fit(features_scaled, targets)
+        if isinstance(self.config, dict):
+            self.config.setdefault('model', {})['feature_plan'] = result.plan()
+        positions = [columns.index(name) for name in result.features]
+        fitted = fit_bundle(bundle.scaler, bundle.model, values[:, positions], targets, result.features,
+                            next(self._versions), self._compiled_inference())
+        if self.publish_bundle(fitted):
+            self._autosave(fitted)
+        self._refresh_indicator_plan()
+        return result
 
-    def predict(self, features: pd.DataFrame) -> np.ndarray:
+    def train_model_background(self, features: Union[pd.DataFrame, FeatureMatrix], targets) -> Future:
+        """
+        Fit a new scaler and model in a separate process.
+
+        The features are snapshotted when this is called. The worker gets
+        unfitted copies of the serving scaler and model (their parameters
+        only, never the fitted estimators) and is started with the
+        model.training_start_method context instead of fork, so it does not
+        inherit the parent's threads and locks. The fitted bundle is
+        published as soon as the worker returns, unless a newer training run
+        has been published first.
+
+        Args:
+            features: DataFrame or FeatureMatrix with feature columns
+            targets: Target variable (trade signals)
+
+        Returns:
+            Future: Resolves to the fitted ModelBundle once the publish step has run
+        """
+        columns, values = self._training_snapshot(features)
+        bundle = self.model_bundle
+        if self._training_pool is None:
+            self._training_pool = ProcessPoolExecutor(
+                max_workers=self._training_workers(),
+                mp_context=multiprocessing.get_context(self._training_start_method())
+            )
+        fitting = self._training_pool.submit(
+            fit_bundle, clone(bundle.scaler), clone(bundle.model), values, np.asarray(targets), columns,
+            next(self._versions), self._compiled_inference()
+        )
+        published: Future = Future()
+
+        def publish(done: Future):
+            if done.cancelled():
+                published.cancel()
+            elif done.exception() is not None:
+                published.set_exception(done.exception())
+            else:
+                if self.publish_bundle(done.result()):
+                    self._autosave(done.result())
+                published.set_result(done.result())
+
+        fitting.add_done_callback(publish)
+        return published
+
+    async def train_model_async(self, features: Union[pd.DataFrame, FeatureMatrix], targets) -> ModelBundle:
+        """train_model_background awaited from the event loop without blocking it"""
+        return await asyncio.wrap_future(self.train_model_background(features, targets))
+
+    def publish_bundle(self, bundle: ModelBundle) -> bool:
+        """
+        Make a fitted bundle the one used for predictions.
+
+        Bundles older than the current one are ignored. Readers are never
+        blocked: the swap is a single reference assignment.
+
+        Returns:
+            bool: Whether the bundle was published
+        """
+        with self._publish_lock:
+            if bundle.version <= self.model_bundle.version:
+                return False
+            previous_columns = self.model_bundle.feature_columns
+            self.model_bundle = bundle
+            # The accuracy measured for the previous model does not describe this one
+            self.last_accuracy = None
+            # Indicators the model reads must stay in the indicator plan
+            if bundle.feature_columns != previous_columns:
+                self._refresh_indicator_plan()
+            return True
+
+    def save_model(self, metadata: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """
+        Save the serving model bundle to the model store.
+
+        Args:
+            metadata: Extra fields for the artifact's meta.json
+
+        Returns:
+            Optional[int]: Saved version, or None without a store or a fitted model
+        """
+        bundle = self.model_bundle
+        if self.model_store is None or not bundle.is_fitted:
+            return None
+        metadata = dict(metadata or {})
+        metadata.setdefault('accuracy', self.last_accuracy)
+        metadata.setdefault('indicator_plan', self.indicator_plan.fingerprint)
+        metadata.setdefault('feature_plan', self._model_config().get('feature_plan'))
+        self.saved_version = self.model_store.save(bundle, metadata, keep=self._model_config().get('keep_versions'))
+        return self.saved_version
+
+    def load_model(self, version: Optional[int] = None) -> bool:
+        """
+        Load a saved bundle (default: the latest) and serve it.
+
+        Large arrays are memory-mapped, so loading costs milliseconds
+        rather than a retrain.
+
+        Returns:
+            bool: Whether a model was loaded
+        """
+        if self.model_store is None:
+            return False
+        bundle = self.model_store.load(version)
+        if bundle is None:
+            return False
+        meta = self.model_store.metadata(bundle.version)
+        # Versions handed out from now on must sort after the loaded one
+        self._versions = itertools.count(max(bundle.version, self.model_bundle.version) + 1)
+        compiled = bundle.compiled
+        if compiled is None and self._compiled_inference():
+            compiled = compile_model(bundle.model)
+        bundle = replace(bundle, version=next(self._versions), compiled=compiled)
+        if meta.get('feature_plan') and isinstance(self.config, dict):
+            self.config.setdefault('model', {})['feature_plan'] = meta['feature_plan']
+        self.publish_bundle(bundle)
+        self._refresh_indicator_plan()
+        self.saved_version = meta['version']
+        self.last_accuracy = meta.get('accuracy')
+        return True
+
+    def model_state(self) -> Dict[str, Any]:
+        """Summary of the serving model for snapshots and monitoring"""
+        bundle = self.model_bundle
+        return {
+            'model_trained': bundle.is_fitted,
+            'model_type': type(bundle.model).__name__,
+            'model_version': bundle.version,
+            'saved_version': self.saved_version,
+            'feature_columns': list(bundle.feature_columns),
+            'last_training_time': self.last_training_time,
+            'model_accuracy': self.last_accuracy,
+            'inference': self.inference_stats()
+        }
+
+    def inference_stats(self) -> Dict[str, Any]:
+        """Model predict latency (p50/p99 in ms) and rule-based fallbacks by reason"""
+        with self._predict_lock:
+            fallbacks = dict(self.fallback_counts)
+        return dict(self.predict_latency.summary(), fallbacks=fallbacks)
+
+    def _autosave(self, bundle: ModelBundle):
+        """Persist a freshly trained bundle when model.autosave is on (default)"""
+        if self.model_store is not None and self._model_config().get('autosave', True):
+            if bundle is self.model_bundle:
+                self.save_model()
+
+    def shutdown_training(self):
+        """Stop the background training process"""
+        if self._training_pool is not None:
+            self._training_pool.shutdown(wait=True)
+            self._training_pool = None
+
+    def _training_snapshot(self, features) -> Tuple[List[str], np.ndarray]:
+        """Feature columns and a private copy of the training matrix"""
+        if isinstance(features, (pd.DataFrame, FeatureMatrix)):
+            columns = list(features.columns)
+        else:
+            columns = list(self.feature_columns)
+        return columns, np.array(self._feature_values(features, columns))
+
+    def partial_train(self, features: Union[pd.DataFrame, FeatureMatrix], targets):
+        """
+        Update the scaler and model with new bars (online learning mode).
+
+        The scaler's running mean and variance and the SGD model are updated
+        from at most model.online_max_batch of the newest rows, so the cost
+        of an update does not grow with the length of the history. Updates
+        are applied to copies that are then published as a new bundle.
+
+        Args:
+            features: DataFrame or FeatureMatrix with the new bars' feature columns
+            targets: Target variable (trade signals) for those bars
+        """
+        bundle = self.model_bundle
+        if not hasattr(bundle.model, 'partial_fit'):
+            raise TypeError("Incremental training requires model.online_learning")
+
+        columns = list(features.columns)
+        if bundle.feature_columns and bundle.is_fitted and columns != bundle.feature_columns:
+            raise ValueError(f"Features {columns} do not match the trained features {bundle.feature_columns}")
+
+        max_batch = self._model_config().get('online_max_batch', 1000)
+        values = self._feature_values(features, columns)[-max_batch:]
+        targets = np.asarray(targets)[-max_batch:]
+
+        classes = None
+        if not bundle.is_fitted:
+            # Later batches may not contain every class, so they are fixed up front
+            classes = self._model_config().get('classes')
+            classes = np.unique(targets) if classes is None else np.asarray(classes)
+
+        scaler = copy.deepcopy(bundle.scaler)
+        model = copy.deepcopy(bundle.model)
+        scaler.partial_fit(values)
+        model.partial_fit(scaler.transform(values), targets, classes=classes)
+        self.publish_bundle(ModelBundle(scaler, model, columns, next(self._versions), time.time()))
+
+    def predict(self, features: Union[pd.DataFrame, FeatureMatrix, np.ndarray]) -> np.ndarray:
         """
         Use the model to make predictions on current data.
 
+        With model.predict_budget_ms the model runs on one of
+        model.predict_workers threads and is given that long to answer, so
+        concurrent callers do not wait on each other. When it is late, every
+        worker is still stuck in an earlier call that overran the budget,
+        the model raises, or a fallback was forced (see force_fallback),
+        the rule-based RSI/SMA signal is served for this call instead and
+        the event is counted in ``fallback_counts``; a slow model never
+        holds up the caller. Model call durations are kept in
+        ``predict_latency`` (p50/p99).
+
         Args:
-            features: DataFrame with feature columns
+            features: FeatureMatrix from extract_features (used as is), a
+                DataFrame with feature columns or an array in training column order
 
         Returns:
             np.ndarray: Predicted signals
         """
-        features_scaled = self.scaler.transform(features)
-        predictions = self.model.predict(features_scaled)
-        return predictions
+        # One read of the bundle, so scaler and model always match
+        bundle = self.model_bundle
+        reason = 'forced' if time.monotonic() < self._fallback_until else None
+        if reason is None:
+            try:
+                return self._predict_within_budget(bundle, self._feature_values(features, bundle.feature_columns))
+            except PredictionTimeout as e:
+                self.logger.warning(f"Serving rule-based signals: {e}")
+                reason = 'timeout'
+            except Exception as e:
+                self.logger.error(f"Serving rule-based signals after model error: {e}")
+                reason = 'error'
+        # predict may be called from several threads at once
+        with self._predict_lock:
+            self.fallback_counts[reason] += 1
+        return self._rule_based_signals(bundle, features)
+
+    def _predict_budget(self) -> Optional[float]:
+        """model.predict_budget_ms in seconds, None for no budget"""
+        budget_ms = self._model_config().get('predict_budget_ms')
+        return None if budget_ms is None else budget_ms / 1e3
+
+    def _predict_worker_count(self) -> int:
+        """model.predict_workers, threads serving budgeted predictions"""
+        return int(self._model_config().get('predict_workers', 4))
+
+    def _predict_within_budget(self, bundle: ModelBundle, values: np.ndarray) -> np.ndarray:
+        """
+        bundle.predict, raising PredictionTimeout when it overruns the budget.
+
+        A call that overruns keeps its worker until the model returns; only
+        when every worker is held by such a call is the model considered
+        busy, so concurrent predictions of a fast model never fall back.
+        """
+        budget = self._predict_budget()
+        start = time.perf_counter()
+        if budget is None:
+            signals = bundle.predict(values)
+            self.predict_latency.record(time.perf_counter() - start)
+            return signals
+
+        with self._predict_lock:
+            workers = self._predict_worker_count()
+            if len(self._late_calls) >= workers:
+                raise PredictionTimeout("model is still busy with earlier predictions")
+            if self._predict_workers is None:
+                self._predict_workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='predict')
+            call = self._predict_workers.submit(bundle.predict, values)
+            # Late calls are timed too, so p99 shows how slow the model really is
+            call.add_done_callback(lambda _: self.predict_latency.record(time.perf_counter() - start))
+        try:
+            return call.result(timeout=budget)
+        except FutureTimeoutError:
+            with self._predict_lock:
+                if not call.done():
+                    self._late_calls.add(call)
+            call.add_done_callback(self._release_late_call)
+            raise PredictionTimeout(f"model exceeded the {budget * 1e3:.1f} ms budget") from None
+
+    def _release_late_call(self, call: Future):
+        with self._predict_lock:
+            self._late_calls.discard(call)
+
+    def _rule_based_signals(self, bundle: ModelBundle, features) -> np.ndarray:
+        """RuleBasedSignal over the indicator columns of ``features``"""
+        if isinstance(features, FeatureMatrix):
+            lookup = features.column
+        elif isinstance(features, pd.DataFrame):
+            lookup = lambda name: features[name].to_numpy()
+        else:
+            features = np.atleast_2d(features)
+            columns = list(bundle.feature_columns)
+
+            def lookup(name):
+                if name not in columns:
+                    raise KeyError(name)
+                return features[:, columns.index(name)]
+        classes = getattr(bundle.model, 'classes_', self._model_config().get('classes'))
+        return self.rule_signal.signals(lookup, len(features), classes)
+
+    def force_fallback(self, seconds: float):
+        """Serve rule-based signals instead of the model for the next ``seconds``"""
+        self._fallback_until = time.monotonic() + seconds
+        self.logger.warning(f"Model predictions suspended for {seconds:.0f}s, serving rule-based signals")
 
     def evaluate_model(self, features: pd.DataFrame, targets: pd.Series) -> float:
         """
         Evaluate the model's accuracy on a test dataset.
 
         Args:
-            features: DataFrame with test feature columns
+            features: DataFrame or FeatureMatrix with test feature columns
             targets: Series with test target variable
 
         Returns:
             float: Accuracy score
         """
-        features_scaled = self.scaler.transform(features)
-        accuracy = self.model.score(features_scaled, targets)
+        bundle = self.model_bundle
+        features_scaled = bundle.scaler.transform(self._feature_values(features, bundle.feature_columns))
+        accuracy = bundle.model.score(features_scaled, targets)
+        self.last_accuracy = accuracy
         return accuracy
+
+    def walk_forward(
+        self,
+        features: Union[pd.DataFrame, FeatureMatrix],
+        targets,
+        n_folds: int = 5,
+        mode: str = 'expanding',
+        test_size: Optional[int] = None,
+        train_size: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Walk-forward validation of the configured model, folds in parallel.
+
+        Folds are fitted from fresh copies of the analyzer's scaler and
+        model configuration; the published model is not changed.
+
+        Args:
+            features: DataFrame or FeatureMatrix with feature columns, in time order
+            targets: Target variable per row
+            n_folds: Number of folds
+            mode: 'expanding' or 'rolling' training windows
+            test_size: Rows per test window
+            train_size: Training rows per fold in rolling mode
+            max_workers: Worker processes (defaults to model.training_workers)
+
+        Yields:
+            Dict: Metrics of each fold as soon as it finishes (see WalkForwardValidator.run)
+        """
+        _, values = self._training_snapshot(features)
+        folds = walk_forward_folds(len(values), n_folds, test_size, mode, train_size)
+        validator = WalkForwardValidator(StandardScaler(), self._build_model(), max_workers or self._training_workers(),
+                                         self._training_start_method())
+        return validator.run(values, np.asarray(targets), folds)
+
+    def search_models(
+        self,
+        features: Union[pd.DataFrame, FeatureMatrix],
+        targets,
+        space: Optional[Dict[str, Dict[str, Sequence]]] = None,
+        n_folds: int = 5,
+        method: str = 'hyperband',
+        max_latency_ms: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        train_best: bool = False
+    ) -> Tuple[Optional[Candidate], pd.DataFrame]:
+        """
+        Search model families and parameters with walk-forward folds.
+
+        Args:
+            features: DataFrame or FeatureMatrix with feature columns, in time order
+            targets: Target variable per row
+            space: Family -> parameter -> values (see model_search.DEFAULT_SEARCH_SPACE)
+            n_folds: Walk-forward folds; the search budget
+            method: 'hyperband' or 'successive_halving'
+            max_latency_ms: Only pick a winner within this median single-row latency
+            max_workers: Worker processes (defaults to the CPU count)
+            train_best: Fit the winner on all rows and publish it
+
+        Returns:
+            Tuple[Optional[Candidate], DataFrame]: Winner (None if nothing fits
+                the latency budget) and the results of all candidates
+        """
+        columns, values = self._training_snapshot(features)
+        targets = np.asarray(targets)
+        search = ModelSearch(
+            values, targets, walk_forward_folds(len(values), n_folds),
+            max_workers=max_workers, compiled=self._compiled_inference(),
+            start_method=self._training_start_method()
+        )
+        candidates = candidates_from_space(space)
+        if method == 'hyperband':
+            table = search.hyperband(candidates)
+        elif method == 'successive_halving':
+            table = search.successive_halving(candidates)
+        else:
+            raise ValueError(f"Unknown search method: {method}")
+
+        best = search.best(max_latency_ms)
+        if best is not None and train_best:
+            # Later train_model calls clone the published model, keeping its parameters
+            fitted = fit_bundle(StandardScaler(), best.build(), values, targets, columns,
+                                next(self._versions), self._compiled_inference())
+            if self.publish_bundle(fitted):
+                self._autosave(fitted)
+        return best, table
+
+    def _feature_values(self, features, columns: Sequence[str]) -> np.ndarray:
+        """Model input array in the given column order"""
+        if isinstance(features, FeatureMatrix):
+            if columns:
+                features = features.select(columns)
+            return features.values
+        if isinstance(features, pd.DataFrame):
+            if columns:
+                features = features[list(columns)]
+            return features.to_numpy(dtype=self.feature_dtype)
+        return np.asarray(features)
+
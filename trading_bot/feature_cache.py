@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class FeatureCache:
+    """
+    Bounded LRU cache for computed indicator features.
+
+    Entries are keyed by (symbol, timeframe, first and last bar timestamp,
+    number of bars, indicator config fingerprint, hash of the last bar), so
+    a symbol whose bars have not changed costs a dictionary lookup instead
+    of a recompute, while a longer or shorter history ending at the same
+    bar, or a re-fetched forming bar with new values, is a different entry.
+    Memory is bounded by entry count and, optionally, by the total size of
+    the cached arrays; the least recently used entries are evicted first.
+
+    Cached values are shared with callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        symbol: str,
+        timeframe: str,
+        first_bar: Any,
+        last_bar: Any,
+        rows: int,
+        config_hash: str,
+        last_row: Any = None
+    ) -> tuple:
+        """Cache key for one symbol's features; ``last_row`` identifies the newest bar's values"""
+        return (symbol, timeframe, first_bar, last_bar, rows, config_hash, last_row)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value or None; counts a hit or a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any):
+        """Insert a value, evicting least recently used entries over the limits"""
+        size = _sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes[key]
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                old_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` or compute, store and return it"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop all entries, or only those of one symbol"""
+        with self._lock:
+            keys = [k for k in self._entries if symbol is None or k[0] == symbol]
+            for key in keys:
+                del self._entries[key]
+                self._bytes -= self._sizes.pop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current footprint"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate memory held by a cached feature value"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_sizeof(v) for v in value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(_sizeof(v) for v in value)
+    return 0
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.inspection import permutation_importance
+
+
+@dataclass(frozen=True)
+class PruningResult:
+    """Outcome of prune_features"""
+    features: List[str]
+    dropped: List[str]
+    importances: Dict[str, float]
+    baseline_accuracy: float
+    accuracy: float
+    tolerance: float
+
+    def plan(self) -> Dict[str, Any]:
+        """Feature plan for model.feature_plan, honored by the indicator plan"""
+        return {
+            'features': list(self.features),
+            'dropped': list(self.dropped),
+            'baseline_accuracy': self.baseline_accuracy,
+            'accuracy': self.accuracy,
+            'tolerance': self.tolerance,
+        }
+
+
+def feature_importances(model, values: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Importance of each input of a fitted model.
+
+    Tree ensembles report their impurity importances and linear models the
+    mean absolute coefficient; other models are measured by permutation on
+    the given (scaled) rows.
+    """
+    if hasattr(model, 'feature_importances_'):
+        return np.asarray(model.feature_importances_, dtype=np.float64)
+    if hasattr(model, 'coef_'):
+        return np.abs(np.atleast_2d(model.coef_)).mean(axis=0)
+    return permutation_importance(model, values, targets, n_repeats=5, random_state=0).importances_mean
+
+
+def prune_features(
+    scaler,
+    model,
+    values: np.ndarray,
+    targets: np.ndarray,
+    columns: Sequence[str],
+    tolerance: float = 0.005,
+    validation_fraction: float = 0.25
+) -> PruningResult:
+    """
+    Smallest set of most important features that keeps validation accuracy.
+
+    The newest ``validation_fraction`` of the rows is held out. A model on
+    all features sets the baseline accuracy and ranks the features by
+    importance; a binary search over the number of top-ranked features then
+    finds the fewest whose validation accuracy is within ``tolerance`` of
+    the baseline, fitting only O(log features) models.
+
+    Args:
+        scaler: Unfitted scaler template
+        model: Unfitted model template
+        values: (rows x features) training matrix in time order
+        targets: Target per row
+        columns: Name of each feature column
+        tolerance: Accuracy the pruned model may lose
+        validation_fraction: Newest share of rows used for validation
+
+    Returns:
+        PruningResult: Kept features in importance order and the accuracies
+    """
+    values = np.asarray(values)
+    targets = np.asarray(targets)
+    columns = list(columns)
+    split = int(len(values) * (1.0 - validation_fraction))
+    if split < 1 or split >= len(values):
+        raise ValueError("Not enough rows to hold out a validation set")
+
+    def accuracy(positions) -> float:
+        fitted_scaler = clone(scaler)
+        fitted = clone(model).fit(fitted_scaler.fit_transform(values[:split, positions]), targets[:split])
+        return float(fitted.score(fitted_scaler.transform(values[split:, positions]), targets[split:]))
+
+    fitted_scaler = clone(scaler)
+    full = clone(model).fit(fitted_scaler.fit_transform(values[:split]), targets[:split])
+    validation = fitted_scaler.transform(values[split:])
+    baseline = float(full.score(validation, targets[split:]))
+    importances = feature_importances(full, validation, targets[split:])
+    ranked = list(np.argsort(-importances, kind='stable'))
+
+    # Accuracy is not strictly monotone in the number of features; the
+    # search returns a size that meets the tolerance, not a global minimum
+    scores = {len(columns): baseline}
+    low, high = 1, len(columns)
+    while low < high:
+        middle = (low + high) // 2
+        scores[middle] = accuracy(ranked[:middle])
+        if scores[middle] >= baseline - tolerance:
+            high = middle
+        else:
+            low = middle + 1
+
+    keep = ranked[:low]
+    return PruningResult(
+        features=[columns[i] for i in keep],
+        dropped=[columns[i] for i in ranked[low:]],
+        importances={columns[i]: float(importances[i]) for i in ranked},
+        baseline_accuracy=baseline,
+        accuracy=scores[low],
+        tolerance=tolerance
+    )
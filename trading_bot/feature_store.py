@@ -0,0 +1,152 @@
+import logging
+import shutil
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .column_store import ColumnStore, safe_name, to_epoch_ns
+from .features import FeatureMatrix, build_feature_matrix
+
+
+class FeatureStore(ColumnStore):
+    """
+    On-disk feature history keyed by symbol and timeframe.
+
+    Each (timeframe, symbol) pair is a directory holding one raw binary file
+    per feature plus ``t.bin`` (bar timestamps, int64 ns) and ``meta.json``.
+    The meta file records the row count, the column names and dtype, and the
+    hash of the feature definitions the rows were computed with. Columns are
+    read back with ``np.memmap``.
+
+    Rows are append-only: only bars newer than the last stored one are
+    written. When the definition hash, columns or dtype change, the stored
+    features of that symbol are dropped and rebuilt on the next write.
+    """
+
+    EMPTY_META = {'count': 0, 'columns': [], 'dtype': None, 'definition': None}
+
+    def __init__(self, root: str = 'data/features'):
+        super().__init__(root)
+        self.logger = logging.getLogger(__name__)
+
+    def definition(self, symbol: str, timeframe: str) -> Optional[str]:
+        """Definition hash of the stored features, or None if nothing is stored"""
+        return self._load_meta(self._dir(symbol, timeframe))['definition']
+
+    def columns(self, symbol: str, timeframe: str) -> List[str]:
+        """Names of the stored feature columns (empty if nothing is stored)"""
+        return list(self._load_meta(self._dir(symbol, timeframe))['columns'])
+
+    def last_timestamp(self, symbol: str, timeframe: str, definition: str) -> Optional[int]:
+        """Timestamp (ns) of the newest row stored under ``definition``"""
+        meta = self._load_meta(self._dir(symbol, timeframe))
+        if meta['count'] == 0 or meta['definition'] != definition:
+            return None
+        t = np.memmap(self._dir(symbol, timeframe) / 't.bin', dtype=np.int64, mode='r', shape=(meta['count'],))
+        return int(t[-1])
+
+    def invalidate(self, symbol: str, timeframe: str):
+        """Delete the stored features of a symbol"""
+        shutil.rmtree(self._dir(symbol, timeframe), ignore_errors=True)
+
+    def append(self, symbol: str, timeframe: str, features: FeatureMatrix, definition: str) -> int:
+        """
+        Store the rows of ``features`` newer than the last stored bar.
+
+        Args:
+            symbol: Ticker symbol
+            timeframe: Bar timeframe
+            features: Matrix indexed by bar timestamp, sorted ascending
+            definition: Hash of the feature definitions used to compute it
+
+        Returns:
+            int: Number of rows written
+        """
+        path = self._dir(symbol, timeframe)
+        meta = self._load_meta(path)
+        stale = (meta['definition'] != definition
+                 or meta['columns'] != features.columns
+                 or meta['dtype'] != features.dtype.str)
+        if meta['count'] and stale:
+            self.logger.info(f"Feature definitions changed for {symbol} {timeframe}, rebuilding store")
+            self.invalidate(symbol, timeframe)
+            meta = self._load_meta(path)
+
+        t = to_epoch_ns(features.index)
+        last_t = self.last_timestamp(symbol, timeframe, definition) if meta['count'] else None
+        start = 0 if last_t is None else int(np.searchsorted(t, last_t, side='right'))
+        if start >= len(t):
+            return 0
+
+        path.mkdir(parents=True, exist_ok=True)
+        columns = {'t': t[start:]}
+        for name in features.columns:
+            columns[name] = features.column(name)[start:]
+        for name, values in columns.items():
+            dtype = np.int64 if name == 't' else features.dtype
+            itemsize = np.dtype(dtype).itemsize
+            with open(path / _file_name(name), 'ab') as f:
+                # Drop bytes past the committed count left by an interrupted write
+                f.truncate(meta['count'] * itemsize)
+                f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+        written = len(t) - start
+        meta.update(count=meta['count'] + written, columns=features.columns,
+                    dtype=features.dtype.str, definition=definition)
+        self._save_meta(path, meta)
+        return written
+
+    def read_columns(
+        self,
+        symbol: str,
+        timeframe: str,
+        definition: str,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Memory-mapped column views for rows with ``start_ns <= t < end_ns``.
+
+        Returns:
+            Optional[Dict[str, np.ndarray]]: 't' and feature name -> read-only
+                array, or None when nothing is stored under ``definition``
+        """
+        path = self._dir(symbol, timeframe)
+        meta = self._load_meta(path)
+        if meta['count'] == 0 or meta['definition'] != definition:
+            return None
+
+        count = meta['count']
+        columns = {'t': np.memmap(path / 't.bin', dtype=np.int64, mode='r', shape=(count,))}
+        for name in meta['columns']:
+            columns[name] = np.memmap(path / _file_name(name), dtype=np.dtype(meta['dtype']), mode='r', shape=(count,))
+        lo = 0 if start_ns is None else int(np.searchsorted(columns['t'], start_ns, side='left'))
+        hi = count if end_ns is None else int(np.searchsorted(columns['t'], end_ns, side='left'))
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        definition: str,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> Optional[FeatureMatrix]:
+        """
+        Stored features as a FeatureMatrix indexed by UTC bar timestamp.
+
+        Returns None when nothing is stored under ``definition``.
+        """
+        stored = self.read_columns(symbol, timeframe, definition, start_ns, end_ns)
+        if stored is None:
+            return None
+        names: List[str] = [name for name in stored if name != 't'] if columns is None else list(columns)
+        dtype = stored[names[0]].dtype if names else np.float32
+        index = pd.DatetimeIndex(np.asarray(stored['t']).astype('datetime64[ns]'), tz='UTC')
+        return build_feature_matrix(names, stored.__getitem__, len(index), dtype, index)
+
+
+def _file_name(column: str) -> str:
+    return safe_name(column) + '.bin'
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class FeatureMatrix:
+    """
+    Row-major feature matrix with its column names.
+
+    ``values`` is a C-contiguous (rows x features) array, float32 by default,
+    ready to be handed to the scaler and the model without a DataFrame
+    conversion. ``index`` carries the row labels (usually bar timestamps).
+    """
+
+    values: np.ndarray
+    columns: List[str]
+    index: Optional[Any] = None
+
+    def __post_init__(self):
+        self.columns = list(self.columns)
+        self.column_index: Dict[str, int] = {name: k for k, name in enumerate(self.columns)}
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.values.dtype
+
+    def column(self, name: str) -> np.ndarray:
+        """Strided view of one feature column"""
+        return self.values[:, self.column_index[name]]
+
+    def select(self, columns: Sequence[str]) -> 'FeatureMatrix':
+        """Matrix with the given columns, in that order (a copy unless unchanged)"""
+        columns = list(columns)
+        if columns == self.columns:
+            return self
+        positions = [self.column_index[name] for name in columns]
+        return FeatureMatrix(np.ascontiguousarray(self.values[:, positions]), columns, self.index)
+
+    def tail(self, n: int) -> 'FeatureMatrix':
+        """Last ``n`` rows as a view"""
+        index = self.index[-n:] if self.index is not None else None
+        return FeatureMatrix(self.values[-n:], self.columns, index)
+
+    def dropna(self) -> 'FeatureMatrix':
+        """Rows without missing values"""
+        mask = ~np.isnan(self.values).any(axis=1)
+        if mask.all():
+            return self
+        index = self.index[mask] if self.index is not None else None
+        return FeatureMatrix(self.values[mask], self.columns, index)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame view of the matrix (for inspection and logging)"""
+        return pd.DataFrame(self.values, columns=self.columns, index=self.index, copy=False)
+
+
+def build_feature_matrix(
+    columns: Sequence[str],
+    lookup,
+    n_rows: int,
+    dtype=np.float32,
+    index: Optional[Any] = None
+) -> FeatureMatrix:
+    """
+    Assemble a FeatureMatrix column by column.
+
+    Each column is cast straight into the preallocated output, so no
+    full-width float64 intermediate is built.
+
+    Args:
+        columns: Feature names, in output order
+        lookup: Callable returning the values of one feature by name
+        n_rows: Number of rows
+        dtype: Output dtype
+        index: Row labels
+
+    Returns:
+        FeatureMatrix: The assembled matrix
+    """
+    values = np.empty((n_rows, len(columns)), dtype=dtype)
+    for k, name in enumerate(columns):
+        values[:, k] = lookup(name)
+    return FeatureMatrix(values, list(columns), index)
@@ -0,0 +1,263 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import vectorized_indicators as vi
+
+try:
+    import talib
+except ImportError:  # TA-Lib needs its C library, which is not always installed
+    talib = None
+
+logger = logging.getLogger(__name__)
+
+# Indicators every backend implements, as fn(close, period) along the last axis
+INDICATORS = ('sma', 'ema', 'std', 'rsi')
+
+DEFAULT_BACKEND = 'numpy'
+
+# 'auto' selections per (available backends, benchmark settings), so the
+# benchmark runs once per process rather than once per analyzer
+_auto_selections: Dict[Tuple, Dict[str, str]] = {}
+_auto_lock = threading.Lock()
+
+
+class IndicatorBackend(ABC):
+    """
+    One implementation of the basic indicators.
+
+    Each method takes a float64 series or a (symbols x bars) matrix and a
+    period and returns an array of the same shape, NaN until the window is
+    full. All backends follow the definitions of the pandas path: EMA seeded
+    with the first value, sample (ddof=1) standard deviation and RSI from
+    simple means of gains and losses.
+    """
+
+    name = ''
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def sma(self, close: np.ndarray, period: int) -> np.ndarray:
+        """Simple moving average"""
+
+    @abstractmethod
+    def ema(self, close: np.ndarray, period: int) -> np.ndarray:
+        """Exponential moving average"""
+
+    @abstractmethod
+    def std(self, close: np.ndarray, period: int) -> np.ndarray:
+        """Rolling sample standard deviation"""
+
+    @abstractmethod
+    def rsi(self, close: np.ndarray, period: int) -> np.ndarray:
+        """Relative strength index"""
+
+
+class NumpyBackend(IndicatorBackend):
+    """Cumulative-sum and linear-filter kernels from vectorized_indicators"""
+
+    name = 'numpy'
+
+    def sma(self, close, period):
+        return vi.rolling_mean(close, period)
+
+    def ema(self, close, period):
+        return vi.ema(close, period)
+
+    def std(self, close, period):
+        return vi.rolling_std(close, period)
+
+    def rsi(self, close, period):
+        return vi.rsi(close, period)
+
+
+class PandasBackend(IndicatorBackend):
+    """pandas rolling/ewm, the original DataAnalyzer implementation"""
+
+    name = 'pandas'
+
+    def sma(self, close, period):
+        return _by_column(close, lambda frame: frame.rolling(period).mean())
+
+    def ema(self, close, period):
+        return _by_column(close, lambda frame: frame.ewm(span=period, adjust=False).mean())
+
+    def std(self, close, period):
+        return _by_column(close, lambda frame: frame.rolling(period).std())
+
+    def rsi(self, close, period):
+        def compute(frame):
+            delta = frame.diff()
+            gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+            return 100 - (100 / (1 + gain / loss))
+        return _by_column(close, compute)
+
+
+class TalibBackend(IndicatorBackend):
+    """
+    TA-Lib C functions, applied row by row.
+
+    TA-Lib seeds its EMA with an SMA and uses Wilder smoothing for RSI, so
+    those two do not match the other backends and are never selected by the
+    benchmark; SMA and the (rescaled) standard deviation do.
+    """
+
+    name = 'talib'
+
+    @property
+    def available(self) -> bool:
+        return talib is not None
+
+    def sma(self, close, period):
+        return _by_row(close, lambda row: talib.SMA(row, timeperiod=period))
+
+    def ema(self, close, period):
+        return _by_row(close, lambda row: talib.EMA(row, timeperiod=period))
+
+    def std(self, close, period):
+        # STDDEV is the population deviation; rescale to ddof=1
+        scale = np.sqrt(period / (period - 1)) if period > 1 else np.nan
+        return _by_row(close, lambda row: talib.STDDEV(row, timeperiod=period, nbdev=1) * scale)
+
+    def rsi(self, close, period):
+        return _by_row(close, lambda row: talib.RSI(row, timeperiod=period))
+
+
+BACKENDS: Dict[str, IndicatorBackend] = {
+    backend.name: backend for backend in (NumpyBackend(), PandasBackend(), TalibBackend())
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the backends usable on this machine"""
+    return [name for name, backend in BACKENDS.items() if backend.available]
+
+
+def get_backend(name: str) -> IndicatorBackend:
+    """Backend by name, falling back to the NumPy backend when it is unavailable"""
+    backend = BACKENDS.get(name)
+    if backend is None or not backend.available:
+        logger.warning(f"Indicator backend '{name}' is not available, using '{DEFAULT_BACKEND}'")
+        return BACKENDS[DEFAULT_BACKEND]
+    return backend
+
+
+def indicator_function(indicator: str, backend: str) -> Callable[[np.ndarray, int], np.ndarray]:
+    """fn(close, period) computing one indicator with the given backend"""
+    return getattr(get_backend(backend), indicator)
+
+
+def benchmark_backends(
+    sample: Optional[np.ndarray] = None,
+    period: int = 20,
+    repeats: int = 5,
+    rtol: float = 1e-8
+) -> Dict[str, Dict[str, float]]:
+    """
+    Time every available backend on every indicator.
+
+    Results are checked against the NumPy backend first; an implementation
+    whose output differs beyond ``rtol`` is reported as ``inf`` so it can
+    never be selected.
+
+    Args:
+        sample: Close prices to benchmark on (defaults to a random walk of 2000 bars)
+        period: Indicator period used for the benchmark
+        repeats: Runs per measurement; the fastest is kept
+        rtol: Tolerance of the parity check
+
+    Returns:
+        Dict[str, Dict[str, float]]: indicator -> backend -> seconds per call
+    """
+    if sample is None:
+        sample = 100 + np.random.default_rng(0).standard_normal(2000).cumsum()
+    sample = np.asarray(sample, dtype=np.float64)
+    reference = BACKENDS[DEFAULT_BACKEND]
+
+    timings: Dict[str, Dict[str, float]] = {}
+    for indicator in INDICATORS:
+        expected = getattr(reference, indicator)(sample, period)
+        timings[indicator] = {}
+        for name in available_backends():
+            fn = getattr(BACKENDS[name], indicator)
+            try:
+                result = fn(sample, period)
+            except Exception as e:
+                logger.warning(f"Indicator backend '{name}' failed on {indicator}: {e}")
+                timings[indicator][name] = float('inf')
+                continue
+            if not np.allclose(result, expected, rtol=rtol, atol=rtol, equal_nan=True):
+                timings[indicator][name] = float('inf')
+                continue
+            best = float('inf')
+            for _ in range(repeats):
+                start = time.perf_counter()
+                fn(sample, period)
+                best = min(best, time.perf_counter() - start)
+            timings[indicator][name] = best
+    return timings
+
+
+def select_backends(preference: str = 'auto', refresh: bool = False, **benchmark_kwargs) -> Dict[str, str]:
+    """
+    Choose a backend for each indicator.
+
+    The 'auto' benchmark runs once per process for a given set of available
+    backends and benchmark settings; later calls reuse its selection.
+
+    Args:
+        preference: 'auto' to benchmark and pick the fastest correct backend
+            per indicator, or a backend name to use it for everything
+        refresh: Re-run the 'auto' benchmark even when a selection is cached
+        **benchmark_kwargs: Passed to benchmark_backends (a custom ``sample``
+            is benchmarked every time)
+
+    Returns:
+        Dict[str, str]: indicator -> backend name
+    """
+    if preference != 'auto':
+        name = get_backend(preference).name
+        return {indicator: name for indicator in INDICATORS}
+
+    key = None
+    if 'sample' not in benchmark_kwargs:
+        key = (tuple(available_backends()), tuple(sorted(benchmark_kwargs.items())))
+    with _auto_lock:
+        if key is not None and not refresh and key in _auto_selections:
+            return dict(_auto_selections[key])
+
+        timings = benchmark_backends(**benchmark_kwargs)
+        selection = {}
+        for indicator, results in timings.items():
+            name = min(results, key=results.get)
+            selection[indicator] = name if np.isfinite(results[name]) else DEFAULT_BACKEND
+        logger.info(f"Indicator backends selected: {selection}")
+        if key is not None:
+            _auto_selections[key] = selection
+    return dict(selection)
+
+
+def _by_column(close: np.ndarray, compute: Callable[[pd.DataFrame], pd.DataFrame]) -> np.ndarray:
+    """Apply a pandas computation along the last axis of a series or matrix"""
+    close = np.asarray(close, dtype=np.float64)
+    frame = pd.DataFrame(np.atleast_2d(close).T)
+    return compute(frame).to_numpy().T.reshape(close.shape)
+
+
+def _by_row(close: np.ndarray, compute: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """Apply a 1-D computation to every row of a series or matrix"""
+    close = np.asarray(close, dtype=np.float64)
+    rows = np.atleast_2d(close)
+    out = np.empty(rows.shape)
+    for i, row in enumerate(rows):
+        out[i] = compute(np.ascontiguousarray(row))
+    return out.reshape(close.shape)
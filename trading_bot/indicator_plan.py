@@ -0,0 +1,458 @@
+import hashlib
+import json
+import re
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .indicator_backends import DEFAULT_BACKEND, indicator_function
+from .inference_guard import RuleBasedSignal
+from .vectorized_indicators import ema, mean_from_cumsum, shifted_cumsum, std_from_cumsums
+
+# Indicator set used when the configuration does not provide data.indicators
+DEFAULT_INDICATORS = {
+    'sma_periods': [10, 50],
+    'rsi_period': 14,
+}
+
+
+# Bar timeframe of the analysed data when data.timeframe is not set
+DEFAULT_TIMEFRAME = '1Day'
+
+# Trading-session minutes per timeframe unit (a regular session is 390 minutes)
+_SESSION_MINUTES = {'Min': 1, 'T': 1, 'Hour': 60, 'H': 60, 'Day': 390, 'D': 390, 'Week': 5 * 390}
+
+
+def bars_for_days(days: float, timeframe: str) -> int:
+    """Number of bars of ``timeframe`` spanning ``days`` trading days"""
+    match = re.fullmatch(r'(\d*)([A-Za-z]+)', timeframe)
+    if not match or match.group(2) not in _SESSION_MINUTES:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    bar_minutes = int(match.group(1) or 1) * _SESSION_MINUTES[match.group(2)]
+    return max(1, int(round(days * 390 / bar_minutes)))
+
+
+def momentum_sma_period(cfg: Dict, timeframe: str = DEFAULT_TIMEFRAME) -> int:
+    """SMA window in bars: ``sma_period`` when set, else ``lookback_days`` in ``timeframe`` bars"""
+    if cfg.get('sma_period'):
+        return int(cfg['sma_period'])
+    return bars_for_days(cfg.get('lookback_days', 20), timeframe)
+
+
+# Indicators each strategy reads, given its configuration section and the bar timeframe
+STRATEGY_INDICATORS: Dict[str, Callable[[Dict, str], List[str]]] = {
+    'momentum': lambda cfg, timeframe: ['RSI', f'SMA_{momentum_sma_period(cfg, timeframe)}'],
+    'mean_reversion': lambda cfg, timeframe: ['BB_middle', 'BB_upper', 'BB_lower'],
+}
+
+_DYNAMIC_NODES = re.compile(r'(SMA|EMA|STD)_(\d+)')
+
+# Relative weight below which an EMA's seed no longer affects its value
+_EMA_SEED_WEIGHT = 1e-12
+
+
+def ema_warmup(span: int) -> int:
+    """Bars after which an EMA no longer depends on where it was seeded"""
+    decay = 1.0 - 2.0 / (span + 1.0)
+    if decay <= 0:
+        return 1
+    return int(np.ceil(np.log(_EMA_SEED_WEIGHT) / np.log(decay)))
+
+
+class IndicatorPlan:
+    """
+    Compiled form of the ``data.indicators`` configuration.
+
+    The configuration is turned into a dependency graph of named nodes, each
+    a vectorized function of other nodes, so intermediates are computed once
+    and shared: one cumulative sum of the closes serves every SMA window
+    (and Bollinger, which needs SMA_n and STD_n), and the EMAs are reused by
+    MACD. Evaluation is lazy: only the ancestors of the requested outputs
+    run, so indicators nobody reads cost nothing. Works on a single series
+    or a (symbols x bars) matrix alike.
+
+    Supported keys: sma_periods, ema_periods, rsi_period, macd_fast,
+    macd_slow, macd_signal, bollinger_period, bollinger_std and
+    volume_sma_periods (only evaluated when volume is supplied).
+
+    Args:
+        indicators: The ``data.indicators`` section (defaults to DEFAULT_INDICATORS)
+        outputs: Restrict the outputs to these names; SMA_n, EMA_n and STD_n
+            are declared on demand. Defaults to every configured indicator.
+        backends: Indicator ('sma', 'ema', 'std', 'rsi') -> backend name, see
+            indicator_backends.select_backends. Indicators on the default
+            NumPy backend share the cumulative-sum intermediates.
+    """
+
+    def __init__(
+        self,
+        indicators: Optional[Dict] = None,
+        outputs: Optional[Iterable[str]] = None,
+        backends: Optional[Dict[str, str]] = None
+    ):
+        self.indicators = dict(indicators or DEFAULT_INDICATORS)
+        self.backends = dict(backends or {})
+        self._nodes: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {}
+        # Bars of history each node needs on top of its inputs
+        self._windows: Dict[str, int] = {}
+        # Parameters that define a node's values beyond its name
+        self._params: Dict[str, Dict] = {}
+        self.outputs: List[str] = []
+        self.volume_outputs: List[str] = []
+        self._compile()
+
+        if outputs is not None:
+            volume_outputs = set(self.volume_outputs)
+            self.outputs = []
+            self.volume_outputs = []
+            for name in outputs:
+                self._expose(self._ensure(name), volume=name in volume_outputs)
+
+    @classmethod
+    def from_config(
+        cls,
+        config,
+        model_features: Optional[Iterable[str]] = None,
+        backends: Optional[Dict[str, str]] = None,
+        restrict: bool = True
+    ) -> 'IndicatorPlan':
+        """
+        Build the plan for a full bot configuration.
+
+        Bollinger parameters are taken from the mean_reversion strategy when
+        data.indicators does not set them. When the configuration has a
+        ``strategies`` section or a pruned model.feature_plan, outputs are
+        limited to what the enabled strategies, the feature plan and the
+        model's feature list read.
+
+        Args:
+            config: Bot configuration dict (anything else yields the default plan)
+            model_features: Feature columns the model was trained on
+            backends: Indicator -> backend name
+            restrict: False for every configured indicator, the candidate
+                features a pruning run ranks
+        """
+        if not isinstance(config, dict):
+            return cls(DEFAULT_INDICATORS, backends=backends)
+
+        indicators = dict(config.get('data', {}).get('indicators') or DEFAULT_INDICATORS)
+        reversion = config.get('strategies', {}).get('mean_reversion', {})
+        if 'bollinger_period' not in indicators and reversion.get('bollinger_periods'):
+            indicators['bollinger_period'] = reversion['bollinger_periods']
+            indicators['bollinger_std'] = reversion.get('bollinger_std', 2.0)
+
+        plan = cls(indicators, backends=backends)
+        required = required_indicators(config, model_features) if restrict else None
+        if required is None:
+            return plan
+        return plan.select(name for name in required if plan.provides(name))
+
+    def select(self, names: Iterable[str]) -> 'IndicatorPlan':
+        """Plan over the same definitions restricted to the given outputs"""
+        return IndicatorPlan(self.indicators, outputs=list(dict.fromkeys(names)), backends=self.backends)
+
+    def provides(self, name: str) -> bool:
+        """Whether the plan can compute an output of this name"""
+        return name in self._nodes or _DYNAMIC_NODES.fullmatch(name) is not None
+
+    def dependencies(self, names: Optional[Iterable[str]] = None) -> Set[str]:
+        """All nodes evaluated to produce ``names`` (default: the plan outputs)"""
+        pending = list(self.outputs + self.volume_outputs if names is None else names)
+        seen: Set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in seen or name not in self._nodes:
+                continue
+            seen.add(name)
+            pending.extend(self._nodes[name][1])
+        return seen
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> int:
+        """
+        Bars of history needed before the first row of ``names`` (default:
+        the plan outputs) equals a computation over the full history.
+
+        Windowed indicators need their window; EMAs (and MACD, which chains
+        them) need enough bars for the seed's weight to vanish.
+        """
+        names = self.outputs + self.volume_outputs if names is None else list(names)
+        memo: Dict[str, int] = {}
+
+        def needed(name: str) -> int:
+            if name not in memo:
+                _, deps = self._nodes[name]
+                memo[name] = self._windows.get(name, 0) + max((needed(dep) for dep in deps if dep in self._nodes),
+                                                              default=0)
+            return memo[name]
+
+        return max((needed(self._ensure(name)) for name in names if self.provides(name)), default=0)
+
+    def definitions(self, names: Iterable[str]) -> Dict[str, Dict]:
+        """
+        How each of ``names`` is computed: its parameters and warm-up.
+
+        Unlike ``fingerprint`` this does not depend on which outputs the plan
+        selects, so the definition of a column only changes when the column's
+        own configuration does. Names the plan does not provide (columns of
+        the input data) have an empty definition.
+        """
+        definitions = {}
+        for name in names:
+            if not self.provides(name):
+                definitions[name] = {}
+                continue
+            node = self._ensure(name)
+            definitions[name] = {**self._params.get(node, {}), 'warmup': self.warmup([node])}
+        return definitions
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable hash of the indicator definitions and selected outputs"""
+        # Backends produce the same values, so they are not part of the hash
+        payload = json.dumps(
+            {'indicators': self.indicators, 'outputs': self.outputs + self.volume_outputs},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def _node(self, name: str, fn: Callable, *deps: str, window: int = 0, params: Optional[Dict] = None) -> str:
+        """Declare a node once; later declarations with the same name are shared"""
+        if name not in self._nodes:
+            self._nodes[name] = (fn, deps)
+            self._windows[name] = window
+            self._params[name] = dict(params or {})
+        return name
+
+    def _expose(self, name: str, volume: bool = False):
+        """Mark a node as a plan output"""
+        outputs = self.volume_outputs if volume else self.outputs
+        if name not in outputs:
+            outputs.append(name)
+
+    def _output(self, name: str, fn: Callable, *deps: str, volume: bool = False, window: int = 0,
+                params: Optional[Dict] = None):
+        self._expose(self._node(name, fn, *deps, window=window, params=params), volume=volume)
+
+    def _backend_node(self, name: str, indicator: str, period: int) -> Optional[str]:
+        """Declare a node computed by a non-default backend, if one is selected"""
+        backend = self.backends.get(indicator, DEFAULT_BACKEND)
+        if backend == DEFAULT_BACKEND:
+            return None
+        window = {'ema': ema_warmup(period), 'rsi': period + 1}.get(indicator, period)
+        return self._node(name, partial(indicator_function(indicator, backend), period=period), 'close',
+                          window=window, params={'period': period})
+
+    def _sma_node(self, period: int) -> str:
+        name = f'SMA_{period}'
+        return (self._backend_node(name, 'sma', period)
+                or self._node(name, partial(_mean, window=period), 'close_csum', window=period,
+                              params={'period': period}))
+
+    def _ema_node(self, period: int) -> str:
+        name = f'EMA_{period}'
+        return (self._backend_node(name, 'ema', period)
+                or self._node(name, partial(ema, span=period), 'close', window=ema_warmup(period),
+                              params={'period': period}))
+
+    def _std_node(self, period: int) -> str:
+        name = f'STD_{period}'
+        backend_node = self._backend_node(name, 'std', period)
+        if backend_node:
+            return backend_node
+        self._node('close_sq_csum', _squared_cumsum, 'close', 'close_csum')
+        return self._node(name, partial(_std, window=period), 'close_csum', 'close_sq_csum', window=period,
+                          params={'period': period})
+
+    def _ensure(self, name: str) -> str:
+        """Return a node name, declaring SMA_n / EMA_n / STD_n on first use"""
+        if name in self._nodes:
+            return name
+        match = _DYNAMIC_NODES.fullmatch(name)
+        if match is None:
+            raise KeyError(f"Unknown indicator: {name}")
+        kind, period = match.group(1), int(match.group(2))
+        return {'SMA': self._sma_node, 'EMA': self._ema_node, 'STD': self._std_node}[kind](period)
+
+    def _compile(self):
+        cfg = self.indicators
+        self._node('close_csum', shifted_cumsum, 'close')
+
+        for period in cfg.get('sma_periods', []):
+            self._expose(self._sma_node(period))
+        for period in cfg.get('ema_periods', []):
+            self._expose(self._ema_node(period))
+
+        if cfg.get('rsi_period') and self._backend_node('RSI', 'rsi', cfg['rsi_period']):
+            self._expose('RSI')
+        elif cfg.get('rsi_period'):
+            self._node('delta', _delta, 'close', window=1)
+            self._node('gain_csum', _gain_cumsum, 'delta')
+            self._node('loss_csum', _loss_cumsum, 'delta')
+            self._output('RSI', partial(_rsi, period=cfg['rsi_period']), 'gain_csum', 'loss_csum',
+                         window=cfg['rsi_period'], params={'period': cfg['rsi_period']})
+
+        if cfg.get('macd_fast') and cfg.get('macd_slow'):
+            fast = self._ema_node(cfg['macd_fast'])
+            slow = self._ema_node(cfg['macd_slow'])
+            signal = cfg.get('macd_signal', 9)
+            params = {'fast': cfg['macd_fast'], 'slow': cfg['macd_slow']}
+            self._output('MACD', np.subtract, fast, slow, params=params)
+            params = {**params, 'signal': signal}
+            self._output('MACD_signal', partial(ema, span=signal), 'MACD', window=ema_warmup(signal), params=params)
+            self._output('MACD_hist', np.subtract, 'MACD', 'MACD_signal', params=params)
+
+        if cfg.get('bollinger_period'):
+            period = cfg['bollinger_period']
+            width = cfg.get('bollinger_std', 2.0)
+            middle = self._sma_node(period)
+            std = self._std_node(period)
+            self._output('BB_middle', _identity, middle, params={'period': period})
+            params = {'period': period, 'width': width}
+            self._output('BB_upper', partial(_band, width=width), middle, std, params=params)
+            self._output('BB_lower', partial(_band, width=-width), middle, std, params=params)
+
+        self._node('volume_csum', shifted_cumsum, 'volume')
+        for period in cfg.get('volume_sma_periods', [20]):
+            self._output(f'VOLUME_SMA_{period}', partial(_mean, window=period), 'volume_csum', volume=True,
+                         window=period, params={'period': period})
+
+    def bind(self, close: np.ndarray, volume: Optional[np.ndarray] = None) -> 'LazyIndicators':
+        """Lazy view over the data: each indicator is computed on first access"""
+        return LazyIndicators(self, close, volume)
+
+    def execute(self, close: np.ndarray, volume: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Evaluate the plan outputs.
+
+        Args:
+            close: Close prices, a series or a (symbols x bars) matrix
+            volume: Optional volumes of the same shape
+
+        Returns:
+            Dict[str, np.ndarray]: Output name -> array shaped like ``close``
+        """
+        lazy = self.bind(close, volume)
+        names = self.outputs + (self.volume_outputs if volume is not None else [])
+        return {name: lazy[name] for name in names}
+
+
+class LazyIndicators:
+    """Memoizing evaluator of an IndicatorPlan over one set of prices"""
+
+    def __init__(self, plan: IndicatorPlan, close: np.ndarray, volume: Optional[np.ndarray] = None):
+        self.plan = plan
+        self._values: Dict[str, np.ndarray] = {'close': np.asarray(close, dtype=np.float64)}
+        if volume is not None:
+            self._values['volume'] = np.asarray(volume, dtype=np.float64)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._values
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self._values:
+            return self._values[name]
+        fn, deps = self.plan._nodes[self.plan._ensure(name)]
+        value = fn(*[self[dep] for dep in deps])
+        self._values[name] = value
+        return value
+
+
+def required_indicators(config: Dict, model_features: Optional[Iterable[str]] = None) -> Optional[List[str]]:
+    """
+    Indicators read by the enabled strategies, the rule-based signal served
+    when the model cannot answer (see inference_guard.RuleBasedSignal), the
+    pruned feature plan (model.feature_plan) and the model's features.
+
+    Strategy lookbacks given in days are converted to bars of the
+    ``data.timeframe`` the analyzer is fed (DEFAULT_TIMEFRAME when unset).
+
+    Returns None when the configuration has neither a strategies section
+    nor a feature plan, meaning every configured indicator is needed.
+    """
+    strategies = config.get('strategies')
+    timeframe = config.get('data', {}).get('timeframe', DEFAULT_TIMEFRAME)
+    feature_plan = (config.get('model') or {}).get('feature_plan')
+    if strategies is None and feature_plan is None:
+        return None
+    required: List[str] = []
+    for name, strategy in (strategies or {}).items():
+        if strategy.get('enabled') and name in STRATEGY_INDICATORS:
+            required.extend(STRATEGY_INDICATORS[name](strategy, timeframe))
+    required.extend(RuleBasedSignal.from_config(config).columns)
+    required.extend((feature_plan or {}).get('features', []))
+    required.extend(model_features or [])
+    return list(dict.fromkeys(required))
+
+
+def compute_feature_tensor(
+    close: np.ndarray,
+    volume: Optional[np.ndarray] = None,
+    indicators: Optional[Dict] = None,
+    plan: Optional[IndicatorPlan] = None
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Compute every configured indicator for a whole universe at once.
+
+    Args:
+        close: (symbols x bars) close matrix, or a single series
+        volume: Optional matrix of the same shape; adds VOLUME_SMA_<n> features
+        indicators: The ``data.indicators`` configuration section
+        plan: Precompiled plan (takes precedence over ``indicators``)
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: (symbols x bars x features) float64
+            tensor and the feature names along its last axis
+    """
+    plan = plan or IndicatorPlan(indicators)
+    close = np.atleast_2d(np.asarray(close, dtype=np.float64))
+    if volume is not None:
+        volume = np.atleast_2d(volume)
+    features = plan.execute(close, volume)
+
+    names = list(features)
+    tensor = np.empty(close.shape + (len(names),), dtype=np.float64)
+    for k, name in enumerate(names):
+        tensor[..., k] = features[name]
+    return tensor, names
+
+
+def _identity(x: np.ndarray) -> np.ndarray:
+    return x
+
+
+def _mean(csum: Tuple[np.ndarray, np.ndarray], window: int) -> np.ndarray:
+    return mean_from_cumsum(csum[0], csum[1], window)
+
+
+def _squared_cumsum(close: np.ndarray, csum: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    shifted = close - csum[1]
+    return np.cumsum(shifted * shifted, axis=-1)
+
+
+def _std(csum: Tuple[np.ndarray, np.ndarray], csum_sq: np.ndarray, window: int) -> np.ndarray:
+    return std_from_cumsums(csum[0], csum_sq, window)
+
+
+def _delta(close: np.ndarray) -> np.ndarray:
+    # The first delta is undefined; like the pandas path it counts as no move
+    return np.diff(close, axis=-1, prepend=close[..., :1])
+
+
+def _gain_cumsum(delta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return shifted_cumsum(np.where(delta > 0, delta, 0.0))
+
+
+def _loss_cumsum(delta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return shifted_cumsum(np.where(delta < 0, -delta, 0.0))
+
+
+def _band(middle: np.ndarray, std: np.ndarray, width: float) -> np.ndarray:
+    return middle + width * std
+
+
+def _rsi(gain_csum, loss_csum, period: int) -> np.ndarray:
+    gain = _mean(gain_csum, period)
+    loss = _mean(loss_csum, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
@@ -0,0 +1,115 @@
+import threading
+from collections import deque
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+
+class PredictionTimeout(Exception):
+    """The model did not answer within the latency budget"""
+
+
+class LatencyStats:
+    """
+    Rolling window of call durations with percentile summaries.
+
+    Args:
+        window: Number of most recent durations kept
+    """
+
+    def __init__(self, window: int = 1000):
+        self._durations = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._durations.append(seconds)
+            self.count += 1
+
+    def percentile_ms(self, q: float) -> Optional[float]:
+        """q-th percentile of the window in milliseconds, None before the first call"""
+        with self._lock:
+            durations = np.fromiter(self._durations, dtype=np.float64)
+        if durations.size == 0:
+            return None
+        return float(np.percentile(durations, q)) * 1e3
+
+    @property
+    def p50_ms(self) -> Optional[float]:
+        return self.percentile_ms(50)
+
+    @property
+    def p99_ms(self) -> Optional[float]:
+        return self.percentile_ms(99)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {'count': self.count, 'p50_ms': self.p50_ms, 'p99_ms': self.p99_ms}
+
+
+class RuleBasedSignal:
+    """
+    Vectorized RSI/SMA signal served when the model cannot answer in time.
+
+    Long (1) while the fast SMA is above the slow SMA and RSI is below the
+    overbought level, short (-1) while the fast SMA is below the slow SMA
+    and RSI is above the oversold level, flat (0) otherwise or where an
+    input is missing. For models without a -1 class short becomes flat.
+
+    Args:
+        fast: Fast moving-average feature name
+        slow: Slow moving-average feature name
+        rsi_oversold: RSI below which no short is taken
+        rsi_overbought: RSI above which no long is taken
+    """
+
+    def __init__(self, fast: str = 'SMA_10', slow: str = 'SMA_50', rsi_oversold: float = 30.0,
+                 rsi_overbought: float = 70.0):
+        self.fast = fast
+        self.slow = slow
+        self.rsi_oversold = rsi_oversold
+        self.rsi_overbought = rsi_overbought
+
+    @property
+    def columns(self) -> Sequence[str]:
+        """Features the rule reads"""
+        return ['RSI', self.fast, self.slow]
+
+    @classmethod
+    def from_config(cls, config) -> 'RuleBasedSignal':
+        """Shortest and longest data.indicators SMA, RSI levels from strategies.momentum"""
+        if not isinstance(config, dict):
+            return cls()
+        periods = sorted(config.get('data', {}).get('indicators', {}).get('sma_periods') or [10, 50])
+        momentum = config.get('strategies', {}).get('momentum', {})
+        return cls(
+            fast=f'SMA_{periods[0]}',
+            slow=f'SMA_{periods[-1]}',
+            rsi_oversold=momentum.get('rsi_oversold', 30.0),
+            rsi_overbought=momentum.get('rsi_overbought', 70.0)
+        )
+
+    def signals(self, lookup: Callable[[str], np.ndarray], n_rows: int,
+                classes: Optional[Sequence] = None) -> np.ndarray:
+        """
+        Signal per row from feature values.
+
+        Args:
+            lookup: Feature name -> one value per row (KeyError when unavailable)
+            n_rows: Number of rows
+            classes: Model classes; short maps to flat when -1 is not one of them
+
+        Returns:
+            np.ndarray: int signals, all flat when a required feature is unavailable
+        """
+        try:
+            rsi, fast, slow = (np.asarray(lookup(name), dtype=np.float64) for name in self.columns)
+        except KeyError:
+            return np.zeros(n_rows, dtype=int)
+        # NaN comparisons are False, so missing inputs stay flat
+        long = (fast > slow) & (rsi < self.rsi_overbought)
+        short = (fast < slow) & (rsi > self.rsi_oversold)
+        signal = long.astype(int) - short.astype(int)
+        if classes is not None and -1 not in set(np.asarray(classes).tolist()):
+            signal = np.maximum(signal, 0)
+        return signal
@@ -0,0 +1,111 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from .tree_inference import CompiledForest
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """
+    A fitted scaler and model with the feature columns they were trained on.
+
+    Bundles are never modified after they are published: training builds a
+    new bundle and DataAnalyzer swaps its reference in a single assignment,
+    so a reader that takes the reference once always sees a scaler and a
+    model that belong together.
+
+    ``compiled`` optionally holds a CompiledForest of the model; predictions
+    then skip scikit-learn's per-call overhead with identical results.
+    """
+
+    scaler: Any
+    model: Any
+    feature_columns: List[str] = field(default_factory=list)
+    version: int = 0
+    trained_at: float = 0.0
+    compiled: Any = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return hasattr(self.model, 'classes_')
+
+    def transform(self, values: np.ndarray) -> np.ndarray:
+        """Scale feature rows; StandardScaler arithmetic is inlined when compiled"""
+        if self.compiled is None or type(self.scaler) is not StandardScaler:
+            return self.scaler.transform(values)
+        # Same operations as StandardScaler.transform, without input validation
+        values = np.asarray(values)
+        X = np.array(values, dtype=values.dtype if values.dtype in (np.float32, np.float64) else np.float64)
+        if self.scaler.with_mean:
+            X -= self.scaler.mean_
+        if self.scaler.with_std:
+            X /= self.scaler.scale_
+        return X
+
+    def predict(self, values: np.ndarray) -> np.ndarray:
+        """Signals for feature rows in ``feature_columns`` order"""
+        scaled = self.transform(values)
+        if self.compiled is not None:
+            return self.compiled.predict(scaled)
+        return self.model.predict(scaled)
+
+    def predict_proba(self, values: np.ndarray) -> np.ndarray:
+        """Class probabilities for feature rows, columns ordered as ``model.classes_``"""
+        scaled = self.transform(values)
+        if self.compiled is not None:
+            return self.compiled.predict_proba(scaled)
+        return self.model.predict_proba(scaled)
+
+
+# Model families selectable with model.family, with their default parameters
+MODEL_FAMILIES = {
+    'random_forest': (RandomForestClassifier, {'n_estimators': 100, 'random_state': 42}),
+    'extra_trees': (ExtraTreesClassifier, {'n_estimators': 100, 'random_state': 42}),
+    'logistic_regression': (LogisticRegression, {'max_iter': 1000}),
+    'sgd': (SGDClassifier, {'loss': 'log_loss', 'random_state': 42}),
+}
+
+
+def build_model(family: str = 'random_forest', params: Optional[Dict[str, Any]] = None):
+    """Unfitted model of a family in MODEL_FAMILIES, defaults overridden by ``params``"""
+    if family not in MODEL_FAMILIES:
+        raise ValueError(f"Unknown model family: {family}")
+    cls, defaults = MODEL_FAMILIES[family]
+    return cls(**{**defaults, **(params or {})})
+
+
+def compile_model(model) -> Optional[CompiledForest]:
+    """CompiledForest for a fitted RandomForestClassifier, None for other models"""
+    if isinstance(model, RandomForestClassifier) and hasattr(model, 'classes_') and model.n_outputs_ == 1:
+        return CompiledForest.from_sklearn(model)
+    return None
+
+
+def fit_bundle(
+    scaler,
+    model,
+    values: np.ndarray,
+    targets: np.ndarray,
+    feature_columns: List[str],
+    version: int,
+    compile_forest: bool = False
+) -> ModelBundle:
+    """
+    Fit fresh copies of ``scaler`` and ``model`` and return them as a bundle.
+
+    Module-level so it can run in a worker process; the estimators passed in
+    are only used as templates and are left untouched. With ``compile_forest`` the
+    bundle also carries a CompiledForest when the model is a RandomForest.
+    """
+    scaler = clone(scaler)
+    model = clone(model)
+    model.fit(scaler.fit_transform(values), targets)
+    compiled = compile_model(model) if compile_forest else None
+    return ModelBundle(scaler, model, list(feature_columns), version, time.time(), compiled)
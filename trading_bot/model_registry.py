@@ -0,0 +1,258 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .features import build_feature_matrix
+from .model_bundle import ModelBundle
+
+
+@dataclass
+class ShadowStats:
+    """Running comparison of one model's signals with the champion's"""
+    rows: int = 0
+    agreements: int = 0
+    batches: int = 0
+    errors: int = 0
+    virtual_pnl: float = 0.0
+    # Signal held per symbol since the previous scored batch
+    positions: pd.Series = field(default_factory=lambda: pd.Series(dtype=np.float64))
+
+    @property
+    def agreement(self) -> float:
+        return self.agreements / self.rows if self.rows else float('nan')
+
+
+class ModelRegistry:
+    """
+    Named challenger models scored in shadow next to the serving champion.
+
+    The champion is the analyzer's published model bundle. Challengers see
+    every feature batch the champion scores, but are scored afterwards on a
+    single worker thread so they never delay the live signal; when the
+    worker falls more than ``max_pending`` batches behind, new batches are
+    dropped (and counted) rather than queued. For every model the registry
+    tracks agreement with the champion's signals and a virtual P&L: the
+    signal of a batch (-1 short, 0 flat, 1 long, clipped) is held until
+    the next batch with prices for the symbol.
+
+    Promotion publishes a challenger as a new bundle version in a single
+    reference swap - no retraining and no restart; the former champion
+    stays registered so it can be promoted back.
+
+    Args:
+        analyzer: DataAnalyzer serving the champion
+        max_pending: Shadow batches allowed to wait for the worker
+        log_every: Log a shadow report every this many batches (0 to disable)
+    """
+
+    CHAMPION = 'champion'
+
+    def __init__(self, analyzer, max_pending: int = 4, log_every: int = 100):
+        self.analyzer = analyzer
+        self.max_pending = max_pending
+        self.log_every = log_every
+        self.dropped = 0
+        self.logger = logging.getLogger(__name__)
+        self._challengers: Dict[str, ModelBundle] = {}
+        self._stats: Dict[str, ShadowStats] = {self.CHAMPION: ShadowStats()}
+        self._last_prices = pd.Series(dtype=np.float64)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._worker: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def champion(self) -> ModelBundle:
+        return self.analyzer.model_bundle
+
+    @property
+    def challengers(self) -> Dict[str, ModelBundle]:
+        return dict(self._challengers)
+
+    def register(self, name: str, bundle: ModelBundle):
+        """Add or replace a fitted challenger"""
+        if name == self.CHAMPION:
+            raise ValueError(f"'{self.CHAMPION}' is reserved for the serving model")
+        if not bundle.is_fitted:
+            raise ValueError(f"Challenger {name} is not trained")
+        with self._lock:
+            # Copy-on-write, so the worker iterates a dict nobody modifies
+            self._challengers = {**self._challengers, name: bundle}
+            self._stats[name] = ShadowStats()
+
+    def register_saved(self, name: str, version: int):
+        """Register a version from the analyzer's model store as a challenger"""
+        if self.analyzer.model_store is None:
+            raise ValueError("No model store configured")
+        bundle = self.analyzer.model_store.load(version)
+        if bundle is None:
+            raise ValueError(f"Model version {version} not found")
+        self.register(name, bundle)
+
+    def remove(self, name: str):
+        """Stop shadowing a challenger"""
+        with self._lock:
+            self._challengers = {k: v for k, v in self._challengers.items() if k != name}
+            self._stats.pop(name, None)
+
+    def promote(self, name: str) -> ModelBundle:
+        """
+        Serve a challenger as the champion.
+
+        The challenger is published as the analyzer's newest bundle version;
+        the previous champion is registered as ``champion_v<version>``.
+
+        Returns:
+            ModelBundle: The new champion
+        """
+        with self._lock:
+            if name not in self._challengers:
+                raise KeyError(f"Unknown challenger: {name}")
+            previous = self.champion
+            promoted = replace(self._challengers[name], version=next(self.analyzer._versions))
+            if not self.analyzer.publish_bundle(promoted):
+                raise RuntimeError(f"Could not publish challenger {name}")
+
+            challengers = {k: v for k, v in self._challengers.items() if k != name}
+            stats = self._stats.pop(name)
+            if previous.is_fitted:
+                retired = f'champion_v{previous.version}'
+                challengers[retired] = previous
+                self._stats[retired] = self._stats[self.CHAMPION]
+            self._challengers = challengers
+            self._stats[self.CHAMPION] = stats
+        self.logger.info(
+            f"Promoted {name} to champion (version {promoted.version}, "
+            f"shadow agreement {stats.agreement:.3f}, virtual P&L {stats.virtual_pnl:.4f})"
+        )
+        return promoted
+
+    def shadow(
+        self,
+        symbols: Sequence[str],
+        lookup: Callable[[str], np.ndarray],
+        champion_signals: np.ndarray,
+        prices: Optional[np.ndarray] = None
+    ) -> Optional[Future]:
+        """
+        Queue challenger scoring of a batch the champion has just scored.
+
+        Args:
+            symbols: Symbol of each row
+            lookup: Feature name -> one value per row (evaluated on the worker)
+            champion_signals: The champion's signal per row, NaN where it had none
+            prices: Latest price per row, for virtual P&L
+
+        Returns:
+            Optional[Future]: Done when the batch is scored, None when it was
+                dropped or there are no challengers
+        """
+        with self._lock:
+            if not self._challengers:
+                return None
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return None
+            self._pending += 1
+            if self._worker is None:
+                self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow')
+            # Scored against the models registered now, even if promote or
+            # remove changes the registry before the worker gets to it
+            challengers = self._challengers
+            stats = dict(self._stats)
+        symbols = list(symbols)
+        champion_signals = np.asarray(champion_signals, dtype=np.float64)
+        prices = None if prices is None else np.asarray(prices, dtype=np.float64)
+        future = self._worker.submit(self._score, challengers, stats, symbols, lookup, champion_signals, prices)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+        if future.exception() is not None:
+            self.logger.error(f"Shadow scoring failed: {future.exception()}")
+
+    def _score(
+        self,
+        challengers: Dict[str, ModelBundle],
+        stats_by_name: Dict[str, ShadowStats],
+        symbols: List[str],
+        lookup,
+        champion_signals: np.ndarray,
+        prices: Optional[np.ndarray]
+    ):
+        index = pd.Index(symbols)
+        returns = None
+        if prices is not None:
+            current = pd.Series(prices, index=index)
+            returns = (current / self._last_prices.reindex(index) - 1.0).fillna(0.0)
+
+        signals = {self.CHAMPION: champion_signals}
+        for name, bundle in challengers.items():
+            try:
+                features = build_feature_matrix(
+                    bundle.feature_columns, lookup, len(symbols), self.analyzer.feature_dtype
+                ).values
+                predicted = np.full(len(symbols), np.nan)
+                valid = ~np.isnan(features).any(axis=1)
+                if valid.any():
+                    predicted[valid] = bundle.predict(features[valid])
+                signals[name] = predicted
+            except Exception as e:
+                self.logger.warning(f"Challenger {name} failed to score: {e}")
+                stats_by_name[name].errors += 1
+
+        for name, predicted in signals.items():
+            stats = stats_by_name.get(name)
+            if stats is None:
+                continue
+            if returns is not None:
+                held = stats.positions.reindex(index).fillna(0.0)
+                stats.virtual_pnl += float((held * returns).sum())
+            scored = ~np.isnan(predicted) & ~np.isnan(champion_signals)
+            stats.rows += int(scored.sum())
+            stats.agreements += int((predicted[scored] == champion_signals[scored]).sum())
+            stats.batches += 1
+            positions = pd.Series(np.clip(np.nan_to_num(predicted), -1.0, 1.0), index=index)
+            stats.positions = positions.combine_first(stats.positions)
+
+        if prices is not None:
+            self._last_prices = current.combine_first(self._last_prices)
+        batches = stats_by_name[self.CHAMPION].batches
+        if self.log_every and batches % self.log_every == 0:
+            self.logger.info(f"Shadow report after {batches} batches:\n{self.report().to_string()}")
+
+    def report(self) -> pd.DataFrame:
+        """Per model: version, batches, rows, agreement, errors and virtual P&L"""
+        with self._lock:
+            bundles = {self.CHAMPION: self.champion, **self._challengers}
+            stats_by_name = dict(self._stats)
+        rows = []
+        for name, stats in stats_by_name.items():
+            bundle = bundles.get(name)
+            rows.append({
+                'model': name,
+                'version': bundle.version if bundle is not None else None,
+                'batches': stats.batches,
+                'rows': stats.rows,
+                'agreement': stats.agreement,
+                'errors': stats.errors,
+                'virtual_pnl': stats.virtual_pnl,
+            })
+        return pd.DataFrame(rows).set_index('model')
+
+    def wait(self):
+        """Block until queued shadow batches are scored"""
+        if self._worker is not None:
+            self._worker.submit(lambda: None).result()
+
+    def shutdown(self):
+        """Stop the shadow worker"""
+        if self._worker is not None:
+            self._worker.shutdown(wait=True)
+            self._worker = None
@@ -0,0 +1,395 @@
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler
+
+from .model_bundle import build_model, compile_model
+from .parallel_analysis import SharedArray, SharedArrayRef, attach_shared, default_start_method, encode_labels
+from .walk_forward import Fold, PrefixMoments
+
+# Searched when no space is given: model family -> parameter -> values
+DEFAULT_SEARCH_SPACE = {
+    'random_forest': {
+        'n_estimators': [25, 50, 100, 200],
+        'max_depth': [4, 8, None],
+        'min_samples_leaf': [1, 5, 20],
+    },
+    'extra_trees': {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [8, None],
+        'min_samples_leaf': [1, 5],
+    },
+    'logistic_regression': {
+        'C': [0.01, 0.1, 1.0, 10.0],
+    },
+}
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """A model family with one parameter setting"""
+    family: str
+    params: Tuple[Tuple[str, Any], ...] = ()
+
+    @property
+    def name(self) -> str:
+        return f"{self.family}({', '.join(f'{k}={v}' for k, v in self.params)})"
+
+    def build(self):
+        return build_model(self.family, dict(self.params))
+
+
+def candidates_from_space(
+    space: Optional[Dict[str, Dict[str, Sequence]]] = None,
+    n_candidates: Optional[int] = None,
+    seed: int = 0
+) -> List[Candidate]:
+    """
+    Every parameter combination of every family in ``space``.
+
+    Args:
+        space: Family -> parameter -> values (defaults to DEFAULT_SEARCH_SPACE)
+        n_candidates: Random sample of this many combinations instead of all
+        seed: Seed of the sample
+
+    Returns:
+        List[Candidate]: Candidates in grid order (or sample order)
+    """
+    space = DEFAULT_SEARCH_SPACE if space is None else space
+    candidates = []
+    for family, grid in space.items():
+        names = sorted(grid)
+        for values in itertools.product(*(grid[name] for name in names)):
+            candidates.append(Candidate(family, tuple(zip(names, values))))
+    if n_candidates is not None and n_candidates < len(candidates):
+        picks = np.random.default_rng(seed).choice(len(candidates), n_candidates, replace=False)
+        candidates = [candidates[i] for i in picks]
+    return candidates
+
+
+class FoldCache:
+    """
+    Scaled feature rows of every walk-forward fold, in shared memory.
+
+    Each fold's scaler is fitted once (from prefix sums for a StandardScaler)
+    and the fold's rows are transformed once, so trials only fit and score
+    models. Workers map the arrays by reference; object-dtype targets are
+    shared as integer codes (see encode_labels), which score the same.
+    """
+
+    def __init__(self, values: np.ndarray, targets: np.ndarray, folds: List[Fold], scaler=None):
+        values = np.asarray(values)
+        scaler = StandardScaler() if scaler is None else scaler
+        moments = PrefixMoments(values) if type(scaler) is StandardScaler else None
+        self.folds = folds
+        self._buffers: List[SharedArray] = []
+        self.targets = self._share(encode_labels(targets)[0])
+        self.rows: List[SharedArrayRef] = []
+        for fold in folds:
+            if moments is not None:
+                fitted = moments.scaler(fold.train_start, fold.train_stop)
+            else:
+                fitted = clone(scaler).fit(values[fold.train_start:fold.train_stop])
+            self.rows.append(self._share(fitted.transform(values[fold.train_start:fold.test_stop])))
+
+    def _share(self, values: np.ndarray) -> SharedArrayRef:
+        buffer = SharedArray(values.shape, values.dtype)
+        buffer.array[...] = values
+        self._buffers.append(buffer)
+        return buffer.ref
+
+    def close(self):
+        """Release the shared arrays"""
+        for buffer in self._buffers:
+            buffer.close()
+        self._buffers.clear()
+
+
+# Shared-memory mappings of the current worker, keyed by segment name
+_worker_segments: Dict[str, Tuple] = {}
+
+
+def _attached(ref: SharedArrayRef) -> np.ndarray:
+    if ref.name not in _worker_segments:
+        _worker_segments[ref.name] = attach_shared(ref)
+    return _worker_segments[ref.name][1]
+
+
+def _fit_fold(candidate: Candidate, fold: Fold, rows_ref: SharedArrayRef, targets_ref: SharedArrayRef):
+    """Candidate fitted on a cached fold, with the fold's test rows and targets"""
+    rows, targets = _attached(rows_ref), _attached(targets_ref)
+    n_train = fold.train_stop - fold.train_start
+    model = candidate.build()
+    model.fit(rows[:n_train], targets[fold.train_start:fold.train_stop])
+    return model, rows[fold.test_start - fold.train_start:], targets[fold.test_start:fold.test_stop]
+
+
+def run_trial(candidate: Candidate, fold: Fold, rows_ref: SharedArrayRef, targets_ref: SharedArrayRef) -> Dict:
+    """Fit a candidate on one cached fold and score it (runs in a worker process)"""
+    start = time.perf_counter()
+    model, test, test_targets = _fit_fold(candidate, fold, rows_ref, targets_ref)
+    return {
+        'fold': fold.index,
+        'score': float(model.score(test, test_targets)),
+        'fit_seconds': time.perf_counter() - start,
+    }
+
+
+def measure_latency(
+    candidate: Candidate,
+    fold: Fold,
+    rows_ref: SharedArrayRef,
+    targets_ref: SharedArrayRef,
+    repeats: int,
+    compiled: bool = True
+) -> Dict:
+    """
+    Single-row prediction time of a candidate fitted on one cached fold,
+    through a CompiledForest when ``compiled`` and the model is a
+    RandomForest, as it would serve in production (runs in a worker process).
+    """
+    model, test, _ = _fit_fold(candidate, fold, rows_ref, targets_ref)
+    predictor = (compile_model(model) if compiled else None) or model
+    row = test[-1:]
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predictor.predict(row)
+        times.append(time.perf_counter() - start)
+    return {'latency_ms': float(np.median(times)) * 1e3, 'latency_p99_ms': float(np.percentile(times, 99)) * 1e3}
+
+
+@dataclass
+class CandidateResult:
+    """Fold scores and latency measured for one candidate"""
+    candidate: Candidate
+    fold_scores: Dict[int, float] = field(default_factory=dict)
+    fit_seconds: float = 0.0
+    latency_ms: Optional[float] = None
+    latency_p99_ms: Optional[float] = None
+    rung: int = 0
+
+    @property
+    def score(self) -> float:
+        return float(np.mean(list(self.fold_scores.values()))) if self.fold_scores else float('nan')
+
+    def score_on(self, folds: Sequence[int]) -> float:
+        """Mean score over the given fold indices, so candidates compare on the same folds"""
+        return float(np.mean([self.fold_scores[index] for index in folds]))
+
+
+class ModelSearch:
+    """
+    Successive-halving and Hyperband search over model families and parameters.
+
+    Walk-forward folds are the budget: every candidate of a rung is scored
+    on the first ``budget`` folds (the cheapest, with the least training
+    data), only the best 1/eta - ranked on exactly those folds - move on to
+    ``eta`` times as many folds, and the survivors of the last rung are
+    scored on all of them. Trials run in a process pool over a FoldCache,
+    so fold features are scaled once for the whole search, and a
+    (candidate, fold) score is never computed twice, also across Hyperband
+    brackets. The single-row inference latency of every candidate scored
+    on all folds is measured at the end, one candidate at a time, so the
+    timings are not skewed by trials competing for the CPU.
+
+    Args:
+        values: (rows x features) training matrix in time order
+        targets: Target per row
+        folds: Walk-forward folds (see walk_forward_folds)
+        eta: Fraction of candidates dropped per rung is 1 - 1/eta
+        max_workers: Pool size (defaults to the CPU count)
+        latency_repeats: Single-row predictions timed per finalist
+        compiled: Time RandomForests through a CompiledForest (model.compiled_inference)
+        start_method: Worker start method (defaults to default_start_method)
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        targets: np.ndarray,
+        folds: List[Fold],
+        eta: int = 3,
+        max_workers: Optional[int] = None,
+        latency_repeats: int = 50,
+        compiled: bool = True,
+        start_method: Optional[str] = None
+    ):
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        self.values = np.asarray(values)
+        self.targets = np.asarray(targets)
+        self.folds = folds
+        self.eta = eta
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.latency_repeats = latency_repeats
+        self.compiled = compiled
+        self.start_method = start_method or default_start_method()
+        self.results: Dict[Candidate, CandidateResult] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def successive_halving(self, candidates: Sequence[Candidate], min_folds: int = 1) -> pd.DataFrame:
+        """
+        Run one successive-halving bracket.
+
+        Args:
+            candidates: Candidates to compare
+            min_folds: Folds every candidate is scored on in the first rung
+
+        Returns:
+            DataFrame: Results of all candidates evaluated so far (see table)
+        """
+        with self._session() as run:
+            self._bracket(run, list(candidates), min_folds)
+        return self.table()
+
+    def hyperband(self, candidates: Sequence[Candidate], seed: int = 0) -> pd.DataFrame:
+        """
+        Run Hyperband: successive-halving brackets from many candidates on
+        few folds down to a few candidates on all folds. The widest bracket
+        starts from every candidate, so each is scored at least once; the
+        others draw fewer candidates at random and give them more folds.
+
+        Returns:
+            DataFrame: Results of all candidates evaluated (see table)
+        """
+        candidates = list(candidates)
+        rng = np.random.default_rng(seed)
+        if not candidates:
+            return self.table()
+        n_folds = len(self.folds)
+        # Brackets are sized from the candidates, not the folds: with few
+        # folds the widest bracket still takes the whole candidate list
+        s_max = int(math.log(len(candidates), self.eta) + 1e-9)
+        with self._session() as run:
+            for s in range(s_max, -1, -1):
+                n = int(math.ceil(len(candidates) * (s_max + 1) / (s + 1) / self.eta ** (s_max - s)))
+                if n >= len(candidates):
+                    picks = range(len(candidates))
+                else:
+                    picks = rng.choice(len(candidates), n, replace=False)
+                min_folds = max(1, int(round(n_folds / self.eta ** s)))
+                self._bracket(run, [candidates[i] for i in picks], min_folds)
+        return self.table()
+
+    def _bracket(self, run, alive: List[Candidate], budget: int):
+        rung = 0
+        while True:
+            budget = min(budget, len(self.folds))
+            run(alive, budget, rung)
+            if budget == len(self.folds) or len(alive) == 1:
+                break
+            # Candidates from earlier brackets may hold more folds; rank on this rung's
+            scored = [fold.index for fold in self.folds[:budget]]
+            alive = sorted(alive, key=lambda c: self.results[c].score_on(scored), reverse=True)
+            alive = alive[:max(1, len(alive) // self.eta)]
+            budget *= self.eta
+            rung += 1
+        if budget < len(self.folds):
+            run(alive, len(self.folds), rung + 1)
+
+    @contextmanager
+    def _session(self):
+        """Yields run(candidates, n_folds, rung) over one pool and fold cache"""
+        cache = FoldCache(self.values, self.targets, self.folds)
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context(self.start_method)
+        )
+        try:
+            yield lambda candidates, n_folds, rung: self._run(pool, cache, candidates, n_folds, rung)
+            self._measure_latency(pool, cache)
+        finally:
+            pool.shutdown(wait=True)
+            cache.close()
+
+    def _run(self, pool: ProcessPoolExecutor, cache: FoldCache, candidates: List[Candidate], n_folds: int, rung: int):
+        """Score candidates on the first n_folds folds, skipping trials already done"""
+        futures = []
+        for candidate in candidates:
+            result = self.results.setdefault(candidate, CandidateResult(candidate))
+            result.rung = max(result.rung, rung)
+            for fold in self.folds[:n_folds]:
+                if fold.index in result.fold_scores:
+                    continue
+                futures.append((result, pool.submit(
+                    run_trial, candidate, fold, cache.rows[fold.index], cache.targets
+                )))
+        for result, future in futures:
+            trial = future.result()
+            result.fold_scores[trial['fold']] = trial['score']
+            result.fit_seconds += trial['fit_seconds']
+        self.logger.info(f"Rung {rung}: {len(candidates)} candidates on {n_folds} folds")
+
+    def _measure_latency(self, pool: ProcessPoolExecutor, cache: FoldCache):
+        """Time every finalist on the newest fold, one trial at a time on an idle pool"""
+        if not self.latency_repeats:
+            return
+        newest = self.folds[-1]
+        for result in self.results.values():
+            if len(result.fold_scores) < len(self.folds) or result.latency_ms is not None:
+                continue
+            timing = pool.submit(
+                measure_latency, result.candidate, newest, cache.rows[newest.index], cache.targets,
+                self.latency_repeats, self.compiled
+            ).result()
+            result.latency_ms = timing['latency_ms']
+            result.latency_p99_ms = timing['latency_p99_ms']
+
+    def table(self) -> pd.DataFrame:
+        """
+        One row per evaluated candidate, the best first.
+
+        Columns: candidate, family, params, rung, folds, score (mean fold
+        accuracy), fit_seconds, latency_ms and latency_p99_ms (NaN for
+        candidates that were cut before the last rung). Candidates scored on
+        more folds come first, then by score.
+        """
+        rows = [
+            {
+                'candidate': result.candidate.name,
+                'family': result.candidate.family,
+                'params': dict(result.candidate.params),
+                'rung': result.rung,
+                'folds': len(result.fold_scores),
+                'score': result.score,
+                'fit_seconds': result.fit_seconds,
+                'latency_ms': result.latency_ms,
+                'latency_p99_ms': result.latency_p99_ms,
+            }
+            for result in self.results.values()
+        ]
+        columns = ['candidate', 'family', 'params', 'rung', 'folds', 'score',
+                   'fit_seconds', 'latency_ms', 'latency_p99_ms']
+        table = pd.DataFrame(rows, columns=columns)
+        return table.sort_values(['folds', 'score'], ascending=False, kind='stable').reset_index(drop=True)
+
+    def best(self, max_latency_ms: Optional[float] = None) -> Optional[Candidate]:
+        """
+        Highest-scoring candidate evaluated on every fold.
+
+        Args:
+            max_latency_ms: Only consider candidates whose median single-row
+                latency is within this budget
+
+        Returns:
+            Optional[Candidate]: The winner, or None when no candidate qualifies
+        """
+        finalists = [
+            result for result in self.results.values()
+            if len(result.fold_scores) == len(self.folds)
+            and (max_latency_ms is None or (result.latency_ms is not None and result.latency_ms <= max_latency_ms))
+        ]
+        if not finalists:
+            return None
+        return max(finalists, key=lambda result: result.score).candidate
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import sklearn
+
+from .model_bundle import ModelBundle
+from .tree_inference import CompiledForest
+
+
+class ModelStore:
+    """
+    Versioned on-disk model artifacts.
+
+    Each saved bundle is a directory ``root/<version>/`` holding
+    ``bundle.joblib`` (scaler and model, uncompressed so NumPy arrays can be
+    memory-mapped on load), ``forest/`` (the CompiledForest node arrays as
+    .npy files, when the bundle has one) and ``meta.json`` (version, feature columns,
+    training time, library versions and any caller metadata). ``LATEST``
+    names the newest complete version; it is replaced atomically after the
+    artifact is fully written, so a crash mid-save never leaves a broken
+    latest model.
+
+    Saves may come from several threads (such as a background training
+    callback and the main thread): each version is reserved by creating its
+    temporary directory exclusively, and LATEST only ever moves forward.
+    """
+
+    def __init__(self, root: str = 'data/models'):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def versions(self) -> List[int]:
+        """Saved versions, oldest first"""
+        return sorted(int(p.name) for p in self.root.iterdir() if p.is_dir() and p.name.isdigit())
+
+    def latest_version(self) -> Optional[int]:
+        """Version named by LATEST, or None when nothing was saved"""
+        latest_file = self.root / 'LATEST'
+        if not latest_file.exists():
+            return None
+        return int(latest_file.read_text().strip())
+
+    def metadata(self, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """meta.json of a version (default: the latest)"""
+        version = self.latest_version() if version is None else version
+        if version is None:
+            return None
+        with open(self.root / str(version) / 'meta.json', 'r') as f:
+            return json.load(f)
+
+    def save(self, bundle: ModelBundle, metadata: Optional[Dict[str, Any]] = None, keep: Optional[int] = None) -> int:
+        """
+        Write a bundle as the new latest version.
+
+        Args:
+            bundle: Fitted model bundle
+            metadata: Extra JSON-serializable fields for meta.json
+            keep: Number of versions to retain (older ones are deleted)
+
+        Returns:
+            int: Version the bundle was saved as
+        """
+        version, tmp_dir = self._reserve_version()
+
+        joblib.dump((bundle.scaler, bundle.model), tmp_dir / 'bundle.joblib', compress=0)
+        if bundle.compiled is not None:
+            bundle.compiled.save(tmp_dir / 'forest')
+        meta = dict(metadata or {})
+        meta.update(
+            version=version,
+            model_type=type(bundle.model).__name__,
+            feature_columns=bundle.feature_columns,
+            trained_at=bundle.trained_at,
+            saved_at=time.time(),
+            sklearn_version=sklearn.__version__
+        )
+        with open(tmp_dir / 'meta.json', 'w') as f:
+            json.dump(meta, f, indent=2, default=str)
+
+        os.replace(tmp_dir, self.root / str(version))
+        with self._lock:
+            # A slower save of an older version must not move LATEST back
+            latest = self.latest_version()
+            if latest is None or version > latest:
+                tmp_latest = self.root / 'LATEST.tmp'
+                tmp_latest.write_text(str(version))
+                os.replace(tmp_latest, self.root / 'LATEST')
+
+            if keep:
+                for old in self.versions()[:-keep]:
+                    shutil.rmtree(self.root / str(old), ignore_errors=True)
+        return version
+
+    def _reserve_version(self) -> Tuple[int, Path]:
+        """Next free version and its temporary directory, created exclusively"""
+        with self._lock:
+            existing = self.versions()
+            version = existing[-1] + 1 if existing else 1
+            while True:
+                tmp_dir = self.root / f'.{version}.tmp'
+                try:
+                    # Fails when another save (or one that crashed) holds this version
+                    tmp_dir.mkdir()
+                    return version, tmp_dir
+                except FileExistsError:
+                    version += 1
+
+    def load(self, version: Optional[int] = None, mmap: bool = True) -> Optional[ModelBundle]:
+        """
+        Load a saved bundle (default: the latest).
+
+        Args:
+            version: Version to load
+            mmap: Memory-map the large arrays instead of reading them into memory
+
+        Returns:
+            Optional[ModelBundle]: The bundle, versioned as saved, or None when
+                nothing was saved
+        """
+        meta = self.metadata(version)
+        if meta is None:
+            return None
+        if meta.get('sklearn_version') != sklearn.__version__:
+            self.logger.warning(
+                f"Model {meta['version']} was saved with scikit-learn {meta.get('sklearn_version')}, "
+                f"running {sklearn.__version__}"
+            )
+        path = self.root / str(meta['version'])
+        scaler, model = joblib.load(path / 'bundle.joblib', mmap_mode='r' if mmap else None)
+        # The flat forest arrays are used in place from the page cache
+        compiled = None
+        if (path / 'forest').exists():
+            try:
+                compiled = CompiledForest.load(path / 'forest', mmap=mmap)
+            except FileNotFoundError:
+                # Saved before missing-value routing was compiled; the caller recompiles
+                self.logger.info(f"Model {meta['version']} has an outdated compiled forest, ignoring it")
+        return ModelBundle(scaler, model, list(meta['feature_columns']), meta['version'], meta['trained_at'], compiled)
@@ -0,0 +1,302 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SharedArrayRef:
+    """Picklable handle to an array living in shared memory"""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedArray:
+    """
+    NumPy array backed by a ``multiprocessing.shared_memory`` segment.
+
+    The owning process writes into ``array``; worker processes attach by
+    ``ref`` and read the same pages without any pickling or copying.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype=np.float64):
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+        self.ref = SharedArrayRef(self._shm.name, tuple(shape), dtype.str)
+
+    def close(self):
+        """Release and unlink the segment"""
+        self.array = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+@dataclass(frozen=True)
+class WorkerStateRef:
+    """Pickled analyzer state in shared memory, identified by the bundle version and plan"""
+    key: Tuple[Any, ...]
+    payload: SharedArrayRef
+
+
+def default_start_method() -> str:
+    """
+    'forkserver' where available, otherwise 'spawn'.
+
+    Worker pools are started from processes that run threads (training,
+    shadow scoring, the event loop), which fork does not copy safely.
+    """
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def encode_labels(values: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Integer codes for object-dtype labels such as 'BUY'/'SELL'.
+
+    Shared memory holds raw bytes, so object arrays (pointers into the
+    parent's heap) cannot be shared; share the codes and index ``classes``
+    with them in the worker. Other dtypes are returned unchanged with
+    ``classes`` None.
+    """
+    values = np.asarray(values)
+    if not values.dtype.hasobject:
+        return values, None
+    classes, codes = np.unique(values, return_inverse=True)
+    return codes.astype(np.int64), classes
+
+
+def attach_shared(ref: SharedArrayRef) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Map a shared array created by another process (keep the segment alive while using the array)"""
+    shm = shared_memory.SharedMemory(name=ref.name)
+    return shm, np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=shm.buf)
+
+
+# Per-worker state, set up once by _init_worker and refreshed by _sync_worker_state
+_worker_analyzer = None
+_worker_state_key: Optional[Tuple[Any, ...]] = None
+_worker_segments: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def _init_worker(config, state: Dict, state_key: Optional[Tuple[Any, ...]] = None):
+    """
+    Build the worker's DataAnalyzer from the parent's configuration and state.
+
+    The analyzer reuses the parent's backend selection and model bundle, so
+    a worker neither benchmarks the indicator backends nor opens the model
+    and feature stores.
+    """
+    global _worker_analyzer, _worker_state_key
+    from .data_analyzer import DataAnalyzer
+
+    analyzer = DataAnalyzer(config, indicator_backends=state['indicator_backends'], persistent=False)
+    for name, value in state.items():
+        setattr(analyzer, name, value)
+    _worker_analyzer = analyzer
+    _worker_state_key = state_key
+
+
+def _sync_worker_state(ref: WorkerStateRef):
+    """Load a newer model bundle and indicator plan published by the parent"""
+    global _worker_state_key
+    if ref.key == _worker_state_key:
+        return
+    shm, payload = attach_shared(ref.payload)
+    try:
+        state = pickle.loads(payload.tobytes())
+    finally:
+        payload = None
+        shm.close()
+    for name, value in state.items():
+        setattr(_worker_analyzer, name, value)
+    _worker_state_key = ref.key
+
+
+def _worker_arrays(*refs: Optional[SharedArrayRef]) -> List[Optional[np.ndarray]]:
+    """Attached arrays for ``refs``, reusing mappings across calls"""
+    wanted = {ref.name for ref in refs if ref is not None}
+    for name in list(_worker_segments):
+        if name not in wanted:
+            # The parent replaced this buffer; release the old mapping
+            shm, _ = _worker_segments.pop(name)
+            shm.close()
+    arrays = []
+    for ref in refs:
+        if ref is None:
+            arrays.append(None)
+            continue
+        if ref.name not in _worker_segments:
+            _worker_segments[ref.name] = attach_shared(ref)
+        arrays.append(_worker_segments[ref.name][1])
+    return arrays
+
+
+def _analyze_shard(
+    symbols: Sequence[str],
+    close_ref: SharedArrayRef,
+    volume_ref: Optional[SharedArrayRef],
+    start: int,
+    stop: int,
+    state_ref: WorkerStateRef
+) -> List[Dict]:
+    _sync_worker_state(state_ref)
+    close, volume = _worker_arrays(close_ref, volume_ref)
+    volume = volume[start:stop] if volume is not None else None
+    return _worker_analyzer.analyze_latest(symbols, close[start:stop], volume)
+
+
+class AnalysisExecutor:
+    """
+    Runs DataAnalyzer.analyze_latest across a process pool.
+
+    The (symbols x bars) price matrices are copied once into shared memory
+    and each worker analyses a contiguous block of rows, so indicator
+    computation and model inference use every core instead of one thread
+    under the GIL. Results are concatenated in block order, which keeps the
+    input symbol order.
+
+    Workers are started once, with the spawn-safe start method used for
+    background training (see DataAnalyzer._training_start_method), and hold
+    a copy of the analyzer's model bundle and indicator plan. When a newer
+    bundle or plan has been published, the next call pickles it once into
+    shared memory and every task carries its version, so each worker loads
+    it before its next shard instead of the pool being restarted. The
+    shared buffers are reused between calls, so calls must not overlap.
+
+    Args:
+        analyzer: DataAnalyzer whose configuration and model the workers use
+        max_workers: Pool size (defaults to the CPU count)
+    """
+
+    # Analyzer attributes copied into every worker
+    WORKER_STATE = ('model_bundle', 'indicator_backends', 'indicator_plan')
+    # Attributes that change at runtime and are sent to live workers
+    RELOADED_STATE = ('model_bundle', 'indicator_plan')
+
+    def __init__(self, analyzer, max_workers: Optional[int] = None):
+        self.analyzer = analyzer
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.logger = logging.getLogger(__name__)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._buffers: Dict[str, SharedArray] = {}
+        self._state: Optional[SharedArray] = None
+        self._state_ref: Optional[WorkerStateRef] = None
+
+    def _state_key(self) -> Tuple[Any, ...]:
+        return (self.analyzer.model_bundle.version, self.analyzer.indicator_plan.fingerprint)
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            state = {name: getattr(self.analyzer, name) for name in self.WORKER_STATE}
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.analyzer._training_start_method()),
+                initializer=_init_worker,
+                initargs=(self.analyzer.config, state, self._state_key())
+            )
+        return self._pool
+
+    def _publish_state(self) -> WorkerStateRef:
+        """Shared copy of the analyzer's current bundle and plan for the workers"""
+        key = self._state_key()
+        if self._state_ref is None or self._state_ref.key != key:
+            if self._state_ref is not None:
+                self.logger.info(f"Sending model version {key[0]} to the analysis workers")
+            payload = pickle.dumps(
+                {name: getattr(self.analyzer, name) for name in self.RELOADED_STATE}, pickle.HIGHEST_PROTOCOL
+            )
+            # Tasks of earlier calls have finished, so no worker still reads the old copy
+            if self._state is not None:
+                self._state.close()
+            self._state = SharedArray((len(payload),), np.uint8)
+            self._state.array[:] = np.frombuffer(payload, dtype=np.uint8)
+            self._state_ref = WorkerStateRef(key, self._state.ref)
+        return self._state_ref
+
+    def _share(self, key: str, values: np.ndarray) -> SharedArrayRef:
+        """Copy values into a reusable shared buffer of the same shape"""
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.array.shape != values.shape:
+            if buffer is not None:
+                buffer.close()
+            buffer = SharedArray(values.shape, np.float64)
+            self._buffers[key] = buffer
+        np.copyto(buffer.array, values, casting='unsafe')
+        return buffer.ref
+
+    def _submit(self, symbols: Sequence[str], close: np.ndarray, volume: Optional[np.ndarray]):
+        symbols = list(symbols)
+        close = np.atleast_2d(close)
+        if close.shape[0] != len(symbols):
+            raise ValueError("close must have one row per symbol")
+        close_ref = self._share('close', close)
+        volume_ref = self._share('volume', np.atleast_2d(volume)) if volume is not None else None
+
+        pool = self._ensure_pool()
+        state_ref = self._publish_state()
+        bounds = np.linspace(0, len(symbols), min(self.max_workers, len(symbols)) + 1).astype(int)
+        return [
+            pool.submit(_analyze_shard, symbols[start:stop], close_ref, volume_ref, start, stop, state_ref)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+
+    def analyze(self, symbols: Sequence[str], close: np.ndarray, volume: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        Analyse the latest bar of every symbol in parallel.
+
+        Args:
+            symbols: Symbols, one per row of ``close``
+            close: (symbols x bars) close matrix
+            volume: Optional (symbols x bars) volume matrix
+
+        Returns:
+            List[Dict]: One result per symbol, in input order (see DataAnalyzer.analyze_latest)
+        """
+        if len(symbols) == 0:
+            return []
+        results = []
+        for future in self._submit(symbols, close, volume):
+            results.extend(future.result())
+        return results
+
+    async def analyze_async(
+        self,
+        symbols: Sequence[str],
+        close: np.ndarray,
+        volume: Optional[np.ndarray] = None
+    ) -> List[Dict]:
+        """``analyze`` without blocking the event loop"""
+        if len(symbols) == 0:
+            return []
+        futures = [asyncio.wrap_future(future) for future in self._submit(symbols, close, volume)]
+        results = []
+        for shard in await asyncio.gather(*futures):
+            results.extend(shard)
+        return results
+
+    def shutdown(self):
+        """Stop the workers and release the shared buffers"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        for buffer in self._buffers.values():
+            buffer.close()
+        self._buffers.clear()
+        if self._state is not None:
+            self._state.close()
+            self._state = None
+            self._state_ref = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -0,0 +1,216 @@
+import math
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class RollingWindow:
+    """
+    Fixed-size window of the most recent values with running sum and sum of
+    squares, so mean and variance are O(1) per update.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._values = [0.0] * size
+        self._pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+    def push(self, value: float):
+        """Add a value, evicting the oldest once the window is full"""
+        old = self._values[self._pos]
+        self._values[self._pos] = value
+        self._pos = (self._pos + 1) % self.size
+
+        if self.count < self.size:
+            self.count += 1
+            self.total += value
+            self.total_sq += value * value
+        elif self._pos == 0:
+            # Re-sum once per lap so add/subtract rounding error cannot drift
+            self.total = math.fsum(self._values)
+            self.total_sq = math.fsum(v * v for v in self._values)
+        else:
+            self.total += value - old
+            self.total_sq += value * value - old * old
+
+    def mean(self) -> float:
+        return self.total / self.size if self.full else math.nan
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, as pandas rolling().std())"""
+        if not self.full or self.size < 2:
+            return math.nan
+        var = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class EMAState:
+    """Exponential moving average seeded with the first value (pandas ewm(span, adjust=False))"""
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = math.nan
+
+    def push(self, x: float) -> float:
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class StreamingIndicators:
+    """
+    Running indicator state for one symbol.
+
+    Each call to ``update`` consumes one new close and returns every
+    indicator's latest value in O(1): rolling sums for SMA and Bollinger,
+    recursive state for EMA and MACD. Values are NaN until an indicator's
+    window is full, and match DataAnalyzer.compute_technical_indicators
+    (and pandas ``ewm(adjust=False)`` / ``rolling().std()`` for EMA, MACD
+    and Bollinger) to floating point tolerance.
+
+    RSI uses simple rolling means of gains and losses, the same definition
+    as the batch path, so both paths produce the same signal.
+    """
+
+    def __init__(
+        self,
+        sma_periods: Iterable[int] = (10, 50),
+        ema_periods: Iterable[int] = (12, 26),
+        rsi_period: Optional[int] = 14,
+        macd: Optional[Tuple[int, int, int]] = (12, 26, 9),
+        bollinger: Optional[Tuple[int, float]] = (20, 2.0),
+        std_periods: Iterable[int] = ()
+    ):
+        self._sma = {period: RollingWindow(period) for period in sma_periods}
+        self._ema = {period: EMAState(period) for period in ema_periods}
+        self._std = {period: RollingWindow(period) for period in std_periods}
+
+        self._rsi_period = rsi_period
+        if rsi_period:
+            self._gains = RollingWindow(rsi_period)
+            self._losses = RollingWindow(rsi_period)
+
+        self._macd = macd
+        if macd:
+            fast, slow, signal = macd
+            self._macd_fast = self._ema.get(fast) or EMAState(fast)
+            self._macd_slow = self._ema.get(slow) or EMAState(slow)
+            self._macd_signal = EMAState(signal)
+            # EMAs shared with ema_periods are already pushed in update()
+            self._macd_own = [ema for ema in (self._macd_fast, self._macd_slow) if ema not in self._ema.values()]
+
+        self._bollinger = bollinger
+        if bollinger:
+            self._bb_window = RollingWindow(bollinger[0])
+
+        self._prev_close = math.nan
+        self.values: Dict[str, float] = {}
+
+    @classmethod
+    def from_config(cls, indicators: Dict) -> 'StreamingIndicators':
+        """Build an engine for the indicators of a ``data.indicators`` section"""
+        macd = None
+        if indicators.get('macd_fast') and indicators.get('macd_slow'):
+            macd = (indicators['macd_fast'], indicators['macd_slow'], indicators.get('macd_signal', 9))
+        bollinger = None
+        if indicators.get('bollinger_period'):
+            bollinger = (indicators['bollinger_period'], indicators.get('bollinger_std', 2.0))
+        return cls(
+            sma_periods=indicators.get('sma_periods', []),
+            ema_periods=indicators.get('ema_periods', []),
+            rsi_period=indicators.get('rsi_period'),
+            macd=macd,
+            bollinger=bollinger
+        )
+
+    @classmethod
+    def from_plan(cls, plan) -> 'StreamingIndicators':
+        """
+        Build an engine for exactly the close-based outputs of an IndicatorPlan,
+        so streaming and batch evaluation compute the same selection.
+        """
+        indicators = plan.indicators
+        outputs = set(plan.outputs)
+        periods = {'SMA': [], 'EMA': [], 'STD': []}
+        for name in plan.outputs:
+            match = re.fullmatch(r'(SMA|EMA|STD)_(\d+)', name)
+            if match:
+                periods[match.group(1)].append(int(match.group(2)))
+        macd = None
+        if outputs & {'MACD', 'MACD_signal', 'MACD_hist'}:
+            macd = (indicators['macd_fast'], indicators['macd_slow'], indicators.get('macd_signal', 9))
+        bollinger = None
+        if outputs & {'BB_middle', 'BB_upper', 'BB_lower'}:
+            bollinger = (indicators['bollinger_period'], indicators.get('bollinger_std', 2.0))
+        return cls(
+            sma_periods=periods['SMA'],
+            ema_periods=periods['EMA'],
+            rsi_period=indicators.get('rsi_period') if 'RSI' in outputs else None,
+            macd=macd,
+            bollinger=bollinger,
+            std_periods=periods['STD']
+        )
+
+    def update(self, close: float) -> Dict[str, float]:
+        """
+        Consume one close price.
+
+        Args:
+            close: Latest close
+
+        Returns:
+            Dict[str, float]: Indicator name -> latest value
+        """
+        values = self.values
+        for period, window in self._sma.items():
+            window.push(close)
+            values[f'SMA_{period}'] = window.mean()
+        for period, ema in self._ema.items():
+            values[f'EMA_{period}'] = ema.push(close)
+        for period, window in self._std.items():
+            window.push(close)
+            values[f'STD_{period}'] = window.std()
+
+        if self._rsi_period:
+            # First delta is undefined and counts as no move, like the batch path
+            delta = 0.0 if math.isnan(self._prev_close) else close - self._prev_close
+            self._gains.push(delta if delta > 0 else 0.0)
+            self._losses.push(-delta if delta < 0 else 0.0)
+            values['RSI'] = _rsi(self._gains.mean(), self._losses.mean())
+
+        if self._macd:
+            for ema in self._macd_own:
+                ema.push(close)
+            macd = self._macd_fast.value - self._macd_slow.value
+            signal = self._macd_signal.push(macd)
+            values['MACD'] = macd
+            values['MACD_signal'] = signal
+            values['MACD_hist'] = macd - signal
+
+        if self._bollinger:
+            self._bb_window.push(close)
+            middle = self._bb_window.mean()
+            width = self._bollinger[1] * self._bb_window.std()
+            values['BB_middle'] = middle
+            values['BB_upper'] = middle + width
+            values['BB_lower'] = middle - width
+
+        self._prev_close = close
+        return dict(values)
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    """RSI from average gain and loss, following numpy division semantics"""
+    if math.isnan(avg_gain) or math.isnan(avg_loss):
+        return math.nan
+    if avg_loss == 0:
+        return math.nan if avg_gain == 0 else 100.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
@@ -0,0 +1,207 @@
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+
+# Files written by CompiledForest.save, one .npy per array
+_ARRAYS = ('feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots', 'classes')
+
+
+class CompiledForest:
+    """
+    A fitted RandomForestClassifier flattened into NumPy node arrays.
+
+    All trees are concatenated into one set of arrays (``feature``,
+    ``threshold``, ``left``, ``right``, ``missing_left`` and per-node class
+    probabilities ``value``); ``roots`` holds the first node of each tree.
+    Leaves point to themselves. A NaN input follows ``missing_left`` like
+    the tree's ``missing_go_to_left``, which scikit-learn sets during fit
+    (towards the larger child when no value was missing in training). Traversal advances every (row, tree) pair one level per
+    vectorized step, dropping pairs that reached a leaf, with no per-call
+    validation or thread dispatch. Single rows and small batches (one row
+    per symbol of the universe) take a fraction of a millisecond instead of
+    several milliseconds, and results are exactly scikit-learn's: inputs
+    are compared as float32 against float64 thresholds like the Cython
+    trees, and tree probabilities are accumulated in estimator order.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        missing_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        classes: np.ndarray,
+        max_depth: int
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.classes = classes
+        self.max_depth = max_depth
+        self._is_leaf = np.asarray(left) == np.arange(len(left))
+        # Left and right child interleaved, indexed by 2 * node + goes_right
+        self._children = np.stack([left, right], axis=1).ravel()
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @classmethod
+    def from_sklearn(cls, forest) -> 'CompiledForest':
+        """Compile a fitted single-output RandomForestClassifier"""
+        features, thresholds, lefts, rights, missing_lefts, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left < 0
+            own = np.arange(offset, offset + n, dtype=np.int64)
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset))
+            # Trees fitted before scikit-learn supported missing values send NaN right
+            missing = getattr(tree, 'missing_go_to_left', None)
+            missing_lefts.append(np.zeros(n, dtype=bool) if missing is None else np.asarray(missing, dtype=bool))
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            value = np.asarray(tree.value[:, 0, :], dtype=np.float64)
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+
+            roots.append(offset)
+            offset += n
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            missing_left=np.concatenate(missing_lefts),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            classes=np.asarray(forest.classes_),
+            max_depth=max(estimator.tree_.max_depth for estimator in forest.estimators_)
+        )
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Leaf index reached in every tree, shape (rows x trees)"""
+        X = np.ascontiguousarray(np.atleast_2d(X), dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        nodes = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows) * n_features, self.n_trees)
+
+        # Step every (row, tree) pair down one level at a time, dropping
+        # pairs as soon as they reach a leaf
+        active = np.flatnonzero(~self._is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            values = flat_X[row_offset[active] + self.feature[current]]
+            goes_right = ~(values <= self.threshold[current])
+            missing = np.isnan(values)
+            if missing.any():
+                goes_right[missing] = ~self.missing_left[current[missing]]
+            following = self._children[2 * current + goes_right]
+            nodes[active] = following
+            active = active[~self._is_leaf[following]]
+        return nodes.reshape(n_rows, self.n_trees)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities, identical to RandomForestClassifier.predict_proba"""
+        leaves = self.apply(X)
+        # Summing over the tree axis adds trees in order, like the forest does
+        return self.value[leaves].sum(axis=1) / self.n_trees
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predicted classes, identical to RandomForestClassifier.predict"""
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def save(self, path: Union[str, Path]):
+        """Write the arrays as .npy files (loadable with memory-mapping)"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(path / f'{name}.npy', getattr(self, name), allow_pickle=False)
+        with open(path / 'forest.json', 'w') as f:
+            json.dump({'max_depth': int(self.max_depth)}, f)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> 'CompiledForest':
+        """Load a saved forest; arrays are memory-mapped read-only by default"""
+        path = Path(path)
+        with open(path / 'forest.json', 'r') as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(path / f'{name}.npy', mmap_mode='r' if mmap else None, allow_pickle=False)
+            for name in _ARRAYS
+        }
+        return cls(max_depth=meta['max_depth'], **arrays)
+
+
+def benchmark(n_estimators: int = 100, n_features: int = 8, n_rows: int = 5000, repeats: int = 200) -> Dict[str, float]:
+    """
+    Compare scikit-learn and compiled inference latency on random data.
+
+    Returns:
+        Dict[str, float]: Median seconds per predict call for 1, 20 and 500
+            rows with each engine
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((n_rows, n_features)).astype(np.float32)
+    y = (X[:, 0] + 0.5 * rng.standard_normal(n_rows) > 0).astype(int)
+    forest = RandomForestClassifier(n_estimators=n_estimators, random_state=42).fit(X, y)
+    compiled = CompiledForest.from_sklearn(forest)
+    if not np.array_equal(compiled.predict(X), forest.predict(X)):
+        raise AssertionError("compiled forest disagrees with scikit-learn")
+
+    def median_time(fn, arg, runs):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn(arg)
+            times.append(time.perf_counter() - start)
+        return float(np.median(times))
+
+    results = {}
+    for rows in (1, 20, 500):
+        runs = repeats if rows < 500 else max(repeats // 10, 5)
+        results[f'sklearn_{rows}_rows'] = median_time(forest.predict, X[:rows], runs)
+        results[f'compiled_{rows}_rows'] = median_time(compiled.predict, X[:rows], runs)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled RandomForest inference")
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--features', type=int, default=8)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    results = benchmark(args.trees, args.features, repeats=args.repeats)
+    for name, seconds in results.items():
+        print(f"{name:>20}: {seconds * 1e6:10.1f} us")
+    print(f"{'single-row speedup':>20}: {results['sklearn_1_rows'] / results['compiled_1_rows']:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
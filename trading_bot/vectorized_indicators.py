@@ -0,0 +1,99 @@
+from typing import Tuple
+
+import numpy as np
+from scipy.signal import lfilter
+
+
+def shifted_cumsum(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cumulative sum along the last axis of values shifted by their first
+    element. Shifting keeps the running total small, so window sums taken as
+    differences of the cumulative sum stay precise over long histories.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (cumulative sum, shift) where the shift
+            has a trailing axis of length 1
+    """
+    values = np.asarray(values, dtype=np.float64)
+    base = values[..., :1]
+    return np.cumsum(values - base, axis=-1), base
+
+
+def mean_from_cumsum(csum: np.ndarray, base: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` values from a shifted_cumsum result"""
+    out = np.full(csum.shape, np.nan)
+    if csum.shape[-1] < window:
+        return out
+    out[..., window - 1] = csum[..., window - 1]
+    out[..., window:] = csum[..., window:] - csum[..., :-window]
+    out[..., window - 1:] /= window
+    out[..., window - 1:] += base
+    return out
+
+
+def std_from_cumsums(csum: np.ndarray, csum_sq: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing sample standard deviation (ddof=1) from the shifted cumulative
+    sums of the values and of their squares.
+    """
+    out = np.full(csum.shape, np.nan)
+    if csum.shape[-1] < window or window < 2:
+        return out
+    zero = np.zeros(csum.shape[:-1] + (1,))
+    mean = mean_from_cumsum(csum, zero, window)[..., window - 1:]
+    mean_sq = mean_from_cumsum(csum_sq, zero, window)[..., window - 1:]
+    var = (mean_sq - mean * mean) * (window / (window - 1))
+    out[..., window - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over `window` values along the last axis.
+
+    Works on a single series or a (symbols x bars) matrix in one pass using a
+    cumulative sum. Positions before the window is full are NaN, as with
+    pandas rolling(window).mean().
+    """
+    return mean_from_cumsum(*shifted_cumsum(values), window)
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sample standard deviation (ddof=1) along the last axis"""
+    values = np.asarray(values, dtype=np.float64)
+    shifted = values - values[..., :1]
+    csum = np.cumsum(shifted, axis=-1)
+    csum_sq = np.cumsum(shifted * shifted, axis=-1)
+    return std_from_cumsums(csum, csum_sq, window)
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average along the last axis, seeded with the first
+    value (pandas ewm(span=span, adjust=False)). Input must be finite.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[-1] == 0:
+        return values.copy()
+    alpha = 2.0 / (span + 1.0)
+    zi = (1.0 - alpha) * values[..., :1]
+    out, _ = lfilter([alpha], [1.0, alpha - 1.0], values, axis=-1, zi=zi)
+    return out
+
+
+def rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI from simple rolling means of gains and losses along the last axis"""
+    close = np.asarray(close, dtype=np.float64)
+    # The first delta is undefined; like the pandas path it counts as no move
+    delta = np.diff(close, axis=-1, prepend=close[..., :1])
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def macd(close: np.ndarray, fast: int, slow: int, signal: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram along the last axis"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
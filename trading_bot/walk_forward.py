@@ -0,0 +1,237 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, balanced_accuracy_score
+from sklearn.preprocessing import StandardScaler
+
+from .parallel_analysis import SharedArray, SharedArrayRef, attach_shared, default_start_method, encode_labels
+
+
+@dataclass(frozen=True)
+class Fold:
+    """Train on rows [train_start, train_stop), test on [test_start, test_stop)"""
+    index: int
+    train_start: int
+    train_stop: int
+    test_start: int
+    test_stop: int
+
+
+def walk_forward_folds(
+    n_samples: int,
+    n_folds: int = 5,
+    test_size: Optional[int] = None,
+    mode: str = 'expanding',
+    train_size: Optional[int] = None,
+    gap: int = 0
+) -> List[Fold]:
+    """
+    Time-ordered train/test splits that never test on the past.
+
+    Args:
+        n_samples: Number of rows
+        n_folds: Number of folds
+        test_size: Rows per test window (defaults to n_samples // (n_folds + 1))
+        mode: 'expanding' (training starts at row 0) or 'rolling' (fixed
+            ``train_size`` window ending before the test window)
+        train_size: Training rows in rolling mode (defaults to test_size)
+        gap: Rows left out between training and test (for overlapping targets)
+
+    Returns:
+        List[Fold]: Folds ordered by test window
+    """
+    if mode not in ('expanding', 'rolling'):
+        raise ValueError(f"Unknown walk-forward mode: {mode}")
+    test_size = test_size or n_samples // (n_folds + 1)
+    train_size = train_size or test_size
+    folds = []
+    for k in range(n_folds):
+        test_stop = n_samples - (n_folds - 1 - k) * test_size
+        test_start = test_stop - test_size
+        train_stop = test_start - gap
+        train_start = 0 if mode == 'expanding' else max(train_stop - train_size, 0)
+        if train_stop - train_start < 1 or test_start < 0:
+            raise ValueError("Not enough samples for the requested folds")
+        folds.append(Fold(k, train_start, train_stop, test_start, test_stop))
+    return folds
+
+
+class PrefixMoments:
+    """
+    Cumulative sums of the features and their squares.
+
+    Mean and variance of any contiguous row range then cost O(features), so
+    a StandardScaler for every fold is derived from one pass over the data
+    instead of being refitted per fold. Values are shifted by the first row
+    to keep the sums well conditioned.
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        self.shift = values[0].copy() if len(values) else np.zeros(values.shape[1])
+        shifted = values - self.shift
+        self.csum = np.zeros((len(values) + 1, values.shape[1]))
+        self.csum_sq = np.zeros_like(self.csum)
+        np.cumsum(shifted, axis=0, out=self.csum[1:])
+        np.cumsum(shifted * shifted, axis=0, out=self.csum_sq[1:])
+
+    def scaler(self, start: int, stop: int) -> StandardScaler:
+        """Fitted StandardScaler for rows [start, stop)"""
+        return scaler_from_moments(self.csum, self.csum_sq, self.shift, start, stop)
+
+
+def scaler_from_moments(csum, csum_sq, shift, start: int, stop: int) -> StandardScaler:
+    """StandardScaler equivalent to fitting on rows [start, stop) (see PrefixMoments)"""
+    n = stop - start
+    mean_shifted = (csum[stop] - csum[start]) / n
+    var = np.maximum((csum_sq[stop] - csum_sq[start]) / n - mean_shifted ** 2, 0.0)
+    mean = mean_shifted + shift
+
+    scale = np.sqrt(var)
+    # Same rule as StandardScaler for (near-)constant features
+    eps = np.finfo(np.float64).eps
+    scale[var <= 10 * eps * np.maximum(mean * mean, eps)] = 1.0
+
+    scaler = StandardScaler()
+    scaler.mean_ = mean
+    scaler.var_ = var
+    scaler.scale_ = scale
+    scaler.n_samples_seen_ = n
+    scaler.n_features_in_ = len(mean)
+    return scaler
+
+
+# Shared-memory mappings of the current worker, keyed by segment name
+_worker_segments: Dict[str, Tuple] = {}
+
+
+def _attached(ref: SharedArrayRef) -> np.ndarray:
+    if ref.name not in _worker_segments:
+        _worker_segments[ref.name] = attach_shared(ref)
+    return _worker_segments[ref.name][1]
+
+
+def run_fold(
+    fold: Fold,
+    refs: Dict[str, Optional[SharedArrayRef]],
+    scaler,
+    model,
+    classes: Optional[np.ndarray] = None
+) -> Dict:
+    """
+    Fit and score one fold from shared arrays (runs in a worker process).
+
+    ``refs`` names the shared 'features' and 'targets' arrays and, when the
+    scaler can be derived from moments, 'csum', 'csum_sq' and 'shift'.
+    With ``classes`` the shared targets are codes into it (see encode_labels).
+    """
+    features, targets = _attached(refs['features']), _attached(refs['targets'])
+    if classes is not None:
+        targets = classes[targets]
+
+    start = time.perf_counter()
+    if refs.get('csum') is not None:
+        scaler = scaler_from_moments(
+            _attached(refs['csum']), _attached(refs['csum_sq']), _attached(refs['shift']),
+            fold.train_start, fold.train_stop
+        )
+        train = scaler.transform(features[fold.train_start:fold.train_stop])
+    else:
+        scaler = clone(scaler)
+        train = scaler.fit_transform(features[fold.train_start:fold.train_stop])
+    model = clone(model)
+    model.fit(train, targets[fold.train_start:fold.train_stop])
+    fit_seconds = time.perf_counter() - start
+
+    actual = targets[fold.test_start:fold.test_stop]
+    start = time.perf_counter()
+    predicted = model.predict(scaler.transform(features[fold.test_start:fold.test_stop]))
+    predict_seconds = time.perf_counter() - start
+
+    return dict(
+        asdict(fold),
+        n_train=fold.train_stop - fold.train_start,
+        n_test=fold.test_stop - fold.test_start,
+        accuracy=accuracy_score(actual, predicted),
+        balanced_accuracy=balanced_accuracy_score(actual, predicted),
+        fit_seconds=fit_seconds,
+        predict_seconds=predict_seconds
+    )
+
+
+class WalkForwardValidator:
+    """
+    Walk-forward evaluation of a scaler and model, folds run in parallel.
+
+    The feature matrix and targets are copied once into shared memory and
+    every fold is fitted in a worker process that maps them directly. For a
+    StandardScaler, per-fold scalers come from shared prefix sums
+    (PrefixMoments) instead of a refit per fold. Labels of object dtype are
+    shared as integer codes. Metrics are yielded as each fold finishes.
+
+    Args:
+        scaler: Unfitted scaler template (cloned per fold)
+        model: Unfitted model template (cloned per fold)
+        max_workers: Pool size (defaults to the CPU count)
+        start_method: Worker start method (defaults to default_start_method)
+    """
+
+    def __init__(self, scaler, model, max_workers: Optional[int] = None, start_method: Optional[str] = None):
+        self.scaler = scaler
+        self.model = model
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.start_method = start_method or default_start_method()
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, features: np.ndarray, targets: np.ndarray, folds: List[Fold]) -> Iterator[Dict]:
+        """
+        Evaluate the folds, yielding each fold's metrics as soon as it completes.
+
+        Args:
+            features: (rows x features) matrix in time order
+            targets: Target per row
+            folds: Splits, e.g. from walk_forward_folds
+
+        Yields:
+            Dict: Fold bounds, sizes, accuracy, balanced_accuracy and timings
+        """
+        features = np.asarray(features)
+        targets, classes = encode_labels(targets)
+        buffers: List[SharedArray] = []
+
+        def share(values: np.ndarray) -> SharedArrayRef:
+            buffer = SharedArray(values.shape, values.dtype)
+            buffer.array[...] = values
+            buffers.append(buffer)
+            return buffer.ref
+
+        try:
+            refs = {'features': share(features), 'targets': share(targets), 'csum': None}
+            if type(self.scaler) is StandardScaler and self.scaler.with_mean and self.scaler.with_std:
+                moments = PrefixMoments(features)
+                refs.update(csum=share(moments.csum), csum_sq=share(moments.csum_sq), shift=share(moments.shift))
+
+            workers = min(self.max_workers, len(folds)) or 1
+            context = multiprocessing.get_context(self.start_method)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [pool.submit(run_fold, fold, refs, self.scaler, self.model, classes) for fold in folds]
+                for future in as_completed(futures):
+                    result = future.result()
+                    self.logger.info(f"Fold {result['index']}: accuracy {result['accuracy']:.4f}")
+                    yield result
+        finally:
+            for buffer in buffers:
+                buffer.close()
+
+    def evaluate(self, features: np.ndarray, targets: np.ndarray, folds: List[Fold]) -> pd.DataFrame:
+        """All fold metrics as a DataFrame ordered by fold"""
+        results = list(self.run(features, targets, folds))
+        return pd.DataFrame(results).sort_values('index').set_index('index')